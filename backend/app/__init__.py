@@ -1,6 +1,14 @@
 """Módulo principal da aplicação."""
 
-from app.core.config import settings
+from app.core.config import get_settings
 
-__version__ = settings.APP_VERSION
 __all__ = ["settings"]
+
+
+def __getattr__(name: str):
+    """Resolve ``settings`` e ``__version__`` sob demanda (sem ler o .env no import)."""
+    if name == "settings":
+        return get_settings()
+    if name == "__version__":
+        return get_settings().APP_VERSION
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
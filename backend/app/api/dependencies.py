@@ -0,0 +1,17 @@
+"""
+Dependências compartilhadas pelas rotas da API.
+
+Injetadas com ``Depends`` (substituíveis em testes via
+``app.dependency_overrides``).
+"""
+
+from typing import Annotated
+
+from fastapi import Depends
+
+from app.core.config import Settings, get_settings
+
+# Configurações da aplicação (singleton de get_settings)
+SettingsDep = Annotated[Settings, Depends(get_settings)]
+
+__all__ = ["SettingsDep"]
@@ -4,132 +4,186 @@ Rotas da API para análise de áudio de consultas médicas.
 Endpoints:
 - POST /analyze: Upload e análise de áudio
 - GET /status/{id}: Status da análise
+- GET /status-stream/{id}: Status via Server-Sent Events
 - GET /result/{id}: Resultado completo
 - GET /segments/{id}: Segmentos com indicadores
 - POST /transcribe: Gera transcrição para prontuário
 """
 
 import asyncio
+import hashlib
+from collections import Counter
+from itertools import chain
 from pathlib import Path
-from typing import Dict
-import json
+from types import MappingProxyType
 
+import numpy as np
+import orjson
+from cachetools import LRUCache
 from fastapi import (
     APIRouter,
-    BackgroundTasks,
     File,
     Form,
     HTTPException,
+    Request,
     UploadFile,
     status,
 )
-from fastapi.responses import JSONResponse
+from fastapi.responses import FileResponse, ORJSONResponse, Response, StreamingResponse
 
+from app.api.dependencies import SettingsDep
 from app.core.logging_config import get_logger
+from app.core.redis_client import get_redis
 from app.core.security import validate_upload_file, sanitize_filename, generate_analysis_id
 from app.models.schemas import AudioAnalysisResult, AnalysisStatus
-from app.models.patient_schemas import TranscriptionRequest, MedicalRecordTranscription, PatientData
+from app.models.patient_schemas import TranscriptionRequest, MedicalRecordTranscription
 from app.models.enums import AnalysisStatusEnum, ConsultationType
-from app.services import get_audio_service, get_report_service
-from app.utils import validate_audio_file
+from app.services import get_report_service, get_analysis_store
+from app.utils import validate_audio_header, save_upload_file, etag_matches
+from app.workers import process_audio_task, get_audio_scheduler
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/api/v1/audio", tags=["audio"])
 
-# Armazenamento em memória
-audio_analysis_statuses: Dict[str, dict] = {}
-audio_analysis_results: Dict[str, AudioAnalysisResult] = {}
+# Status e resultados (memória local ou Redis, conforme REDIS_ENABLED)
+audio_store = get_analysis_store("audio")
 
+# Nomes das consultas usados no sumário do prontuário
+CONSULTATION_TYPE_NAMES = MappingProxyType({
+    "gynecological": "ginecológica",
+    "prenatal": "pré-natal",
+    "postpartum": "pós-parto",
+    "general": "geral"
+})
 
-async def process_audio_task(
+# Recomendações por nível de risco (demais níveis usam a de rotina)
+_ROUTINE_RECOMMENDATIONS = """1. Manter acompanhamento de rotina conforme protocolo
+2. Estar atento a mudanças no padrão emocional
+3. Oferecer espaço seguro para expressão de preocupações"""
+
+RECOMMENDATIONS_BY_RISK = MappingProxyType({
+    "high": """1. Avaliação presencial urgente por profissional de saúde mental
+2. Considerar aplicação de escalas validadas (Edinburgh, PHQ-9, GAD-7)
+3. Acompanhamento em até 48-72 horas
+4. Avaliar necessidade de encaminhamento para serviço especializado""",
+    "medium": """1. Acompanhamento clínico detalhado
+2. Avaliar contexto psicossocial
+3. Retorno em 7-14 dias para reavaliação
+4. Disponibilizar canais de suporte""",
+})
+
+# Templates do arquivo .txt de transcrição
+_TX_HEADER = (
+    "TRANSCRIÇÃO DE ÁUDIO - %s\n"
+    "Duração: %.1f segundos\n"
+    "Data: %s\n"
+    + "=" * 80 + "\n\n"
+)
+TX_STREAM_CHUNK_CHARS = 65536
+_TX_BODY_PREFIX = "TRANSCRIÇÃO COMPLETA:\n\n".encode("utf-8")
+_TX_FOOTER = (
+    "\n\n" + "=" * 80 + "\n\n"
+    "Esta transcrição foi gerada automaticamente pelo sistema Gemini 2.5 Flash.\n"
+    "A precisão pode variar dependendo da qualidade do áudio e clareza da fala."
+).encode("utf-8")
+_TX_UNAVAILABLE = (
+    "⚠️ ATENÇÃO: Transcrição não disponível para este áudio.\n"
+    "\n"
+    "Possíveis motivos:\n"
+    "- O áudio foi processado antes da implementação da transcrição automática\n"
+    "- Erro durante o processamento da transcrição\n"
+    "- Qualidade do áudio insuficiente para transcrição\n"
+    "\n"
+    "Para obter a transcrição, por favor faça o upload novamente.\n"
+).encode("utf-8")
+
+# Corpo JSON já serializado de /segments por análise (resultado é imutável)
+_segments_payload_cache: LRUCache = LRUCache(maxsize=256)
+
+
+async def _load_result(
     analysis_id: str,
-    file_path: str,
-    filename: str,
-    consultation_type: ConsultationType = ConsultationType.GENERAL,
-    patient_data_json: str | None = None
-):
+    not_found_detail: str = "Análise não encontrada"
+) -> AudioAnalysisResult:
     """
-    Task assíncrona para processar áudio em background.
+    Obtém o resultado do store ou, na ausência (ou após descarte do cache),
+    do relatório em disco. A leitura do disco roda fora do event loop.
     
-    Args:
-        analysis_id: ID da análise.
-        file_path: Caminho do arquivo temporário.
-        filename: Nome original do arquivo.
-        consultation_type: Tipo de consulta médica.
-        patient_data_json: Dados do paciente em formato JSON string.
+    Raises:
+        HTTPException: 404 se o resultado não existir em nenhum dos dois.
     """
+    result = await audio_store.get_result(analysis_id)
+    if result is not None:
+        return result
+    
     try:
-        logger.info(f"Iniciando processamento de áudio: {analysis_id}")
-        
-        # Parse patient data se fornecido
-        patient_data = None
-        if patient_data_json:
-            try:
-                patient_dict = json.loads(patient_data_json)
-                patient_data = PatientData(**patient_dict)
-                logger.info(f"Dados da paciente carregados: {patient_data.nome}")
-            except Exception as e:
-                logger.warning(f"Erro ao parsear dados da paciente: {e}")
-        
-        # Atualiza status
-        audio_analysis_statuses[analysis_id] = {
-            "status": AnalysisStatusEnum.PROCESSING,
-            "progress_percent": 10.0,
-            "current_stage": "Carregando áudio e extraindo features",
-            "error_message": None
-        }
-        
-        # Processa áudio
-        audio_service = get_audio_service()
-        result = await audio_service.process_audio(
-            file_path=file_path,
-            analysis_id=analysis_id,
-            consultation_type=consultation_type,
-            patient_data=patient_data
+        raw_report = await asyncio.to_thread(
+            get_report_service().load_report_raw, analysis_id, "audio"
         )
-        
-        # Salva resultado
-        report_service = get_report_service()
-        report_service.save_report(result)
-        
-        # Armazena na memória
-        audio_analysis_results[analysis_id] = result
-        
-        # Atualiza status final
-        audio_analysis_statuses[analysis_id] = {
-            "status": AnalysisStatusEnum.COMPLETED,
-            "progress_percent": 100.0,
-            "current_stage": "Concluído",
-            "error_message": None
-        }
-        
-        logger.info(f"Análise de áudio concluída: {analysis_id}")
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=not_found_detail
+        )
+    return AudioAnalysisResult.model_validate_json(raw_report)
+
+
+def _build_segments_payload(result: AudioAnalysisResult) -> bytes:
+    """
+    Monta e serializa a resposta de /segments uma única vez por análise.
     
-    except Exception as e:
-        logger.error(f"Erro ao processar áudio {analysis_id}: {e}", exc_info=True)
-        
-        audio_analysis_statuses[analysis_id] = {
-            "status": AnalysisStatusEnum.FAILED,
-            "progress_percent": 0.0,
-            "current_stage": "Falha no processamento",
-            "error_message": str(e)
+    Os campos numéricos são extraídos em colunas (struct-of-arrays) e o
+    filtro de segmentos com indicadores é feito por máscara NumPy.
+    
+    Args:
+        result: Resultado da análise de áudio.
+    
+    Returns:
+        Corpo JSON serializado com orjson.
+    """
+    segments = result.segments
+    count = len(segments)
+    
+    start = np.fromiter((seg.start_time for seg in segments), dtype=np.float64, count=count)
+    end = np.fromiter((seg.end_time for seg in segments), dtype=np.float64, count=count)
+    confidence = np.fromiter((seg.confidence for seg in segments), dtype=np.float64, count=count)
+    has_indicators = np.fromiter((bool(seg.indicators) for seg in segments), dtype=bool, count=count)
+    
+    selected = np.flatnonzero(has_indicators)
+    start, end, confidence = start[selected], end[selected], confidence[selected]
+    duration = end - start
+    
+    segments_with_indicators = [
+        {
+            "start_time": start_time,
+            "end_time": end_time,
+            "duration": seg_duration,
+            "indicators": [ind.value for ind in segments[index].indicators],
+            "confidence": seg_confidence,
+            "emotional_tone": segments[index].emotional_tone,
+            "transcript": segments[index].transcript[:200] if segments[index].transcript else None
         }
+        for index, start_time, end_time, seg_duration, seg_confidence in zip(
+            selected.tolist(), start.tolist(), end.tolist(), duration.tolist(), confidence.tolist()
+        )
+    ]
     
-    finally:
-        # Cleanup
-        try:
-            Path(file_path).unlink(missing_ok=True)
-        except Exception as e:
-            logger.warning(f"Erro ao remover arquivo temporário {file_path}: {e}")
+    return orjson.dumps({
+        "analysis_id": result.analysis_id,
+        "total_segments": count,
+        "segments_with_indicators": len(segments_with_indicators),
+        "overall_risk": result.overall_risk_level.value,
+        "segments": segments_with_indicators
+    })
 
 
 @router.post("/analyze", status_code=status.HTTP_202_ACCEPTED)
 async def analyze_audio(
-    background_tasks: BackgroundTasks,
+    settings: SettingsDep,
     file: UploadFile = File(..., description="Arquivo de áudio para análise"),
     consultation_type: str = Form(default="general", description="Tipo de consulta: gynecological, prenatal, postpartum, general"),
     patient_data: str | None = Form(None, description="Dados do paciente em formato JSON")
-) -> JSONResponse:
+) -> ORJSONResponse:
     """
     Upload e análise assíncrona de áudio de consulta médica.
     
@@ -163,12 +217,13 @@ async def analyze_audio(
     temp_path = temp_dir / f"{analysis_id}_{safe_filename}"
     
     try:
-        with open(temp_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
+        content_hasher = hashlib.sha256()
+        await save_upload_file(file, temp_path, hasher=content_hasher)
         
-        # Valida áudio
-        is_valid, error_msg = validate_audio_file(str(temp_path))
+        # Valida áudio (só o cabeçalho; o ffprobe de fallback é bloqueante)
+        is_valid, error_msg, duration = await asyncio.to_thread(
+            validate_audio_header, str(temp_path)
+        )
         if not is_valid:
             temp_path.unlink(missing_ok=True)
             raise HTTPException(
@@ -176,27 +231,59 @@ async def analyze_audio(
                 detail=f"Áudio inválido: {error_msg}"
             )
         
+        # Reenvio do mesmo áudio com os mesmos parâmetros reaproveita a análise
+        content_hasher.update(f"\0{consult_type.value}\0{patient_data or ''}".encode("utf-8"))
+        content_hash = content_hasher.hexdigest()
+        existing_id = await audio_store.find_by_content(content_hash)
+        existing_status = await audio_store.get_status(existing_id) if existing_id else None
+        if existing_status is not None and existing_status["status"] != AnalysisStatusEnum.FAILED:
+            temp_path.unlink(missing_ok=True)
+            logger.info(f"Áudio duplicado, reaproveitando análise {existing_id} ({safe_filename})")
+            return ORJSONResponse(
+                status_code=status.HTTP_202_ACCEPTED,
+                content={
+                    "analysis_id": existing_id,
+                    "filename": safe_filename,
+                    "consultation_type": consult_type.value,
+                    "status": existing_status["status"].value,
+                    "message": "Áudio idêntico já enviado; reaproveitando análise existente"
+                }
+            )
+        
         # Inicializa status
-        audio_analysis_statuses[analysis_id] = {
-            "status": AnalysisStatusEnum.QUEUED,
-            "progress_percent": 0.0,
-            "current_stage": "Na fila para processamento",
-            "error_message": None
-        }
+        await audio_store.set_status(
+            analysis_id,
+            AnalysisStatusEnum.QUEUED,
+            0.0,
+            "Na fila para processamento"
+        )
         
-        # Adiciona task
-        background_tasks.add_task(
-            process_audio_task,
+        await audio_store.remember_content(content_hash, analysis_id)
+        
+        task_args = (
             analysis_id,
             str(temp_path),
             safe_filename,
-            consult_type,
+            consult_type.value,
             patient_data  # Passa o JSON string recebido do Form
         )
         
+        if settings.REDIS_ENABLED:
+            # Enfileira no worker arq (processamento fora do processo da API)
+            redis = await get_redis()
+            await redis.enqueue_job("process_audio_task", *task_args)
+        else:
+            # Escalonamento HRRN em processo: áudios curtos passam na frente
+            await get_audio_scheduler().submit(
+                analysis_id,
+                process_audio_task,
+                *task_args,
+                estimated_seconds=duration
+            )
+        
         logger.info(f"Áudio enviado para análise: {analysis_id} ({safe_filename}, tipo: {consult_type.value})")
         
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=status.HTTP_202_ACCEPTED,
             content={
                 "analysis_id": analysis_id,
@@ -227,98 +314,127 @@ async def get_audio_status(analysis_id: str) -> AnalysisStatus:
     Returns:
         Status atualizado com progresso.
     """
-    if analysis_id not in audio_analysis_statuses:
+    status_dict = await audio_store.get_status(analysis_id)
+    if status_dict is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Análise não encontrada"
         )
     
-    status_dict = audio_analysis_statuses[analysis_id]
-    
     return AnalysisStatus(
         analysis_id=analysis_id,
         status=status_dict["status"],
         progress_percent=status_dict["progress_percent"],
         current_stage=status_dict["current_stage"],
-        error_message=status_dict.get("error_message")
+        error_message=status_dict["error_message"]
+    )
+
+
+@router.get("/status-stream/{analysis_id}")
+async def stream_audio_status(analysis_id: str, settings: SettingsDep) -> StreamingResponse:
+    """
+    Acompanha o status de uma análise via Server-Sent Events.
+    
+    Envia um evento a cada mudança de status (em vez de polling em /status)
+    e encerra o stream quando a análise conclui ou falha.
+    
+    Returns:
+        Stream ``text/event-stream`` com eventos ``AnalysisStatus`` em JSON.
+    """
+    if await audio_store.get_status(analysis_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Análise não encontrada"
+        )
+    
+    async def event_stream():
+        async for status_dict in audio_store.watch_status(
+            analysis_id, keepalive_seconds=settings.WEBSOCKET_HEARTBEAT_INTERVAL
+        ):
+            if status_dict is None:
+                yield b": keepalive\n\n"
+                continue
+            
+            event = AnalysisStatus(
+                analysis_id=analysis_id,
+                status=status_dict["status"],
+                progress_percent=status_dict["progress_percent"],
+                current_stage=status_dict["current_stage"],
+                error_message=status_dict["error_message"]
+            )
+            yield b"data: " + event.model_dump_json().encode("utf-8") + b"\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
 
 
 @router.get("/result/{analysis_id}")
-async def get_audio_result(analysis_id: str) -> AudioAnalysisResult:
+async def get_audio_result(analysis_id: str, request: Request) -> AudioAnalysisResult:
     """
     Obtém o resultado completo de uma análise de áudio.
     
     Returns:
         Resultado completo com segmentos e relatório.
     """
-    if analysis_id not in audio_analysis_statuses:
+    # Resultado presente implica análise concluída: uma única consulta no caminho comum
+    result = await audio_store.get_result(analysis_id)
+    if result is not None:
+        return result
+    
+    status_dict = await audio_store.get_status(analysis_id)
+    if status_dict is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Análise não encontrada"
         )
     
-    status_dict = audio_analysis_statuses[analysis_id]
-    
     if status_dict["status"] != AnalysisStatusEnum.COMPLETED:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Análise ainda não concluída. Status: {status_dict['status'].value}"
         )
     
-    if analysis_id in audio_analysis_results:
-        return audio_analysis_results[analysis_id]
-    
-    # Tenta carregar do disco
+    # Serve o JSON salvo direto do disco (sendfile), sem re-parsear
+    report_path = get_report_service().report_path(analysis_id, "audio")
     try:
-        report_service = get_report_service()
-        result_data = report_service.load_report(analysis_id, "audio")
-        return AudioAnalysisResult(**result_data)
+        stat_result = report_path.stat()
     except FileNotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Resultado não encontrado"
         )
+    
+    etag = f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    
+    return FileResponse(
+        report_path,
+        media_type="application/json",
+        headers={"ETag": etag},
+        stat_result=stat_result
+    )
 
 
 @router.get("/segments/{analysis_id}")
-async def get_audio_segments(analysis_id: str) -> JSONResponse:
+async def get_audio_segments(analysis_id: str) -> Response:
     """
     Obtém segmentos de áudio com indicadores psicológicos.
     
     Returns:
         JSON com lista de segmentos e suas características.
     """
-    if analysis_id not in audio_analysis_results:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Resultado não encontrado"
-        )
-    
-    result = audio_analysis_results[analysis_id]
+    payload = _segments_payload_cache.get(analysis_id)
     
-    # Filtra apenas segmentos com indicadores
-    segments_with_indicators = [
-        {
-            "start_time": seg.start_time,
-            "end_time": seg.end_time,
-            "duration": seg.end_time - seg.start_time,
-            "indicators": [ind.value for ind in seg.indicators],
-            "confidence": seg.confidence,
-            "emotional_tone": seg.emotional_tone,
-            "transcript": seg.transcript[:200] if seg.transcript else None
-        }
-        for seg in result.segments
-        if seg.indicators
-    ]
+    if payload is None:
+        result = await _load_result(analysis_id, not_found_detail="Resultado não encontrado")
+        payload = _build_segments_payload(result)
+        _segments_payload_cache[analysis_id] = payload
     
-    return JSONResponse(content={
-        "analysis_id": analysis_id,
-        "total_segments": len(result.segments),
-        "segments_with_indicators": len(segments_with_indicators),
-        "overall_risk": result.overall_risk_level.value,
-        "segments": segments_with_indicators
-    })
+    return Response(content=payload, media_type="application/json")
 
 
 @router.post("/transcribe")
@@ -335,49 +451,26 @@ async def generate_transcription(request: TranscriptionRequest) -> MedicalRecord
     analysis_id = request.analysis_id
     
     # Busca resultado da análise
-    if analysis_id not in audio_analysis_results:
-        # Tenta carregar do disco
-        try:
-            report_service = get_report_service()
-            result_data = report_service.load_report(analysis_id, "audio")
-            result = AudioAnalysisResult(**result_data)
-        except FileNotFoundError:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Análise não encontrada"
-            )
-    else:
-        result = audio_analysis_results[analysis_id]
+    result = await _load_result(analysis_id)
     
     # Gera sumário da consulta
-    consultation_types = {
-        "gynecological": "ginecológica",
-        "prenatal": "pré-natal",
-        "postpartum": "pós-parto",
-        "general": "geral"
-    }
-    
-    consultation_name = consultation_types.get(
-        result.consultation_type.value if hasattr(result, 'consultation_type') else 'general',
-        "médica"
-    )
+    consultation_name = CONSULTATION_TYPE_NAMES.get(result.consultation_type.value, "médica")
     
     consultation_summary = f"Consulta {consultation_name} realizada em {request.patient_data.consultation_date.strftime('%d/%m/%Y às %H:%M')}. Motivo: {request.patient_data.consultation_reason}. Duração da consulta: {result.duration_seconds:.0f} segundos ({result.duration_seconds // 60:.0f} minutos)."
     
     # Gera achados psicológicos se solicitado
     psychological_findings = None
     if request.include_psychological_indicators:
-        # Conta indicadores
-        indicator_counts = {}
-        for segment in result.segments:
-            for indicator in segment.indicators:
-                indicator_counts[indicator.value] = indicator_counts.get(indicator.value, 0) + 1
+        # Conta indicadores (mais frequentes primeiro)
+        indicator_counts = Counter(
+            chain.from_iterable(segment.indicators for segment in result.segments)
+        )
         
         if indicator_counts:
             findings_lines = ["Análise acústica automatizada identificou os seguintes indicadores:\n"]
             
-            for indicator, count in indicator_counts.items():
-                indicator_readable = indicator.replace("_", " ").title()
+            for indicator, count in indicator_counts.most_common():
+                indicator_readable = indicator.value.replace("_", " ").title()
                 findings_lines.append(f"- {indicator_readable}: {count} segmentos")
             
             findings_lines.append(f"\nNível de risco geral classificado como: {result.overall_risk_level.value.upper()}")
@@ -388,20 +481,9 @@ async def generate_transcription(request: TranscriptionRequest) -> MedicalRecord
             psychological_findings = "Análise acústica não identificou indicadores de risco psicológico significativos."
     
     # Gera recomendações
-    if result.overall_risk_level.value == "high":
-        recommendations_text = """1. Avaliação presencial urgente por profissional de saúde mental
-2. Considerar aplicação de escalas validadas (Edinburgh, PHQ-9, GAD-7)
-3. Acompanhamento em até 48-72 horas
-4. Avaliar necessidade de encaminhamento para serviço especializado"""
-    elif result.overall_risk_level.value == "medium":
-        recommendations_text = """1. Acompanhamento clínico detalhado
-2. Avaliar contexto psicossocial
-3. Retorno em 7-14 dias para reavaliação
-4. Disponibilizar canais de suporte"""
-    else:
-        recommendations_text = """1. Manter acompanhamento de rotina conforme protocolo
-2. Estar atento a mudanças no padrão emocional
-3. Oferecer espaço seguro para expressão de preocupações"""
+    recommendations_text = RECOMMENDATIONS_BY_RISK.get(
+        result.overall_risk_level.value, _ROUTINE_RECOMMENDATIONS
+    )
     
     # Transcrição (placeholder - Gemini poderia gerar isso)
     transcription_text = result.transcription if hasattr(result, 'transcription') and result.transcription else "Transcrição não disponível. Análise baseada em features acústicas."
@@ -428,72 +510,34 @@ async def download_transcription(analysis_id: str):
     Returns:
         Arquivo .txt com a transcrição.
     """
-    from fastapi.responses import Response
-    
     # Busca resultado da análise
-    if analysis_id not in audio_analysis_results:
-        # Tenta carregar do disco
-        try:
-            report_service = get_report_service()
-            result_data = report_service.load_report(analysis_id, "audio")
-            result = AudioAnalysisResult(**result_data)
-        except FileNotFoundError:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Análise não encontrada"
-            )
-    else:
-        result = audio_analysis_results[analysis_id]
-    
-    # Verifica se há transcrição disponível
-    transcription = result.transcription if hasattr(result, 'transcription') and result.transcription else None
-    
-    if not transcription:
-        # Gera mensagem de transcrição indisponível
-        transcription_lines = [
-            f"TRANSCRIÇÃO DE ÁUDIO - {result.filename}",
-            f"Duração: {result.duration_seconds:.1f} segundos",
-            f"Data: {result.created_at.strftime('%d/%m/%Y %H:%M:%S') if hasattr(result, 'created_at') else 'N/A'}",
-            "=" * 80,
-            "",
-            "⚠️ ATENÇÃO: Transcrição não disponível para este áudio.",
-            "",
-            "Possíveis motivos:",
-            "- O áudio foi processado antes da implementação da transcrição automática",
-            "- Erro durante o processamento da transcrição",
-            "- Qualidade do áudio insuficiente para transcrição",
-            "",
-            "Para obter a transcrição, por favor faça o upload novamente.",
-            ""
-        ]
-        
-        transcription = "\n".join(transcription_lines)
-    else:
-        # Formata transcrição existente
-        transcription_lines = [
-            f"TRANSCRIÇÃO DE ÁUDIO - {result.filename}",
-            f"Duração: {result.duration_seconds:.1f} segundos",
-            f"Data: {result.created_at.strftime('%d/%m/%Y %H:%M:%S') if hasattr(result, 'created_at') else 'N/A'}",
-            "=" * 80,
-            "",
-            "TRANSCRIÇÃO COMPLETA:",
-            "",
-            transcription,
-            "",
-            "=" * 80,
-            "",
-            "Esta transcrição foi gerada automaticamente pelo sistema Gemini 2.5 Flash.",
-            "A precisão pode variar dependendo da qualidade do áudio e clareza da fala.",
-        ]
-        transcription = "\n".join(transcription_lines)
+    result = await _load_result(analysis_id)
+    
+    header = (_TX_HEADER % (
+        result.filename,
+        result.duration_seconds,
+        result.created_at.strftime('%d/%m/%Y %H:%M:%S')
+    )).encode('utf-8')
+    transcription = result.transcription
+    
+    async def stream_transcription():
+        yield header
+        if not transcription:
+            yield _TX_UNAVAILABLE
+            return
+        yield _TX_BODY_PREFIX
+        # Codifica em blocos para não duplicar transcrições longas em memória
+        for offset in range(0, len(transcription), TX_STREAM_CHUNK_CHARS):
+            yield transcription[offset:offset + TX_STREAM_CHUNK_CHARS].encode('utf-8')
+        yield _TX_FOOTER
     
     # Prepara o arquivo para download
     filename = f"transcricao_{analysis_id[:8]}.txt"
     
     logger.info(f"Download de transcrição solicitado: {analysis_id}, arquivo: {filename}")
     
-    return Response(
-        content=transcription.encode('utf-8'),
+    return StreamingResponse(
+        stream_transcription(),
         media_type='text/plain; charset=utf-8',
         headers={
             'Content-Disposition': f'attachment; filename="{filename}"'
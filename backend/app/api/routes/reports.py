@@ -7,19 +7,45 @@ Endpoints:
 - GET /{id}/json: Obtém relatório completo em JSON
 """
 
-from fastapi import APIRouter, HTTPException, status, Response
-from fastapi.responses import JSONResponse
+import asyncio
+from functools import lru_cache
+
+from fastapi import APIRouter, HTTPException, Request, status, Response
+from fastapi.responses import ORJSONResponse
 
 from app.core.logging_config import get_logger
 from app.services import get_report_service
 from app.models.schemas import VideoAnalysisResult, AudioAnalysisResult
+from app.utils import etag_matches
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/api/v1/reports", tags=["reports"])
 
 
+@lru_cache(maxsize=512)
+def _render_markdown(analysis_id: str, report_type: str, mtime_ns: int) -> bytes:
+    """
+    Renderiza o Markdown de um relatório (memoizado).
+    
+    A exportação é função pura do JSON salvo; ``mtime_ns`` entra na chave
+    para que um relatório regravado gere nova renderização.
+    
+    Returns:
+        Markdown codificado em UTF-8.
+    """
+    report_service = get_report_service()
+    raw_report = report_service.load_report_raw(analysis_id, report_type)
+    
+    if report_type == "video":
+        result = VideoAnalysisResult.model_validate_json(raw_report)
+    else:
+        result = AudioAnalysisResult.model_validate_json(raw_report)
+    
+    return report_service.export_as_markdown(result).encode("utf-8")
+
+
 @router.get("/list")
-async def list_reports() -> JSONResponse:
+async def list_reports() -> ORJSONResponse:
     """
     Lista todos os relatórios salvos.
     
@@ -27,9 +53,9 @@ async def list_reports() -> JSONResponse:
         JSON com lista de relatórios e metadados.
     """
     report_service = get_report_service()
-    reports = report_service.list_reports()
+    reports = await asyncio.to_thread(report_service.list_reports)
     
-    return JSONResponse(content={
+    return ORJSONResponse(content={
         "total": len(reports),
         "reports": reports
     })
@@ -38,6 +64,7 @@ async def list_reports() -> JSONResponse:
 @router.get("/{analysis_id}/markdown")
 async def export_report_markdown(
     analysis_id: str,
+    request: Request,
     report_type: str = "video"
 ) -> Response:
     """
@@ -59,25 +86,25 @@ async def export_report_markdown(
     report_service = get_report_service()
     
     try:
-        # Carrega relatório
-        result_data = report_service.load_report(analysis_id, report_type)
+        mtime_ns = report_service.report_path(analysis_id, report_type).stat().st_mtime_ns
+        etag = f'"{analysis_id}-{report_type}-{mtime_ns}"'
+        headers = {
+            "Content-Disposition": f"attachment; filename={analysis_id}_relatorio.md",
+            "ETag": etag
+        }
         
-        # Converte para objeto
-        if report_type == "video":
-            result = VideoAnalysisResult(**result_data)
-        else:
-            result = AudioAnalysisResult(**result_data)
+        # Relatório inalterado desde a última cópia do cliente
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
         
-        # Exporta como Markdown
-        markdown_content = report_service.export_as_markdown(result)
+        # Renderização (leitura do disco na 1ª vez) fora do event loop
+        content = await asyncio.to_thread(_render_markdown, analysis_id, report_type, mtime_ns)
         
         # Retorna como arquivo para download
         return Response(
-            content=markdown_content,
+            content=content,
             media_type="text/markdown",
-            headers={
-                "Content-Disposition": f"attachment; filename={analysis_id}_relatorio.md"
-            }
+            headers=headers
         )
     
     except FileNotFoundError:
@@ -97,7 +124,7 @@ async def export_report_markdown(
 async def get_report_json(
     analysis_id: str,
     report_type: str = "video"
-) -> JSONResponse:
+) -> Response:
     """
     Obtém relatório completo em JSON.
     
@@ -117,8 +144,11 @@ async def get_report_json(
     report_service = get_report_service()
     
     try:
-        result_data = report_service.load_report(analysis_id, report_type)
-        return JSONResponse(content=result_data)
+        # Repassa o JSON salvo sem desserializar/reserializar
+        raw_report = await asyncio.to_thread(
+            report_service.load_report_raw, analysis_id, report_type
+        )
+        return Response(content=raw_report, media_type="application/json")
     
     except FileNotFoundError:
         raise HTTPException(
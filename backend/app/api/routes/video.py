@@ -10,11 +10,14 @@ Endpoints:
 """
 
 import asyncio
+import os
+from itertools import islice
 from pathlib import Path
-from typing import Dict, Optional
-import uuid
+from types import MappingProxyType
+from typing import Optional
 import json
 
+import aiofiles
 from fastapi import (
     APIRouter,
     BackgroundTasks,
@@ -25,152 +28,70 @@ from fastapi import (
     UploadFile,
     status,
 )
-from fastapi.responses import JSONResponse, FileResponse, StreamingResponse
+from fastapi.responses import ORJSONResponse, FileResponse, Response, StreamingResponse
 
-from app.core.config import settings
+from app.api.dependencies import SettingsDep
 from app.core.logging_config import get_logger
 from app.core.security import validate_upload_file, sanitize_filename, generate_analysis_id
 from app.models.schemas import VideoAnalysisResult, AnalysisStatus
 from app.models.patient_schemas import PatientData
 from app.models.enums import AnalysisStatusEnum
-from app.services import get_video_service, get_report_service, get_storage_service, get_anomaly_service
-from app.utils import FrameAnnotator, validate_video_file
-from app.api.routes.websocket import connection_manager
+from app.core.redis_client import get_redis
+from app.services import get_report_service, get_storage_service, get_analysis_store
+from app.utils import (
+    FrameAnnotator,
+    validate_video_file,
+    save_upload_file,
+    UploadDirectoryIndex,
+    etag_matches,
+)
+from app.workers import process_video_task
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/api/v1/video", tags=["video"])
 
-# Armazenamento em memória de status de análises
-# Em produção, usar Redis ou banco de dados
-analysis_statuses: Dict[str, dict] = {}
-analysis_results: Dict[str, VideoAnalysisResult] = {}
+# Tamanho dos blocos de leitura no streaming com Range (64 KiB)
+VIDEO_STREAM_CHUNK_SIZE = 64 * 1024
 
+# Severidades exibidas como frames anotados
+ALERT_SEVERITIES = frozenset({"critical", "high"})
 
-async def process_video_task(
-    analysis_id: str,
-    file_path: str,
-    filename: str
-):
+# Tipos MIME por extensão de vídeo (as chaves são as extensões servidas)
+VIDEO_MIME_TYPES = MappingProxyType({
+    'mp4': 'video/mp4',
+    'avi': 'video/x-msvideo',
+    'mov': 'video/quicktime',
+    'mkv': 'video/x-matroska',
+    'webm': 'video/webm',
+    'flv': 'video/x-flv',
+    'wmv': 'video/x-ms-wmv'
+})
+
+# Vídeos enviados em storage/temp, por analysis_id (fallback do registro no store)
+_temp_video_index = UploadDirectoryIndex(Path("storage/temp"), VIDEO_MIME_TYPES)
+
+# Status e resultados das análises (Redis quando habilitado, senão memória local)
+video_store = get_analysis_store("video")
+
+
+class VideoFileResponse(FileResponse):
     """
-    Task assíncrona para processar vídeo em background.
+    ``FileResponse`` para o download completo de vídeos.
     
-    Args:
-        analysis_id: ID da análise.
-        file_path: Caminho do arquivo temporário.
-        filename: Nome original do arquivo.
+    O uvicorn não oferece ``sendfile`` via ASGI; blocos de 1 MiB (em vez de
+    64 KiB) reduzem em 16x as leituras em thread e os ``send`` por arquivo.
     """
-    try:
-        logger.info(f"Iniciando processamento de vídeo: {analysis_id}")
-        
-        # Atualiza status
-        analysis_statuses[analysis_id] = {
-            "status": AnalysisStatusEnum.PROCESSING,
-            "progress_percent": 0.0,
-            "current_stage": "Inicializando análise...",
-            "error_message": None
-        }
-        
-        # Serviço de anomalias para gerar alertas
-        anomaly_service = get_anomaly_service()
-        
-        # Callback de progresso e alertas
-        async def progress_callback_async(percent: float, stage: str, frame_analysis=None):
-            # Atualiza status local
-            analysis_statuses[analysis_id].update({
-                "progress_percent": percent,
-                "current_stage": stage
-            })
-            
-            # Envia progresso via WebSocket
-            await connection_manager.broadcast_progress(
-                analysis_id,
-                percent,
-                stage
-            )
-            
-            # Se houver frame crítico, gera e envia alerta
-            if frame_analysis and frame_analysis.severity in ["high", "critical"]:
-                alert = anomaly_service.generate_alert(frame_analysis, analysis_id)
-                if alert:
-                    # Converte para dicionário
-                    alert_dict = {
-                        "alert_id": alert.alert_id,
-                        "anomaly_type": alert.anomaly_type.value,
-                        "severity": alert.severity.value,
-                        "frame_number": alert.frame_index,
-                        "frame_timestamp": frame_analysis.timestamp_seconds,
-                        "timestamp": alert.timestamp.isoformat(),
-                        "message": alert.description,
-                        "confidence": alert.bounding_box.confidence if alert.bounding_box else None
-                    }
-                    
-                    # Envia alerta via WebSocket
-                    await connection_manager.broadcast_alert(analysis_id, alert_dict)
-                    logger.info(f"🚨 Alerta crítico enviado: {alert.alert_id}")
-        
-        # Wrapper síncrono para o callback assíncrono
-        def progress_callback(percent: float, stage: str, frame_analysis=None):
-            asyncio.create_task(progress_callback_async(percent, stage, frame_analysis))
-        
-        # Processa vídeo
-        video_service = get_video_service()
-        result = await video_service.process_video(
-            file_path=file_path,
-            analysis_id=analysis_id,
-            progress_callback=progress_callback
-        )
-        
-        # Salva resultado
-        report_service = get_report_service()
-        report_service.save_report(result)
-        
-        # Armazena na memória
-        analysis_results[analysis_id] = result
-        
-        # Atualiza status final
-        analysis_statuses[analysis_id] = {
-            "status": AnalysisStatusEnum.COMPLETED,
-            "progress_percent": 100.0,
-            "current_stage": "Concluído",
-            "error_message": None
-        }
-        
-        # Envia notificação de conclusão via WebSocket
-        await connection_manager.broadcast_completed(analysis_id, {
-            "total_frames": result.total_frames_analyzed,
-            "anomaly_count": sum(result.anomaly_summary.values()),
-            "processing_time": result.processing_time_seconds
-        })
-        
-        logger.info(f"Análise de vídeo concluída: {analysis_id}")
     
-    except Exception as e:
-        logger.error(f"Erro ao processar vídeo {analysis_id}: {e}", exc_info=True)
-        
-        analysis_statuses[analysis_id] = {
-            "status": AnalysisStatusEnum.FAILED,
-            "progress_percent": 0.0,
-            "current_stage": "Falha no processamento",
-            "error_message": str(e)
-        }
-    
-    finally:
-        # Cleanup: remove arquivo temporário
-        # NOTA: Mantém arquivo para streaming/download do vídeo pela interface
-        # TODO: Implementar limpeza periódica de arquivos antigos
-        # try:
-        #     Path(file_path).unlink(missing_ok=True)
-        # except Exception as e:
-        #     logger.warning(f"Erro ao remover arquivo temporário {file_path}: {e}")
-        pass
+    chunk_size = 1 << 20
 
 
 @router.post("/analyze", status_code=status.HTTP_202_ACCEPTED)
 async def analyze_video(
     background_tasks: BackgroundTasks,
+    settings: SettingsDep,
     file: UploadFile = File(..., description="Arquivo de vídeo para análise"),
     patient_data: Optional[str] = Form(None, description="Dados do paciente em formato JSON")
-) -> JSONResponse:
+) -> ORJSONResponse:
     """
     Upload e análise assíncrona de vídeo cirúrgico.
     
@@ -201,10 +122,8 @@ async def analyze_video(
     temp_path = temp_dir / f"{analysis_id}_{safe_filename}"
     
     try:
-        # Salva upload
-        with open(temp_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
+        # Salva upload em blocos (memória constante, sem bloquear o event loop)
+        await save_upload_file(file, temp_path)
         
         # Valida vídeo
         is_valid, error_msg = validate_video_file(str(temp_path))
@@ -215,25 +134,30 @@ async def analyze_video(
                 detail=f"Vídeo inválido: {error_msg}"
             )
         
-        # Inicializa status
-        analysis_statuses[analysis_id] = {
-            "status": AnalysisStatusEnum.QUEUED,
-            "progress_percent": 0.0,
-            "current_stage": "Na fila para processamento",
-            "error_message": None
-        }
+        # Registra o caminho para o download/streaming
+        await video_store.set_source_path(analysis_id, str(temp_path))
         
-        # Adiciona task em background
-        background_tasks.add_task(
-            process_video_task,
+        # Inicializa status
+        await video_store.set_status(
             analysis_id,
-            str(temp_path),
-            safe_filename
+            AnalysisStatusEnum.QUEUED,
+            0.0,
+            "Na fila para processamento"
         )
         
+        task_args = (analysis_id, str(temp_path), safe_filename)
+        
+        if settings.REDIS_ENABLED:
+            # Enfileira no worker arq (inferência fora do processo da API)
+            redis = await get_redis()
+            await redis.enqueue_job("process_video_task", *task_args)
+        else:
+            # Adiciona task em background
+            background_tasks.add_task(process_video_task, *task_args)
+        
         logger.info(f"Vídeo enviado para análise: {analysis_id} ({safe_filename})")
         
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=status.HTTP_202_ACCEPTED,
             content={
                 "analysis_id": analysis_id,
@@ -266,67 +190,79 @@ async def get_analysis_status(analysis_id: str) -> AnalysisStatus:
     Returns:
         Status atual do processamento.
     """
-    if analysis_id not in analysis_statuses:
+    status_data = await video_store.get_status(analysis_id)
+    if status_data is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Análise não encontrada: {analysis_id}"
         )
     
-    status_data = analysis_statuses[analysis_id]
-    
     return AnalysisStatus(
         analysis_id=analysis_id,
         status=status_data["status"],
         progress_percent=status_data["progress_percent"],
         current_stage=status_data["current_stage"],
-        error_message=status_data.get("error_message")
+        error_message=status_data["error_message"]
     )
 
 
-@router.get("/result/{analysis_id}")
-async def get_analysis_result(analysis_id: str) -> VideoAnalysisResult:
+@router.get("/result/{analysis_id}", response_model=VideoAnalysisResult)
+async def get_analysis_result(analysis_id: str, request: Request) -> Response:
     """
     Obtém o resultado completo de uma análise concluída.
     
+    O JSON é servido já serializado (Redis ou relatório em disco), sem
+    passar pelo Pydantic no event loop.
+    
     Args:
         analysis_id: ID da análise.
     
     Returns:
         Resultado completo da análise com frames e relatório.
     """
+    # Resultado em cache (Redis/memória)
+    result_json = await video_store.get_result_json(analysis_id)
+    if result_json is not None:
+        return Response(content=result_json, media_type="application/json")
+    
     # Verifica status
-    if analysis_id not in analysis_statuses:
+    status_data = await video_store.get_status(analysis_id)
+    if status_data is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Análise não encontrada: {analysis_id}"
         )
     
-    status_data = analysis_statuses[analysis_id]
-    
     if status_data["status"] != AnalysisStatusEnum.COMPLETED:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Análise ainda não concluída. Status: {status_data['status']}"
         )
     
-    # Retorna resultado
-    if analysis_id in analysis_results:
-        return analysis_results[analysis_id]
-    
-    # Tenta carregar do disco
+    # Serve o JSON salvo direto do disco (sendfile), sem re-parsear
+    report_path = get_report_service().report_path(analysis_id, "video")
     try:
-        report_service = get_report_service()
-        result_data = report_service.load_report(analysis_id, "video")
-        return VideoAnalysisResult(**result_data)
+        stat_result = report_path.stat()
     except FileNotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Resultado não encontrado"
         )
+    
+    etag = f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    
+    return FileResponse(
+        report_path,
+        media_type="application/json",
+        headers={"ETag": etag},
+        stat_result=stat_result
+    )
 
 
 @router.get("/download/{analysis_id}")
-async def download_video(analysis_id: str, request: Request):
+async def download_video(analysis_id: str, request: Request, settings: SettingsDep):
     """
     Baixa o vídeo original associado a uma análise.
     Suporta Range requests para streaming HTML5.
@@ -334,72 +270,67 @@ async def download_video(analysis_id: str, request: Request):
     Args:
         analysis_id: ID da análise.
         request: Request HTTP para acessar headers.
+        settings: Configurações da aplicação (injetadas).
     
     Returns:
         Arquivo de vídeo ou StreamingResponse com range parcial.
     """
-    from pathlib import Path
-    from fastapi.responses import StreamingResponse
-    import os
-    
-    storage_path = Path("storage/temp")
-    logger.info(f"Buscando vídeo para análise {analysis_id} em {storage_path.absolute()}")
-    
-    # Tenta encontrar o vídeo com qualquer extensão comum
-    video_extensions = ["mp4", "avi", "mov", "mkv", "webm", "flv", "wmv"]
-    video_files = []
-    
-    # Lista todos os arquivos no diretório
-    all_files = list(storage_path.iterdir()) if storage_path.exists() else []
-    logger.info(f"Arquivos no storage/temp: {[f.name for f in all_files]}")
-    
-    for ext in video_extensions:
-        pattern = f"{analysis_id}_*.{ext}"
-        found = list(storage_path.glob(pattern))
-        logger.info(f"Buscando padrão {pattern}: {[f.name for f in found]}")
-        if found:
-            video_files = found
-            break
-    
-    if not video_files:
+    # Caminho registrado no upload (consulta O(1), sem varrer o diretório)
+    video_path_str = await video_store.get_source_path(analysis_id)
+    
+    if video_path_str is None:
+        # Análises anteriores ao registro (ou registro expirado): índice do diretório
+        found = _temp_video_index.lookup(analysis_id)
+        video_path_str = str(found) if found else None
+        if video_path_str is not None:
+            await video_store.set_source_path(analysis_id, video_path_str)
+    
+    video_path = Path(video_path_str) if video_path_str else None
+    
+    try:
+        stat_result = os.stat(video_path) if video_path else None
+    except FileNotFoundError:
+        stat_result = None
+    
+    if stat_result is None:
         logger.error(f"Vídeo não encontrado para análise {analysis_id}")
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Arquivo de vídeo não encontrado para análise {analysis_id}"
         )
     
-    video_path = video_files[0]
-    file_size = os.path.getsize(video_path)
-    
-    logger.info(f"Arquivo encontrado: {video_path.name}, tamanho: {file_size} bytes")
+    file_size = stat_result.st_size
+    logger.debug(f"Arquivo encontrado: {video_path.name}, tamanho: {file_size} bytes")
     
     # Detecta tipo MIME baseado na extensão
-    mime_types = {
-        'mp4': 'video/mp4',
-        'avi': 'video/x-msvideo',
-        'mov': 'video/quicktime',
-        'mkv': 'video/x-matroska',
-        'webm': 'video/webm',
-        'flv': 'video/x-flv',
-        'wmv': 'video/x-ms-wmv'
-    }
-    
     ext = video_path.suffix.lower().lstrip('.')
-    media_type = mime_types.get(ext, 'video/mp4')
+    media_type = VIDEO_MIME_TYPES.get(ext, 'video/mp4')
     
-    logger.info(f"Extensão: {ext}, MIME type: {media_type}")
+    logger.debug(f"Extensão: {ext}, MIME type: {media_type}")
+    
+    # Delega ao nginx (sendfile + Range nativos): os bytes não passam pelo Python
+    if settings.VIDEO_ACCEL_REDIRECT_PREFIX:
+        return Response(
+            media_type=media_type,
+            headers={
+                'X-Accel-Redirect': f"{settings.VIDEO_ACCEL_REDIRECT_PREFIX.rstrip('/')}/{video_path.name}",
+                'Accept-Ranges': 'bytes',
+                'Access-Control-Allow-Origin': '*'
+            }
+        )
     
     # Verifica se é uma requisição Range
     range_header = request.headers.get('range')
     
-    logger.info(f"Range header: {range_header}")
+    logger.debug(f"Range header: {range_header}")
     
     if not range_header:
-        # Sem range, retorna arquivo completo
-        response = FileResponse(
+        # Sem range, retorna arquivo completo (reaproveita o stat já feito)
+        response = VideoFileResponse(
             path=str(video_path),
             media_type=media_type,
-            filename=video_path.name
+            filename=video_path.name,
+            stat_result=stat_result
         )
         response.headers['Access-Control-Allow-Origin'] = '*'
         response.headers['Accept-Ranges'] = 'bytes'
@@ -416,14 +347,13 @@ async def download_video(analysis_id: str, request: Request):
         end = min(end, file_size - 1)
         chunk_size = end - start + 1
         
-        # Função geradora para streaming
-        def iter_file():
-            with open(video_path, 'rb') as f:
-                f.seek(start)
+        # Gerador assíncrono para streaming (leitura fora do event loop)
+        async def iter_file():
+            async with aiofiles.open(video_path, 'rb') as f:
+                await f.seek(start)
                 remaining = chunk_size
                 while remaining > 0:
-                    read_size = min(8192, remaining)  # 8KB chunks
-                    data = f.read(read_size)
+                    data = await f.read(min(VIDEO_STREAM_CHUNK_SIZE, remaining))
                     if not data:
                         break
                     remaining -= len(data)
@@ -438,7 +368,7 @@ async def download_video(analysis_id: str, request: Request):
             'Access-Control-Expose-Headers': 'Content-Range, Content-Length, Accept-Ranges'
         }
         
-        logger.info(f"Retornando Range: bytes {start}-{end}/{file_size} ({chunk_size} bytes)")
+        logger.debug(f"Retornando Range: bytes {start}-{end}/{file_size} ({chunk_size} bytes)")
         
         return StreamingResponse(
             iter_file(),
@@ -459,7 +389,7 @@ async def download_video(analysis_id: str, request: Request):
 async def get_annotated_frames(
     analysis_id: str,
     limit: int = 10
-) -> JSONResponse:
+) -> ORJSONResponse:
     """
     Obtém frames anotados com bounding boxes.
     
@@ -470,20 +400,25 @@ async def get_annotated_frames(
     Returns:
         JSON com lista de frames em base64.
     """
-    # Obtém resultado
-    if analysis_id not in analysis_results:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Resultado não encontrado"
-        )
-    
-    result = analysis_results[analysis_id]
+    # Obtém resultado (cache do store; descartado, vem do relatório em disco)
+    result = await video_store.get_result(analysis_id)
+    if result is None:
+        try:
+            raw = await asyncio.to_thread(
+                get_report_service().load_report_raw, analysis_id, "video"
+            )
+        except FileNotFoundError:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Resultado não encontrado"
+            )
+        result = await asyncio.to_thread(VideoAnalysisResult.model_validate_json, raw)
     
-    # Seleciona frames críticos e de alta severidade
-    critical_frames = [
-        f for f in result.frames 
-        if f.severity in ["critical", "high"]
-    ][:limit]
+    # Seleciona frames críticos e de alta severidade (para ao atingir o limite)
+    critical_frames = list(islice(
+        (f for f in result.frames if f.severity in ALERT_SEVERITIES),
+        limit
+    ))
     
     # TODO: Recuperar frames originais e anotar
     # Por enquanto, retorna apenas metadados
@@ -498,11 +433,11 @@ async def get_annotated_frames(
         for f in critical_frames
     ]
     
-    return JSONResponse(content={"frames": frames_data})
+    return ORJSONResponse(content={"frames": frames_data})
 
 
 @router.delete("/{analysis_id}")
-async def delete_analysis(analysis_id: str) -> JSONResponse:
+async def delete_analysis(analysis_id: str) -> ORJSONResponse:
     """
     Remove uma análise e seus arquivos associados.
     
@@ -512,27 +447,21 @@ async def delete_analysis(analysis_id: str) -> JSONResponse:
     Returns:
         Mensagem de confirmação.
     """
-    if analysis_id not in analysis_statuses:
+    # Remove status e resultado do store
+    if not await video_store.delete(analysis_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Análise não encontrada: {analysis_id}"
         )
     
-    # Remove do cache em memória
-    analysis_statuses.pop(analysis_id, None)
-    analysis_results.pop(analysis_id, None)
-    
     # Remove relatório do disco
     try:
-        report_service = get_report_service()
-        report_path = report_service.storage_dir / f"{analysis_id}_video.json"
-        if report_path.exists():
-            report_path.unlink()
+        get_report_service().delete_report(analysis_id, "video")
     except Exception as e:
         logger.warning(f"Erro ao remover relatório {analysis_id}: {e}")
     
     logger.info(f"Análise removida: {analysis_id}")
     
-    return JSONResponse(
+    return ORJSONResponse(
         content={"message": f"Análise {analysis_id} removida com sucesso"}
     )
@@ -3,51 +3,140 @@ WebSocket para streaming de alertas e progresso em tempo real.
 
 Implementa conexões WebSocket para comunicação bidirecional com o frontend,
 enviando updates de progresso e alertas críticos durante o processamento.
+
+Com ``REDIS_ENABLED`` as mensagens são publicadas no canal Redis
+``progress:{analysis_id}`` (inclusive pelos workers arq) e cada processo da API
+repassa o canal para os WebSockets conectados a ele.
+
+Cada conexão tem sua própria fila de saída e task de envio: um cliente lento
+não atrasa os demais clientes da mesma análise.
 """
 
 import asyncio
 import json
+from collections import deque
 from datetime import datetime
-from typing import Dict, List
+from typing import Deque, Dict, List, Set, Tuple
 
+import orjson
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from fastapi.websockets import WebSocketState
 
 from app.core.config import settings
 from app.core.logging_config import get_logger
+from app.core.redis_client import get_redis
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/ws", tags=["websocket"])
 
+# Início do JSON de progresso compacto (orjson não insere espaços)
+PROGRESS_PAYLOAD_PREFIX = '{"t":"p"'
+
+
+class _Outbox:
+    """
+    Fila de saída limitada de uma conexão WebSocket.
+    
+    Quando cheia, descarta a mensagem de progresso mais antiga para abrir
+    espaço (a próxima traz um valor mais novo). Alertas e demais mensagens
+    nunca são descartados.
+    """
+    
+    def __init__(self, maxsize: int):
+        """
+        Inicializa a fila.
+        
+        Args:
+            maxsize: Número máximo de mensagens pendentes.
+        """
+        self.maxsize = maxsize
+        self._items: Deque[Tuple[str, bool]] = deque()
+        self._ready = asyncio.Event()
+    
+    def put(self, payload: str, droppable: bool) -> bool:
+        """
+        Enfileira uma mensagem sem bloquear.
+        
+        Args:
+            payload: Mensagem serializada em JSON.
+            droppable: Se a mensagem pode ser descartada quando a fila encher.
+        
+        Returns:
+            False se a fila está cheia apenas de mensagens não descartáveis.
+        """
+        if len(self._items) >= self.maxsize:
+            oldest = next((item for item in self._items if item[1]), None)
+            if oldest is None:
+                return False
+            self._items.remove(oldest)
+        
+        self._items.append((payload, droppable))
+        self._ready.set()
+        return True
+    
+    async def get(self) -> str:
+        """Aguarda e retorna a próxima mensagem da fila."""
+        while not self._items:
+            self._ready.clear()
+            await self._ready.wait()
+        return self._items.popleft()[0]
+
 
 class ConnectionManager:
     """
     Gerenciador de conexões WebSocket.
     
     Mantém registro de todas as conexões ativas e permite broadcast
-    de mensagens para clientes específicos ou todos.
+    de mensagens para clientes específicos ou todos. O broadcast apenas
+    enfileira; cada conexão é drenada por sua própria task de envio.
     """
     
     def __init__(self):
         """Inicializa o gerenciador."""
         # Dicionário analysis_id -> lista de websockets
         self.active_connections: Dict[str, List[WebSocket]] = {}
+        # Dicionário analysis_id -> task que repassa o canal Redis (se habilitado)
+        self._relays: Dict[str, asyncio.Task] = {}
+        # Fila de saída e task de envio de cada conexão
+        self._outboxes: Dict[WebSocket, _Outbox] = {}
+        self._senders: Dict[WebSocket, asyncio.Task] = {}
+        # Fechamentos de conexões descartadas em andamento (referência forte)
+        self._closing: Set[asyncio.Task] = set()
     
-    async def connect(self, websocket: WebSocket, analysis_id: str):
+    async def connect(self, websocket: WebSocket, analysis_id: str) -> bool:
         """
         Aceita e registra uma nova conexão WebSocket.
         
         Args:
             websocket: Conexão WebSocket.
             analysis_id: ID da análise a monitorar.
+        
+        Returns:
+            False se o limite de conexões da análise foi atingido (a conexão
+            é fechada com código 1013 - "try again later").
         """
         await websocket.accept()
         
+        if len(self.active_connections.get(analysis_id, ())) >= settings.WEBSOCKET_MAX_PER_ANALYSIS:
+            logger.warning(f"Limite de WebSockets atingido para {analysis_id}")
+            await websocket.close(code=1013)
+            return False
+        
         if analysis_id not in self.active_connections:
             self.active_connections[analysis_id] = []
         
         self.active_connections[analysis_id].append(websocket)
+        outbox = _Outbox(settings.WEBSOCKET_SEND_QUEUE_SIZE)
+        self._outboxes[websocket] = outbox
+        self._senders[websocket] = asyncio.create_task(
+            self._sender_loop(websocket, analysis_id, outbox)
+        )
         logger.info(f"WebSocket conectado: {analysis_id} (total: {len(self.active_connections[analysis_id])})")
+        
+        if settings.REDIS_ENABLED and analysis_id not in self._relays:
+            self._relays[analysis_id] = asyncio.create_task(self._relay(analysis_id))
+        
+        return True
     
     def disconnect(self, websocket: WebSocket, analysis_id: str):
         """
@@ -57,6 +146,11 @@ class ConnectionManager:
             websocket: Conexão a remover.
             analysis_id: ID da análise.
         """
+        self._outboxes.pop(websocket, None)
+        sender = self._senders.pop(websocket, None)
+        if sender is not None and sender is not asyncio.current_task():
+            sender.cancel()
+        
         if analysis_id in self.active_connections:
             try:
                 self.active_connections[analysis_id].remove(websocket)
@@ -65,36 +159,147 @@ class ConnectionManager:
                 # Remove lista vazia
                 if not self.active_connections[analysis_id]:
                     del self.active_connections[analysis_id]
+                    relay = self._relays.pop(analysis_id, None)
+                    if relay is not None:
+                        relay.cancel()
             except ValueError:
                 pass
     
+    def _drop(self, websocket: WebSocket, analysis_id: str):
+        """
+        Descarta uma conexão e fecha o socket com código 1013 ("try again
+        later"), para o cliente reconectar em vez de esperar o heartbeat.
+        
+        Args:
+            websocket: Conexão a descartar.
+            analysis_id: ID da análise.
+        """
+        self.disconnect(websocket, analysis_id)
+        if websocket.client_state == WebSocketState.CONNECTED:
+            task = asyncio.create_task(self._close(websocket))
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+    
+    async def _close(self, websocket: WebSocket):
+        """Fecha o socket de uma conexão descartada (limitado ao timeout de envio)."""
+        try:
+            await asyncio.wait_for(
+                websocket.close(code=1013),
+                timeout=settings.WEBSOCKET_SEND_TIMEOUT
+            )
+        except Exception as e:
+            logger.debug(f"Erro ao fechar WebSocket descartado: {e}")
+    
     async def send_message(self, analysis_id: str, message: dict):
         """
         Envia mensagem para todos os clientes de uma análise.
         
+        O JSON é serializado uma única vez, independente do número de
+        clientes. Com Redis, publica no canal da análise para alcançar
+        clientes conectados em qualquer processo da API.
+        
         Args:
             analysis_id: ID da análise.
             message: Dicionário a enviar (será convertido para JSON).
         """
-        if analysis_id not in self.active_connections:
+        # orjson: mais rápido que json e aceita escalares numpy (ex: confiança do YOLO)
+        payload = orjson.dumps(message, option=orjson.OPT_SERIALIZE_NUMPY).decode("utf-8")
+        
+        if settings.REDIS_ENABLED:
+            redis = await get_redis()
+            await redis.publish(f"progress:{analysis_id}", payload)
             return
         
-        # Lista de conexões a remover (se falharem)
-        dead_connections = []
+        self._deliver(analysis_id, payload)
+    
+    def send_personal(self, websocket: WebSocket, message: dict) -> bool:
+        """
+        Enfileira uma mensagem para uma única conexão.
         
-        for connection in self.active_connections[analysis_id]:
-            try:
-                if connection.client_state == WebSocketState.CONNECTED:
-                    await connection.send_json(message)
-                else:
-                    dead_connections.append(connection)
-            except Exception as e:
-                logger.warning(f"Erro ao enviar mensagem WebSocket: {e}")
-                dead_connections.append(connection)
-        
-        # Remove conexões mortas
-        for dead_conn in dead_connections:
-            self.disconnect(dead_conn, analysis_id)
+        Args:
+            websocket: Conexão de destino.
+            message: Dicionário a enviar (será convertido para JSON).
+        
+        Returns:
+            False se a conexão não está mais registrada.
+        """
+        outbox = self._outboxes.get(websocket)
+        if outbox is None:
+            return False
+        return outbox.put(orjson.dumps(message).decode("utf-8"), droppable=True)
+    
+    async def _relay(self, analysis_id: str):
+        """
+        Repassa o canal Redis da análise para os WebSockets locais.
+        
+        Args:
+            analysis_id: ID da análise.
+        """
+        redis = await get_redis()
+        pubsub = redis.pubsub()
+        await pubsub.subscribe(f"progress:{analysis_id}")
+        try:
+            async for raw in pubsub.listen():
+                if raw["type"] == "message":
+                    # Payload já é o JSON final; repassa sem decodificar
+                    self._deliver(analysis_id, raw["data"].decode("utf-8"))
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Erro no repasse Redis do WebSocket {analysis_id}: {e}")
+        finally:
+            await pubsub.unsubscribe()
+            await pubsub.close()
+    
+    def _deliver(self, analysis_id: str, payload: str):
+        """
+        Enfileira um JSON já serializado para os WebSockets deste processo.
+        
+        Não bloqueia: cada conexão é drenada pela sua task de envio. Uma
+        conexão cuja fila está cheia de mensagens não descartáveis é
+        desconectada.
+        
+        Args:
+            analysis_id: ID da análise.
+            payload: Mensagem serializada em JSON.
+        """
+        droppable = payload.startswith(PROGRESS_PAYLOAD_PREFIX)
+        
+        for connection in list(self.active_connections.get(analysis_id, ())):
+            outbox = self._outboxes.get(connection)
+            if outbox is not None and not outbox.put(payload, droppable):
+                logger.warning(f"Fila do WebSocket cheia, cliente descartado: {analysis_id}")
+                self._drop(connection, analysis_id)
+    
+    async def _sender_loop(self, websocket: WebSocket, analysis_id: str, outbox: _Outbox):
+        """
+        Drena a fila de saída de uma conexão.
+        
+        Cada envio é limitado a ``WEBSOCKET_SEND_TIMEOUT``; um cliente que
+        não drena o socket a tempo é desconectado.
+        
+        Args:
+            websocket: Conexão WebSocket.
+            analysis_id: ID da análise.
+            outbox: Fila de saída da conexão.
+        """
+        try:
+            while True:
+                payload = await outbox.get()
+                if websocket.client_state != WebSocketState.CONNECTED:
+                    break
+                await asyncio.wait_for(
+                    websocket.send_text(payload),
+                    timeout=settings.WEBSOCKET_SEND_TIMEOUT
+                )
+        except asyncio.CancelledError:
+            return
+        except asyncio.TimeoutError:
+            logger.warning(f"Cliente WebSocket lento descartado: {analysis_id}")
+        except Exception as e:
+            logger.warning(f"Erro ao enviar mensagem WebSocket: {e}")
+        
+        self._drop(websocket, analysis_id)
     
     async def broadcast_progress(
         self,
@@ -110,14 +315,9 @@ class ConnectionManager:
             percent: Progresso percentual (0-100).
             stage: Descrição da etapa atual.
         """
-        message = {
-            "type": "progress",
-            "timestamp": datetime.utcnow().isoformat(),
-            "data": {
-                "percent": percent,
-                "stage": stage
-            }
-        }
+        # Formato compacto (mensagem de alta frequência): {"t": "p", "d": [percent, stage]}
+        # Sem timestamp: o cliente usa a hora de chegada
+        message = {"t": "p", "d": [round(percent, 1), stage]}
         await self.send_message(analysis_id, message)
     
     async def broadcast_alert(self, analysis_id: str, alert_data: dict):
@@ -135,6 +335,21 @@ class ConnectionManager:
         }
         await self.send_message(analysis_id, message)
     
+    async def broadcast_alerts(self, analysis_id: str, alerts: List[dict]):
+        """
+        Envia um lote de alertas de anomalia em uma única mensagem.
+        
+        Args:
+            analysis_id: ID da análise.
+            alerts: Lista de alertas (formato RealtimeAlert).
+        """
+        message = {
+            "type": "alerts_batch",
+            "timestamp": datetime.utcnow().isoformat(),
+            "data": alerts
+        }
+        await self.send_message(analysis_id, message)
+    
     async def broadcast_completed(self, analysis_id: str, summary: dict):
         """
         Envia notificação de conclusão.
@@ -162,37 +377,45 @@ async def analysis_stream(websocket: WebSocket, analysis_id: str):
     
     Protocolo de mensagens:
     - {"type": "ping"}: Heartbeat (a cada N segundos)
-    - {"type": "progress", "data": {"percent": float, "stage": str}}
+    - {"t": "p", "d": [percent, stage]}: Progresso (formato compacto)
     - {"type": "alert", "data": {...}}
+    - {"type": "alerts_batch", "data": [{...}, ...]}: Vários alertas de uma vez
     - {"type": "completed", "data": {...}}
     
+    As mensagens são comprimidas com permessage-deflate quando o cliente
+    suporta (navegadores modernos; habilitado no uvicorn).
+    
     Args:
         websocket: Conexão WebSocket.
         analysis_id: ID da análise a monitorar.
     """
-    await connection_manager.connect(websocket, analysis_id)
+    if not await connection_manager.connect(websocket, analysis_id):
+        return
     
-    # Envia mensagem inicial de conexão
-    await websocket.send_json({
+    # Envia mensagem inicial de conexão (pela fila, como as demais)
+    connection_manager.send_personal(websocket, {
         "type": "connected",
         "timestamp": datetime.utcnow().isoformat(),
         "message": f"Conectado ao stream da análise {analysis_id}"
     })
     
+    heartbeat_interval = settings.WEBSOCKET_HEARTBEAT_INTERVAL
+    recv_task = asyncio.create_task(websocket.receive_text())
+    heartbeat_task = asyncio.create_task(asyncio.sleep(heartbeat_interval))
+    
     try:
-        # Loop de heartbeat e recepção de mensagens
-        heartbeat_interval = settings.WEBSOCKET_HEARTBEAT_INTERVAL
-        last_heartbeat = asyncio.get_event_loop().time()
-        
+        # Espera o que vier primeiro: mensagem do cliente ou hora do heartbeat
         while True:
-            try:
-                # Aguarda mensagem do cliente com timeout
-                data = await asyncio.wait_for(
-                    websocket.receive_text(),
-                    timeout=1.0
-                )
+            done, _ = await asyncio.wait(
+                {recv_task, heartbeat_task},
+                return_when=asyncio.FIRST_COMPLETED
+            )
+            
+            if recv_task in done:
+                data = recv_task.result()  # Propaga WebSocketDisconnect
+                recv_task = asyncio.create_task(websocket.receive_text())
                 
-                # Processa mensagem do cliente (se houver)
+                # Processa mensagem do cliente
                 try:
                     client_msg = json.loads(data)
                     
@@ -203,21 +426,13 @@ async def analysis_stream(websocket: WebSocket, analysis_id: str):
                 except json.JSONDecodeError:
                     logger.warning(f"Mensagem WebSocket inválida: {data}")
             
-            except asyncio.TimeoutError:
-                # Timeout é normal, apenas continua
-                pass
-            
-            # Envia heartbeat periodicamente
-            current_time = asyncio.get_event_loop().time()
-            if current_time - last_heartbeat >= heartbeat_interval:
-                try:
-                    await websocket.send_json({
-                        "type": "ping",
-                        "timestamp": datetime.utcnow().isoformat()
-                    })
-                    last_heartbeat = current_time
-                except Exception as e:
-                    logger.warning(f"Erro ao enviar heartbeat: {e}")
+            if heartbeat_task in done:
+                heartbeat_task = asyncio.create_task(asyncio.sleep(heartbeat_interval))
+                # False: a task de envio já descartou a conexão
+                if not connection_manager.send_personal(websocket, {
+                    "type": "ping",
+                    "timestamp": datetime.utcnow().isoformat()
+                }):
                     break
     
     except WebSocketDisconnect:
@@ -225,6 +440,8 @@ async def analysis_stream(websocket: WebSocket, analysis_id: str):
     except Exception as e:
         logger.error(f"Erro no WebSocket {analysis_id}: {e}", exc_info=True)
     finally:
+        recv_task.cancel()
+        heartbeat_task.cancel()
         connection_manager.disconnect(websocket, analysis_id)
 
 
@@ -1,6 +1,6 @@
 """Módulo core com configurações, logging e segurança."""
 
-from .config import Settings, get_settings, settings
+from .config import Settings, get_settings
 from .logging_config import get_logger, setup_logging, RequestLogger
 from .security import (
     generate_analysis_id,
@@ -9,6 +9,7 @@ from .security import (
     compute_file_hash,
     sanitize_filename,
     SecurityHeaders,
+    SECURITY_HEADERS,
 )
 
 __all__ = [
@@ -24,4 +25,12 @@ __all__ = [
     "compute_file_hash",
     "sanitize_filename",
     "SecurityHeaders",
+    "SECURITY_HEADERS",
 ]
+
+
+def __getattr__(name: str):
+    """Resolve ``settings`` sob demanda (ver ``app.core.config``)."""
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -5,6 +5,7 @@ Carrega variáveis de ambiente do arquivo .env e fornece valores padrão
 seguros. Todas as configurações críticas devem ser definidas aqui.
 """
 
+from functools import cached_property, lru_cache
 from typing import Optional
 
 from pydantic import Field, field_validator
@@ -44,12 +45,12 @@ class Settings(BaseSettings):
         ge=1,
         description="Tamanho máximo de upload em megabytes"
     )
-    ALLOWED_VIDEO_EXTENSIONS: list[str] = Field(
-        default=[".mp4", ".avi", ".mov", ".mkv"],
+    ALLOWED_VIDEO_EXTENSIONS: tuple[str, ...] = Field(
+        default=(".mp4", ".avi", ".mov", ".mkv"),
         description="Extensões de vídeo permitidas"
     )
-    ALLOWED_AUDIO_EXTENSIONS: list[str] = Field(
-        default=[".mp3", ".wav", ".m4a", ".ogg", ".webm"],
+    ALLOWED_AUDIO_EXTENSIONS: tuple[str, ...] = Field(
+        default=(".mp3", ".wav", ".m4a", ".ogg", ".webm"),
         description="Extensões de áudio permitidas"
     )
     
@@ -59,6 +60,21 @@ class Settings(BaseSettings):
         ge=5,
         description="Intervalo do heartbeat WebSocket em segundos"
     )
+    WEBSOCKET_MAX_PER_ANALYSIS: int = Field(
+        default=20,
+        ge=1,
+        description="Máximo de conexões WebSocket simultâneas por análise"
+    )
+    WEBSOCKET_SEND_TIMEOUT: float = Field(
+        default=5.0,
+        gt=0,
+        description="Tempo máximo (segundos) de envio a um cliente antes de descartá-lo"
+    )
+    WEBSOCKET_SEND_QUEUE_SIZE: int = Field(
+        default=64,
+        ge=1,
+        description="Máximo de mensagens pendentes por conexão WebSocket"
+    )
     
     # Storage Configuration
     STORAGE_BACKEND: str = Field(
@@ -69,6 +85,10 @@ class Settings(BaseSettings):
         default="./storage",
         description="Diretório local para armazenamento"
     )
+    VIDEO_ACCEL_REDIRECT_PREFIX: Optional[str] = Field(
+        default=None,
+        description="Location interna do nginx para servir vídeos via X-Accel-Redirect (ex: /internal/video)"
+    )
     AWS_S3_BUCKET: Optional[str] = Field(
         default=None,
         description="Nome do bucket S3 (se STORAGE_BACKEND=s3)"
@@ -100,12 +120,12 @@ class Settings(BaseSettings):
         description="Origens permitidas para CORS (separadas por vírgula)"
     )
     
-    @property
-    def cors_origins_list(self) -> list[str]:
-        """Retorna CORS_ORIGINS como lista."""
+    @cached_property
+    def cors_origins_list(self) -> tuple[str, ...]:
+        """Retorna CORS_ORIGINS como tupla imutável (calculada uma vez)."""
         if isinstance(self.CORS_ORIGINS, list):
-            return self.CORS_ORIGINS
-        return [origin.strip() for origin in self.CORS_ORIGINS.split(",") if origin.strip()]
+            return tuple(self.CORS_ORIGINS)
+        return tuple(origin.strip() for origin in self.CORS_ORIGINS.split(",") if origin.strip())
     
     # Application Configuration
     APP_ENV: str = Field(
@@ -151,11 +171,54 @@ class Settings(BaseSettings):
         ge=0.0,
         description="Overlap entre segmentos de áudio em segundos"
     )
+    AUDIO_MAX_DURATION_SECONDS: float = Field(
+        default=4 * 3600,
+        gt=0,
+        description="Duração máxima de áudio aceita no upload em segundos"
+    )
+    AUDIO_PROCESS_WORKERS: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Processos para extração de features de áudio (None = nº de CPUs)"
+    )
+    AUDIO_FEATURE_THREADS: bool = Field(
+        default=False,
+        description="Calcula o pitch (YIN) em thread paralela às features espectrais"
+    )
     
     # Redis Configuration (para fila de tasks)
     REDIS_HOST: str = Field(default="redis", description="Host do Redis")
     REDIS_PORT: int = Field(default=6379, ge=1, le=65535, description="Porta do Redis")
     REDIS_DB: int = Field(default=0, ge=0, description="Banco de dados Redis")
+    REDIS_ENABLED: bool = Field(
+        default=False,
+        description="Usa Redis para estado das análises e fila de tasks (workers arq)"
+    )
+    ANALYSIS_STATE_TTL_SECONDS: int = Field(
+        default=86400,
+        ge=60,
+        description="Tempo de vida (segundos) do status/resultado das análises no Redis"
+    )
+    ANALYSIS_STATUS_CACHE_SIZE: int = Field(
+        default=2048,
+        ge=32,
+        description="Máximo de status de análises mantidos em memória (backend local)"
+    )
+    ANALYSIS_RESULT_CACHE_SIZE: int = Field(
+        default=512,
+        ge=32,
+        description="Máximo de resultados de análises mantidos em memória (backend local)"
+    )
+    VIDEO_RESULT_CACHE_SIZE: int = Field(
+        default=100,
+        ge=32,
+        description="Máximo de resultados de vídeo (grandes) mantidos em memória (backend local)"
+    )
+    WORKER_MAX_JOBS: int = Field(
+        default=2,
+        ge=1,
+        description="Número máximo de análises simultâneas por worker (arq ou escalonador local)"
+    )
     
     # Gemini API Configuration
     GEMINI_MAX_RETRIES: int = Field(
@@ -185,48 +248,63 @@ class Settings(BaseSettings):
             raise ValueError(f"STORAGE_BACKEND deve ser um de: {', '.join(allowed)}")
         return v
     
+    @field_validator("ALLOWED_VIDEO_EXTENSIONS", "ALLOWED_AUDIO_EXTENSIONS")
+    @classmethod
+    def normalize_extensions(cls, v: tuple[str, ...]) -> tuple[str, ...]:
+        """Normaliza extensões para minúsculas (tupla imutável, sem repetições)."""
+        return tuple(dict.fromkeys(ext.lower() for ext in v))
+    
     @field_validator("LOG_LEVEL")
     @classmethod
     def validate_log_level(cls, v: str) -> str:
         """Valida que o log level é válido."""
-        allowed = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
+        allowed = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
         v_upper = v.upper()
         if v_upper not in allowed:
             raise ValueError(f"LOG_LEVEL deve ser um de: {', '.join(allowed)}")
         return v_upper
     
-    @property
+    @cached_property
+    def allowed_video_extensions_set(self) -> frozenset[str]:
+        """Extensões de vídeo permitidas, para teste de pertinência O(1)."""
+        return frozenset(self.ALLOWED_VIDEO_EXTENSIONS)
+    
+    @cached_property
+    def allowed_audio_extensions_set(self) -> frozenset[str]:
+        """Extensões de áudio permitidas, para teste de pertinência O(1)."""
+        return frozenset(self.ALLOWED_AUDIO_EXTENSIONS)
+    
+    @cached_property
     def max_upload_size_bytes(self) -> int:
         """Retorna o tamanho máximo de upload em bytes."""
         return self.MAX_UPLOAD_SIZE_MB * 1024 * 1024
     
-    @property
+    @cached_property
     def is_production(self) -> bool:
         """Verifica se está em ambiente de produção."""
         return self.APP_ENV.lower() == "production"
     
-    @property
+    @cached_property
     def is_development(self) -> bool:
         """Verifica se está em ambiente de desenvolvimento."""
         return self.APP_ENV.lower() == "development"
 
 
-# Singleton para garantir que as configurações sejam carregadas uma única vez
-_settings: Optional[Settings] = None
-
-
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """
     Obtém a instância singleton das configurações.
     
+    O ``.env`` só é lido na primeira chamada (não no import do módulo).
+    
     Returns:
         Instância configurada de Settings.
     """
-    global _settings
-    if _settings is None:
-        _settings = Settings()
-    return _settings
+    return Settings()
 
 
-# Atalho para uso direto
-settings = get_settings()
+def __getattr__(name: str):
+    """Atalho ``settings`` para uso direto, resolvido no primeiro acesso."""
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
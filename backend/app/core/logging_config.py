@@ -6,10 +6,27 @@ para desenvolvimento e produção.
 """
 
 import logging
+import re
 import sys
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Dict, Optional
 
-from .config import settings
+import orjson
+
+from .config import get_settings
+
+
+# Se setup_logging() já configurou o logging neste processo
+_configured = False
+
+# Níveis aceitos em LOG_LEVEL (ver Settings.validate_log_level)
+LOG_LEVELS = MappingProxyType({
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "CRITICAL": logging.CRITICAL,
+})
 
 
 class ColoredFormatter(logging.Formatter):
@@ -29,13 +46,74 @@ class ColoredFormatter(logging.Formatter):
     }
     RESET = "\033[0m"
     
+    # Campo %(levelname)... do formato (com flags/largura, ex: %(levelname)-8s)
+    LEVELNAME_FIELD = re.compile(r"%\(levelname\)[-#0 +]*\d*s")
+    
+    def __init__(
+        self,
+        fmt: Optional[str] = None,
+        datefmt: Optional[str] = None,
+        use_color: bool = True,
+        **kwargs: Any
+    ):
+        """
+        Inicializa o formatter.
+        
+        Args:
+            fmt: Formato dos logs (estilo %).
+            datefmt: Formato da data.
+            use_color: Se aplica cores (decidido uma vez, não por registro).
+            **kwargs: Demais argumentos de ``logging.Formatter``.
+        """
+        super().__init__(fmt, datefmt, **kwargs)
+        
+        # Um formatter por nível, com o campo levelname já envolto na cor:
+        # o record não é alterado (outros handlers recebem o mesmo objeto)
+        self._level_formatters: Dict[str, logging.Formatter] = {}
+        if use_color and fmt:
+            for levelname, color in self.COLORS.items():
+                colored_fmt = self.LEVELNAME_FIELD.sub(
+                    lambda match, color=color: f"{color}{match.group(0)}{self.RESET}",
+                    fmt
+                )
+                self._level_formatters[levelname] = logging.Formatter(colored_fmt, datefmt, **kwargs)
+    
     def format(self, record: logging.LogRecord) -> str:
-        """Formata o log record com cores se estiver em development."""
-        if settings.is_development:
-            levelname = record.levelname
-            if levelname in self.COLORS:
-                record.levelname = f"{self.COLORS[levelname]}{levelname}{self.RESET}"
-        return super().format(record)
+        """Formata o log record, com cores se habilitadas."""
+        formatter = self._level_formatters.get(record.levelname)
+        if formatter is None:
+            return super().format(record)
+        return formatter.format(record)
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formatter de logs em JSON (uma linha por registro) para produção.
+    
+    Serializa com orjson, que escapa aspas e quebras de linha da mensagem
+    (o template ``%`` anterior gerava JSON inválido nesses casos).
+    """
+    
+    default_time_format = "%Y-%m-%dT%H:%M:%S"
+    default_msec_format = None
+    
+    def format(self, record: logging.LogRecord) -> str:
+        """Formata o log record como objeto JSON."""
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "name": record.name,
+            "message": record.getMessage(),
+            "module": record.module,
+            "function": record.funcName,
+            "line": record.lineno,
+        }
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return orjson.dumps(entry, default=str).decode("utf-8")
 
 
 def setup_logging() -> None:
@@ -44,7 +122,15 @@ def setup_logging() -> None:
     
     Em desenvolvimento: logs coloridos no console com formato detalhado.
     Em produção: logs estruturados em JSON para integração com sistemas de monitoramento.
+    
+    Idempotente: chamadas após a primeira não fazem nada.
     """
+    global _configured
+    if _configured:
+        return
+    _configured = True
+    
+    settings = get_settings()
     
     # Remove handlers existentes para evitar duplicação
     root_logger = logging.getLogger()
@@ -52,7 +138,7 @@ def setup_logging() -> None:
         root_logger.removeHandler(handler)
     
     # Define o nível de log global
-    log_level = getattr(logging, settings.LOG_LEVEL)
+    log_level = LOG_LEVELS[settings.LOG_LEVEL]
     root_logger.setLevel(log_level)
     
     # Console handler
@@ -61,17 +147,13 @@ def setup_logging() -> None:
     
     if settings.is_production:
         # Formato JSON estruturado para produção
-        formatter = logging.Formatter(
-            '{"time":"%(asctime)s", "level":"%(levelname)s", "name":"%(name)s", '
-            '"message":"%(message)s", "module":"%(module)s", "function":"%(funcName)s", '
-            '"line":%(lineno)d}',
-            datefmt="%Y-%m-%dT%H:%M:%S"
-        )
+        formatter = JsonFormatter()
     else:
         # Formato legível para desenvolvimento
         formatter = ColoredFormatter(
             "[%(asctime)s] %(levelname)-8s [%(name)s:%(funcName)s:%(lineno)d] - %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S"
+            datefmt="%Y-%m-%d %H:%M:%S",
+            use_color=settings.is_development
         )
     
     console_handler.setFormatter(formatter)
@@ -84,6 +166,9 @@ def setup_logging() -> None:
     logging.getLogger("httpx").setLevel(logging.WARNING)
     logging.getLogger("httpcore").setLevel(logging.WARNING)
     
+    # O middleware log_requests já registra cada requisição
+    logging.getLogger("uvicorn.access").disabled = True
+    
     logging.info(f"Logging configurado - Nível: {settings.LOG_LEVEL}, Ambiente: {settings.APP_ENV}")
 
 
@@ -116,6 +201,24 @@ class RequestLogger:
         """
         self.logger = logger
     
+    @staticmethod
+    def level_for(status_code: int) -> int:
+        """Nível de log de uma resposta: ERROR (5xx), WARNING (4xx) ou INFO."""
+        if status_code >= 500:
+            return logging.ERROR
+        if status_code >= 400:
+            return logging.WARNING
+        return logging.INFO
+    
+    def is_enabled_for(self, status_code: int) -> bool:
+        """
+        Indica se uma resposta com esse status seria registrada.
+        
+        Permite pular a coleta de campos extras (ex: IP do cliente) quando o
+        nível configurado descartaria o log.
+        """
+        return self.logger.isEnabledFor(self.level_for(status_code))
+    
     def log_request(
         self,
         method: str,
@@ -134,11 +237,9 @@ class RequestLogger:
             duration_ms: Duração da requisição em milissegundos.
             **extra: Campos adicionais para logging.
         """
-        log_msg = f"{method} {path} - {status_code} ({duration_ms:.2f}ms)"
+        level = self.level_for(status_code)
+        if not self.logger.isEnabledFor(level):
+            return
         
-        if status_code >= 500:
-            self.logger.error(log_msg, extra=extra)
-        elif status_code >= 400:
-            self.logger.warning(log_msg, extra=extra)
-        else:
-            self.logger.info(log_msg, extra=extra)
+        log_msg = f"{method} {path} - {status_code} ({duration_ms:.2f}ms)"
+        self.logger.log(level, log_msg, extra=extra)
@@ -0,0 +1,51 @@
+"""
+Conexão compartilhada com o Redis.
+
+O pool do arq (``ArqRedis``) é um ``redis.asyncio.Redis`` e serve tanto para
+enfileirar jobs nos workers quanto para ler/escrever o estado das análises.
+"""
+
+from typing import Optional
+
+from arq import create_pool
+from arq.connections import ArqRedis, RedisSettings
+
+from .config import get_settings
+
+_redis_pool: Optional[ArqRedis] = None
+
+
+def get_redis_settings() -> RedisSettings:
+    """
+    Monta as configurações de conexão do arq a partir das settings.
+
+    Returns:
+        RedisSettings com host, porta e banco configurados.
+    """
+    settings = get_settings()
+    return RedisSettings(
+        host=settings.REDIS_HOST,
+        port=settings.REDIS_PORT,
+        database=settings.REDIS_DB,
+    )
+
+
+async def get_redis() -> ArqRedis:
+    """
+    Retorna o pool Redis (singleton), criando-o na primeira chamada.
+
+    Returns:
+        Instância ArqRedis compartilhada pelo processo.
+    """
+    global _redis_pool
+    if _redis_pool is None:
+        _redis_pool = await create_pool(get_redis_settings())
+    return _redis_pool
+
+
+async def close_redis() -> None:
+    """Fecha o pool Redis, se aberto."""
+    global _redis_pool
+    if _redis_pool is not None:
+        await _redis_pool.close()
+        _redis_pool = None
@@ -7,23 +7,40 @@ de integridade de arquivos.
 
 import hashlib
 import secrets
-import uuid
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from types import MappingProxyType
+from typing import Iterable, Optional
 
 from fastapi import HTTPException, UploadFile, status
 
-from .config import settings
+from .config import get_settings
+
+# Bloco de leitura do hash quando hashlib.file_digest não existe (1 MiB)
+HASH_CHUNK_SIZE = 1 << 20
+
+# Construtores diretos dos algoritmos mais usados
+_HASH_CONSTRUCTORS = MappingProxyType({
+    "sha256": hashlib.sha256,
+    "sha1": hashlib.sha1,
+    "md5": hashlib.md5,
+    "sha512": hashlib.sha512,
+})
+
+# Caracteres perigosos em nomes de arquivo -> "_" (tabela para str.translate)
+_DANGEROUS_FILENAME_TABLE = str.maketrans({char: "_" for char in '/\\<>:"|?*'})
 
 
 def generate_analysis_id() -> str:
     """
-    Gera um ID único para uma análise usando UUID4.
+    Gera um ID único para uma análise.
+    
+    Usa 128 bits aleatórios de ``secrets`` (mesma entropia de um UUID4).
     
     Returns:
-        String UUID formatada.
+        String hexadecimal de 32 caracteres.
     """
-    return str(uuid.uuid4())
+    return secrets.token_hex(16)
 
 
 def generate_secure_token(length: int = 32) -> str:
@@ -39,20 +56,29 @@ def generate_secure_token(length: int = 32) -> str:
     return secrets.token_hex(length)
 
 
-def validate_file_extension(filename: str, allowed_extensions: list[str]) -> bool:
+def validate_file_extension(filename: str, allowed_extensions: Iterable[str]) -> bool:
     """
     Valida se a extensão do arquivo está na lista de permitidas.
     
     Args:
         filename: Nome do arquivo a validar.
-        allowed_extensions: Lista de extensões permitidas (incluindo o ponto).
+        allowed_extensions: Extensões permitidas (incluindo o ponto). Um
+            ``frozenset`` é tratado como já normalizado em minúsculas
+            (ex: ``settings.allowed_video_extensions_set``).
     
     Returns:
         True se a extensão é válida, False caso contrário.
     """
-    file_path = Path(filename)
-    extension = file_path.suffix.lower()
-    return extension in [ext.lower() for ext in allowed_extensions]
+    extension = Path(filename).suffix.lower()
+    if isinstance(allowed_extensions, frozenset):
+        return extension in allowed_extensions
+    return extension in _lowercase_extensions(tuple(allowed_extensions))
+
+
+@lru_cache(maxsize=8)
+def _lowercase_extensions(extensions: tuple[str, ...]) -> frozenset[str]:
+    """Conjunto das extensões em minúsculas (calculado uma vez por lista)."""
+    return frozenset(ext.lower() for ext in extensions)
 
 
 def validate_file_size(file_size: int, max_size_bytes: int) -> bool:
@@ -89,17 +115,21 @@ async def validate_upload_file(
             detail="Nome de arquivo não fornecido"
         )
     
+    settings = get_settings()
+    
     # Valida extensão
     if file_type == "video":
         allowed = settings.ALLOWED_VIDEO_EXTENSIONS
+        allowed_set = settings.allowed_video_extensions_set
         file_type_name = "vídeo"
     elif file_type == "audio":
         allowed = settings.ALLOWED_AUDIO_EXTENSIONS
+        allowed_set = settings.allowed_audio_extensions_set
         file_type_name = "áudio"
     else:
         raise ValueError(f"Tipo de arquivo inválido: {file_type}")
     
-    if not validate_file_extension(file.filename, allowed):
+    if not validate_file_extension(file.filename, allowed_set):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Extensão de arquivo inválida. Permitidas: {', '.join(allowed)}"
@@ -126,14 +156,20 @@ def compute_file_hash(file_path: Path, algorithm: str = "sha256") -> str:
     Returns:
         Hash hexadecimal do arquivo.
     """
-    hash_func = hashlib.new(algorithm)
+    # Construtor direto quando conhecido (evita a busca de hashlib.new)
+    constructor = _HASH_CONSTRUCTORS.get(algorithm)
     
-    with open(file_path, "rb") as f:
-        # Lê em chunks para não sobrecarregar memória com arquivos grandes
-        for chunk in iter(lambda: f.read(8192), b""):
+    # Sem buffer do Python: file_digest lê direto no seu próprio buffer
+    with open(file_path, "rb", buffering=0) as f:
+        if hasattr(hashlib, "file_digest"):
+            # Python 3.11+: laço de leitura/atualização em C
+            return hashlib.file_digest(f, constructor or algorithm).hexdigest()
+        
+        hash_func = constructor() if constructor else hashlib.new(algorithm)
+        # Lê em chunks de 1 MiB para não sobrecarregar memória com arquivos grandes
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
             hash_func.update(chunk)
-    
-    return hash_func.hexdigest()
+        return hash_func.hexdigest()
 
 
 def sanitize_filename(filename: str) -> str:
@@ -146,12 +182,8 @@ def sanitize_filename(filename: str) -> str:
     Returns:
         Nome de arquivo seguro.
     """
-    # Remove caracteres especiais perigosos
-    dangerous_chars = ['/', '\\', '..', '<', '>', ':', '"', '|', '?', '*']
-    safe_name = filename
-    
-    for char in dangerous_chars:
-        safe_name = safe_name.replace(char, '_')
+    # Remove caracteres especiais perigosos (uma passada em C por etapa)
+    safe_name = filename.replace('..', '_').translate(_DANGEROUS_FILENAME_TABLE)
     
     # Limita comprimento
     if len(safe_name) > 255:
@@ -184,3 +216,7 @@ class SecurityHeaders:
             "X-XSS-Protection": "1; mode=block",
             "Strict-Transport-Security": "max-age=31536000; includeSubDomains",
         }
+
+
+# Headers de segurança montados uma única vez (aplicados a toda resposta)
+SECURITY_HEADERS = MappingProxyType(SecurityHeaders.get_headers())
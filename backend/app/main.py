@@ -1,30 +1,31 @@
 """
 Aplicação principal FastAPI — MedVision AI.
 
-Este é o ponto de entrada da API backend. Configura a aplicação FastAPI,
-registra routers, middlewares, CORS, logging e gerencia o ciclo de vida.
+Este é o ponto de entrada da API backend. ``create_app`` configura a
+aplicação FastAPI, registra routers, middlewares, CORS, logging e o ciclo de
+vida; ``app`` (alvo ``app.main:app`` do uvicorn) é criado no fim do módulo.
 """
 
-import time
 from contextlib import asynccontextmanager
+from time import perf_counter_ns
 from typing import Optional
 
-from fastapi import FastAPI, Request, status
+from fastapi import APIRouter, FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
-from app.core.config import settings
+from app.api.dependencies import SettingsDep
+from app.core.config import get_settings
+from app.core.redis_client import close_redis
 from app.core.logging_config import setup_logging, get_logger, RequestLogger
-from app.core.security import SecurityHeaders
-from app.services import get_yolo_service
-from app.api.routes import video, audio, reports, websocket
+from app.core.security import SECURITY_HEADERS
+from app import services
 
-# Configura logging
-setup_logging()
 logger = get_logger(__name__)
+request_logger = RequestLogger(logger)
 
 # Singleton do modelo YOLO (carregado na startup)
 _yolo_model_loaded = False
@@ -45,6 +46,11 @@ async def lifespan(app: FastAPI):
     # === STARTUP ===
     global _yolo_model_loaded
     
+    from app.services.audio_service import shutdown_acoustic_pool
+    from app.workers import get_audio_scheduler, drain_report_writes
+    
+    settings = get_settings()
+    
     logger.info("=" * 60)
     logger.info(f"Iniciando {settings.APP_NAME} v{settings.APP_VERSION}")
     logger.info(f"Ambiente: {settings.APP_ENV}")
@@ -53,7 +59,7 @@ async def lifespan(app: FastAPI):
     # Carrega modelo YOLO na startup para evitar cold start
     try:
         logger.info("Carregando modelo YOLOv8...")
-        yolo_service = get_yolo_service()
+        yolo_service = services.get_yolo_service()
         model_info = yolo_service.get_model_info()
         _yolo_model_loaded = True
         logger.info(f"Modelo YOLOv8 carregado: {model_info['model_type']}")
@@ -70,79 +76,69 @@ async def lifespan(app: FastAPI):
     
     # === SHUTDOWN ===
     logger.info("Encerrando aplicação...")
+    await get_audio_scheduler().stop()
+    await drain_report_writes()
+    await close_redis()
+    shutdown_acoustic_pool()
     logger.info("Recursos liberados com sucesso")
 
 
-# Inicializa FastAPI
-app = FastAPI(
-    title="MedVision AI — Análise Multimodal Ginecológica",
-    description=(
-        "Sistema de análise multimodal para procedimentos cirúrgicos ginecológicos "
-        "com detecção de anomalias em tempo real, geração de relatórios automáticos "
-        "e análise psicológica de áudio."
-    ),
-    version=settings.APP_VERSION,
-    lifespan=lifespan,
-    docs_url="/docs",
-    redoc_url="/redoc",
-    openapi_url="/openapi.json",
-)
-
 # === MIDDLEWARES ===
 
-# CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.cors_origins_list,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-    expose_headers=["*"],
-)
-
 # Compressão Gzip
-app.add_middleware(GZipMiddleware, minimum_size=1000)
+class MediaAwareGZipMiddleware(GZipMiddleware):
+    """
+    GZip que não recomprime downloads de vídeo.
+    
+    Vídeo já é comprimido; gzip só gastaria CPU e quebraria o
+    ``Content-Range`` das respostas 206.
+    """
+    
+    UNCOMPRESSED_PATH_PREFIXES = ("/api/v1/video/download/",)
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].startswith(self.UNCOMPRESSED_PATH_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
 
 
 # Middleware de logging de requisições
-@app.middleware("http")
 async def log_requests(request: Request, call_next):
     """
     Middleware para logging de todas as requisições HTTP.
     
     Registra: método, path, status code, duração e IP do cliente.
     """
-    start_time = time.time()
+    start_ns = perf_counter_ns()
     
     # Processa requisição
     response = await call_next(request)
     
-    # Calcula duração
-    duration_ms = (time.time() - start_time) * 1000
-    
-    # Log estruturado
-    request_logger = RequestLogger(logger)
-    request_logger.log_request(
-        method=request.method,
-        path=request.url.path,
-        status_code=response.status_code,
-        duration_ms=duration_ms,
-        client_ip=request.client.host if request.client else "unknown"
-    )
+    # Calcula duração (relógio monotônico: imune a ajustes do relógio do sistema)
+    duration_ms = (perf_counter_ns() - start_ns) / 1_000_000
+    
+    # Log estruturado (campos só são montados se o nível não descartar o log)
+    if request_logger.is_enabled_for(response.status_code):
+        request_logger.log_request(
+            method=request.method,
+            path=request.url.path,
+            status_code=response.status_code,
+            duration_ms=duration_ms,
+            client_ip=request.client.host if request.client else "unknown"
+        )
     
     # Adiciona headers de segurança
-    for header_name, header_value in SecurityHeaders.get_headers().items():
-        response.headers[header_name] = header_value
+    response.headers.update(SECURITY_HEADERS)
     
     return response
 
 
 # === EXCEPTION HANDLERS ===
 
-@app.exception_handler(StarletteHTTPException)
 async def http_exception_handler(request: Request, exc: StarletteHTTPException):
     """Handler para exceções HTTP padrão."""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "error": exc.detail,
@@ -152,10 +148,9 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException):
     )
 
 
-@app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """Handler para erros de validação Pydantic."""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content={
             "error": "Erro de validação",
@@ -165,15 +160,15 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     )
 
 
-@app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Handler global para exceções não tratadas."""
+    settings = get_settings()
     logger.error(
         f"Exceção não tratada em {request.method} {request.url.path}: {exc}",
         exc_info=True
     )
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "error": "Erro interno do servidor",
@@ -183,19 +178,13 @@ async def global_exception_handler(request: Request, exc: Exception):
     )
 
 
-# === ROUTERS ===
+# === ENDPOINTS ROOT ===
 
-# Registra routers de API
-app.include_router(video.router)
-app.include_router(audio.router)
-app.include_router(reports.router)
-app.include_router(websocket.router)
+root_router = APIRouter()
 
 
-# === ENDPOINTS ROOT ===
-
-@app.get("/", tags=["root"])
-async def root():
+@root_router.get("/", tags=["root"])
+async def root(settings: SettingsDep):
     """Endpoint raiz com informações da API."""
     return {
         "name": settings.APP_NAME,
@@ -212,15 +201,13 @@ async def root():
     }
 
 
-@app.get("/health", tags=["health"])
-async def health_check():
+@root_router.get("/health", tags=["health"])
+async def health_check(settings: SettingsDep):
     """
     Health check endpoint para monitoramento.
     
     Retorna status da aplicação e serviços críticos.
     """
-    from app.services import get_yolo_service
-    
     health_status = {
         "status": "ok",
         "version": settings.APP_VERSION,
@@ -241,23 +228,21 @@ async def health_check():
         else status.HTTP_503_SERVICE_UNAVAILABLE
     )
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status_code,
         content=health_status
     )
 
 
-@app.get("/model-info", tags=["info"])
-async def get_model_info():
+@root_router.get("/model-info", tags=["info"])
+async def get_model_info(settings: SettingsDep):
     """
     Retorna informações sobre os modelos de IA carregados.
     
     Útil para debugging e verificação de configuração.
     """
     try:
-        from app.services import get_yolo_service
-        
-        yolo_service = get_yolo_service()
+        yolo_service = services.get_yolo_service()
         yolo_info = yolo_service.get_model_info()
         
         return {
@@ -269,20 +254,77 @@ async def get_model_info():
         }
     except Exception as e:
         logger.error(f"Erro ao obter informações do modelo: {e}")
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             content={"error": str(e)}
         )
 
 
-if __name__ == "__main__":
-    # Permite rodar com `python -m app.main` para desenvolvimento local
-    import uvicorn
+def create_app() -> FastAPI:
+    """
+    Cria e configura a aplicação FastAPI.
     
-    uvicorn.run(
-        "app.main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=settings.is_development,
-        log_level=settings.LOG_LEVEL.lower()
+    Os routers (e o grafo de serviços que eles importam) só são carregados
+    aqui, depois do logging configurado.
+    
+    Returns:
+        Aplicação pronta para o uvicorn.
+    """
+    setup_logging()
+    settings = get_settings()
+    
+    from app.api.routes import video, audio, reports, websocket
+    
+    app = FastAPI(
+        title="MedVision AI — Análise Multimodal Ginecológica",
+        description=(
+            "Sistema de análise multimodal para procedimentos cirúrgicos ginecológicos "
+            "com detecção de anomalias em tempo real, geração de relatórios automáticos "
+            "e análise psicológica de áudio."
+        ),
+        version=settings.APP_VERSION,
+        lifespan=lifespan,
+        default_response_class=ORJSONResponse,
+        docs_url="/docs",
+        redoc_url="/redoc",
+        openapi_url="/openapi.json",
     )
+    
+    # === MIDDLEWARES ===
+    
+    # CORS
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=list(settings.cors_origins_list),
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=["*"],
+    )
+    
+    # Compressão Gzip: nível 1 é ~3x mais rápido que o padrão (9) e perde
+    # pouca taxa em JSON; respostas pequenas não compensam o custo
+    app.add_middleware(MediaAwareGZipMiddleware, minimum_size=4096, compresslevel=1)
+    
+    app.middleware("http")(log_requests)
+    
+    # === EXCEPTION HANDLERS ===
+    
+    app.add_exception_handler(StarletteHTTPException, http_exception_handler)
+    app.add_exception_handler(RequestValidationError, validation_exception_handler)
+    app.add_exception_handler(Exception, global_exception_handler)
+    
+    # === ROUTERS ===
+    
+    # Registra routers de API
+    app.include_router(video.router)
+    app.include_router(audio.router)
+    app.include_router(reports.router)
+    app.include_router(websocket.router)
+    app.include_router(root_router)
+    
+    return app
+
+
+app = create_app()
+
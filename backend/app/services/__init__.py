@@ -1,12 +1,43 @@
-"""Módulo de serviços da aplicação."""
+"""
+Módulo de serviços da aplicação.
 
-from .yolo_service import YOLOService, get_yolo_service
-from .gemini_service import GeminiService, get_gemini_service
-from .video_service import VideoService, get_video_service
-from .audio_service import AudioService, get_audio_service
-from .anomaly_service import AnomalyService, get_anomaly_service
-from .report_service import ReportService, get_report_service
-from .storage_service import StorageService, get_storage_service
+Os submódulos são importados sob demanda (PEP 562): ``from app.services
+import get_report_service`` não carrega ultralytics/torch nem o SDK do
+Gemini, que só entram no primeiro acesso aos serviços que os usam.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .yolo_service import YOLOService, get_yolo_service
+    from .gemini_service import GeminiService, get_gemini_service
+    from .video_service import VideoService, get_video_service
+    from .audio_service import AudioService, get_audio_service
+    from .anomaly_service import AnomalyService, get_anomaly_service
+    from .report_service import ReportService, get_report_service
+    from .storage_service import StorageService, get_storage_service
+    from .analysis_store import AnalysisStore, get_analysis_store
+
+# Nome exportado -> submódulo que o define
+_LAZY_EXPORTS = {
+    "YOLOService": "yolo_service",
+    "get_yolo_service": "yolo_service",
+    "GeminiService": "gemini_service",
+    "get_gemini_service": "gemini_service",
+    "VideoService": "video_service",
+    "get_video_service": "video_service",
+    "AudioService": "audio_service",
+    "get_audio_service": "audio_service",
+    "AnomalyService": "anomaly_service",
+    "get_anomaly_service": "anomaly_service",
+    "ReportService": "report_service",
+    "get_report_service": "report_service",
+    "StorageService": "storage_service",
+    "get_storage_service": "storage_service",
+    "AnalysisStore": "analysis_store",
+    "get_analysis_store": "analysis_store",
+}
 
 __all__ = [
     "YOLOService",
@@ -23,4 +54,22 @@ __all__ = [
     "get_report_service",
     "StorageService",
     "get_storage_service",
+    "AnalysisStore",
+    "get_analysis_store",
 ]
+
+
+def __getattr__(name: str):
+    """Importa o submódulo do nome pedido no primeiro acesso."""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module_name}", __name__), name)
+    # Próximos acessos não passam mais por __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """Inclui os nomes ainda não carregados (autocompletar/inspeção)."""
+    return sorted(list(globals()) + __all__)
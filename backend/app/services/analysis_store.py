@@ -0,0 +1,438 @@
+"""
+Armazenamento do estado das análises (status e resultados).
+
+Suporta dois backends:
+- local: caches limitados em memória do processo (desenvolvimento / worker único)
+- redis: hashes/strings no Redis, compartilhados entre workers uvicorn e arq
+"""
+
+import asyncio
+from types import MappingProxyType
+from typing import AsyncIterator, Dict, Mapping, Optional, Type
+
+from cachetools import TTLCache
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.core.logging_config import get_logger
+from app.core.redis_client import get_redis
+from app.models.enums import AnalysisStatusEnum
+from app.models.schemas import AudioAnalysisResult, VideoAnalysisResult
+
+logger = get_logger(__name__)
+
+# Status finais (não mudam mais)
+TERMINAL_STATUSES = frozenset({AnalysisStatusEnum.COMPLETED, AnalysisStatusEnum.FAILED})
+
+
+class AnalysisStore:
+    """
+    Store de status/resultados de análises com backend configurável.
+
+    No Redis o status fica em ``HSET {namespace}:status:{id}``, o resultado
+    serializado em ``SET {namespace}:result:{id}``, o índice de conteúdo em
+    ``SET {namespace}:hash:{sha256}`` e o caminho do arquivo original em
+    ``SET {namespace}:source:{id}``, todos com TTL.
+
+    No backend local status e resultados ficam em ``TTLCache`` (um por tipo,
+    com o tamanho máximo configurado; expiram junto com o TTL do Redis);
+    resultados descartados continuam disponíveis pelo relatório em disco.
+    Todo acesso acontece no event loop, então não há locks; escritas trocam
+    a referência por um snapshot imutável.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        result_model: Type[BaseModel],
+        backend: Optional[str] = None,
+        result_cache_size: Optional[int] = None
+    ):
+        """
+        Inicializa o store.
+
+        Args:
+            namespace: Prefixo das chaves ("audio", "video").
+            result_model: Schema Pydantic do resultado final.
+            backend: Backend a usar ("local", "redis"). Usa config se None.
+            result_cache_size: Máximo de resultados em memória (backend
+                local). Usa ``ANALYSIS_RESULT_CACHE_SIZE`` se None.
+        """
+        self.namespace = namespace
+        self.result_model = result_model
+        self.backend = backend or ("redis" if settings.REDIS_ENABLED else "local")
+        self.ttl_seconds = settings.ANALYSIS_STATE_TTL_SECONDS
+
+        if self.backend == "local":
+            self._status_cache = TTLCache(
+                maxsize=settings.ANALYSIS_STATUS_CACHE_SIZE, ttl=self.ttl_seconds
+            )
+            self._result_cache = TTLCache(
+                maxsize=result_cache_size or settings.ANALYSIS_RESULT_CACHE_SIZE,
+                ttl=self.ttl_seconds
+            )
+            self._status_events: Dict[str, asyncio.Event] = {}
+            self._status_watchers: Dict[str, int] = {}
+            self._content_index = TTLCache(
+                maxsize=settings.ANALYSIS_STATUS_CACHE_SIZE, ttl=self.ttl_seconds
+            )
+            self._source_paths = TTLCache(
+                maxsize=settings.ANALYSIS_STATUS_CACHE_SIZE, ttl=self.ttl_seconds
+            )
+        elif self.backend != "redis":
+            raise ValueError(f"Backend de estado inválido: {self.backend}")
+
+        logger.info(f"AnalysisStore inicializado ({self.backend}): {namespace}")
+
+    def _status_key(self, analysis_id: str) -> str:
+        return f"{self.namespace}:status:{analysis_id}"
+
+    def _result_key(self, analysis_id: str) -> str:
+        return f"{self.namespace}:result:{analysis_id}"
+
+    def _status_channel(self, analysis_id: str) -> str:
+        return f"{self.namespace}:status-events:{analysis_id}"
+
+    def _content_key(self, content_hash: str) -> str:
+        return f"{self.namespace}:hash:{content_hash}"
+
+    def _source_key(self, analysis_id: str) -> str:
+        return f"{self.namespace}:source:{analysis_id}"
+
+    async def set_status(
+        self,
+        analysis_id: str,
+        status: AnalysisStatusEnum,
+        progress_percent: float,
+        current_stage: str,
+        error_message: Optional[str] = None
+    ) -> None:
+        """
+        Grava o status atual de uma análise (substitui o snapshot anterior).
+
+        Args:
+            analysis_id: ID da análise.
+            status: Status da análise.
+            progress_percent: Progresso (0-100).
+            current_stage: Descrição da etapa atual.
+            error_message: Mensagem de erro, se houver.
+        """
+        if self.backend == "local":
+            snapshot = MappingProxyType({
+                "status": status,
+                "progress_percent": progress_percent,
+                "current_stage": current_stage,
+                "error_message": error_message
+            })
+            self._status_cache[analysis_id] = snapshot
+
+            # Acorda quem acompanha a análise (SSE)
+            event = self._status_events.pop(analysis_id, None)
+            if event is not None:
+                event.set()
+            return
+
+        redis = await get_redis()
+        key = self._status_key(analysis_id)
+        await redis.hset(key, mapping={
+            "status": status.value,
+            "progress_percent": str(progress_percent),
+            "current_stage": current_stage,
+            "error_message": error_message or ""
+        })
+        await redis.expire(key, self.ttl_seconds)
+        await redis.publish(self._status_channel(analysis_id), status.value)
+
+    async def update_progress(
+        self,
+        analysis_id: str,
+        progress_percent: float,
+        current_stage: str
+    ) -> None:
+        """
+        Atualiza apenas progresso e etapa, mantendo status e erro.
+
+        No Redis é um único round-trip (``HSET`` de dois campos em pipeline).
+
+        Args:
+            analysis_id: ID da análise.
+            progress_percent: Progresso (0-100).
+            current_stage: Descrição da etapa atual.
+        """
+        if self.backend == "local":
+            current = self._status_cache.get(analysis_id)
+            if current is None:
+                return
+            self._status_cache[analysis_id] = MappingProxyType({
+                **current,
+                "progress_percent": progress_percent,
+                "current_stage": current_stage
+            })
+
+            event = self._status_events.pop(analysis_id, None)
+            if event is not None:
+                event.set()
+            return
+
+        redis = await get_redis()
+        key = self._status_key(analysis_id)
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.hset(key, mapping={
+                "progress_percent": str(progress_percent),
+                "current_stage": current_stage
+            })
+            pipe.expire(key, self.ttl_seconds)
+            pipe.publish(self._status_channel(analysis_id), "progress")
+            await pipe.execute()
+
+    async def get_status(self, analysis_id: str) -> Optional[Mapping]:
+        """
+        Obtém o status de uma análise.
+
+        Returns:
+            Mapeamento com status, progress_percent, current_stage e
+            error_message, ou None se a análise não existir.
+        """
+        if self.backend == "local":
+            return self._status_cache.get(analysis_id)
+
+        redis = await get_redis()
+        raw = await redis.hgetall(self._status_key(analysis_id))
+        raw = {k.decode(): v.decode() for k, v in raw.items()}
+        if "status" not in raw:
+            # Inexistente (ou só progresso gravado após remoção)
+            return None
+
+        return {
+            "status": AnalysisStatusEnum(raw["status"]),
+            "progress_percent": float(raw["progress_percent"]),
+            "current_stage": raw["current_stage"],
+            "error_message": raw["error_message"] or None
+        }
+
+    async def watch_status(
+        self,
+        analysis_id: str,
+        keepalive_seconds: float
+    ) -> AsyncIterator[Optional[Mapping]]:
+        """
+        Acompanha o status de uma análise, emitindo a cada mudança.
+
+        Emite o status atual imediatamente e depois a cada ``set_status``.
+        Emite None quando passam ``keepalive_seconds`` sem mudanças. Termina
+        quando a análise conclui, falha ou deixa de existir.
+
+        Args:
+            analysis_id: ID da análise.
+            keepalive_seconds: Intervalo máximo sem emitir nada.
+
+        Yields:
+            Mapeamento do status (como ``get_status``) ou None (keepalive).
+        """
+        if self.backend == "local":
+            self._status_watchers[analysis_id] = self._status_watchers.get(analysis_id, 0) + 1
+            try:
+                while True:
+                    # Registra o evento antes de ler, para não perder escrita intermediária
+                    event = self._status_events.setdefault(analysis_id, asyncio.Event())
+                    status_data = await self.get_status(analysis_id)
+                    if status_data is None:
+                        return
+                    yield status_data
+                    if status_data["status"] in TERMINAL_STATUSES:
+                        return
+
+                    while True:
+                        try:
+                            await asyncio.wait_for(event.wait(), timeout=keepalive_seconds)
+                            break
+                        except asyncio.TimeoutError:
+                            yield None
+            finally:
+                # O último watcher remove o evento (cliente SSE desconectado)
+                remaining = self._status_watchers.pop(analysis_id) - 1
+                if remaining:
+                    self._status_watchers[analysis_id] = remaining
+                else:
+                    self._status_events.pop(analysis_id, None)
+
+        redis = await get_redis()
+        pubsub = redis.pubsub()
+        await pubsub.subscribe(self._status_channel(analysis_id))
+        try:
+            while True:
+                status_data = await self.get_status(analysis_id)
+                if status_data is None:
+                    return
+                yield status_data
+                if status_data["status"] in TERMINAL_STATUSES:
+                    return
+
+                while await pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=keepalive_seconds
+                ) is None:
+                    yield None
+        finally:
+            await pubsub.unsubscribe()
+            await pubsub.close()
+
+    async def set_result(self, analysis_id: str, result: BaseModel) -> None:
+        """Grava o resultado final de uma análise."""
+        if self.backend == "local":
+            self._result_cache[analysis_id] = result
+            return
+
+        redis = await get_redis()
+        await redis.set(
+            self._result_key(analysis_id),
+            result.model_dump_json(),
+            ex=self.ttl_seconds
+        )
+
+    async def get_result(self, analysis_id: str) -> Optional[BaseModel]:
+        """
+        Obtém o resultado final de uma análise.
+
+        Returns:
+            Instância de ``result_model`` ou None se não houver resultado.
+        """
+        if self.backend == "local":
+            return self._result_cache.get(analysis_id)
+
+        redis = await get_redis()
+        raw = await redis.get(self._result_key(analysis_id))
+        if raw is None:
+            return None
+        return self.result_model.model_validate_json(raw)
+
+    async def get_result_json(self, analysis_id: str) -> Optional[bytes]:
+        """
+        Obtém o resultado final já serializado em JSON.
+
+        No Redis devolve o valor armazenado sem re-validar com Pydantic; no
+        backend local serializa em uma thread, fora do event loop.
+
+        Returns:
+            JSON do resultado ou None se não houver resultado.
+        """
+        if self.backend == "local":
+            result = await self.get_result(analysis_id)
+            if result is None:
+                return None
+            result_json = await asyncio.to_thread(result.model_dump_json)
+            return result_json.encode("utf-8")
+
+        redis = await get_redis()
+        return await redis.get(self._result_key(analysis_id))
+
+    async def remember_content(self, content_hash: str, analysis_id: str) -> None:
+        """
+        Associa o hash do conteúdo enviado à análise que o processa.
+
+        Args:
+            content_hash: Hash hexadecimal do upload (e parâmetros da análise).
+            analysis_id: ID da análise.
+        """
+        if self.backend == "local":
+            self._content_index[content_hash] = analysis_id
+            return
+
+        redis = await get_redis()
+        await redis.set(self._content_key(content_hash), analysis_id, ex=self.ttl_seconds)
+
+    async def find_by_content(self, content_hash: str) -> Optional[str]:
+        """
+        Busca a análise associada a um hash de conteúdo.
+
+        Returns:
+            ID da análise ou None se o conteúdo não foi visto.
+        """
+        if self.backend == "local":
+            return self._content_index.get(content_hash)
+
+        redis = await get_redis()
+        raw = await redis.get(self._content_key(content_hash))
+        return raw.decode() if raw is not None else None
+
+    async def set_source_path(self, analysis_id: str, path: str) -> None:
+        """
+        Registra o caminho do arquivo enviado (original) de uma análise.
+
+        Args:
+            analysis_id: ID da análise.
+            path: Caminho do arquivo em disco.
+        """
+        if self.backend == "local":
+            self._source_paths[analysis_id] = path
+            return
+
+        redis = await get_redis()
+        await redis.set(self._source_key(analysis_id), path, ex=self.ttl_seconds)
+
+    async def get_source_path(self, analysis_id: str) -> Optional[str]:
+        """
+        Obtém o caminho do arquivo original de uma análise.
+
+        Returns:
+            Caminho registrado ou None.
+        """
+        if self.backend == "local":
+            return self._source_paths.get(analysis_id)
+
+        redis = await get_redis()
+        raw = await redis.get(self._source_key(analysis_id))
+        return raw.decode() if raw is not None else None
+
+    async def delete(self, analysis_id: str) -> bool:
+        """
+        Remove status e resultado de uma análise.
+
+        Returns:
+            True se algo foi removido.
+        """
+        if self.backend == "local":
+            removed_status = self._status_cache.pop(analysis_id, None)
+            removed_result = self._result_cache.pop(analysis_id, None)
+            self._source_paths.pop(analysis_id, None)
+            return removed_status is not None or removed_result is not None
+
+        redis = await get_redis()
+        removed = await redis.delete(
+            self._status_key(analysis_id),
+            self._result_key(analysis_id),
+            self._source_key(analysis_id)
+        )
+        return removed > 0
+
+
+# Instâncias singleton por namespace
+_RESULT_MODELS: Dict[str, Type[BaseModel]] = {
+    "audio": AudioAnalysisResult,
+    "video": VideoAnalysisResult,
+}
+# Resultados de vídeo (todos os frames) são bem maiores que os de áudio
+_RESULT_CACHE_SIZES: Dict[str, int] = {
+    "video": settings.VIDEO_RESULT_CACHE_SIZE,
+}
+_store_instances: Dict[str, AnalysisStore] = {}
+
+
+def get_analysis_store(namespace: str) -> AnalysisStore:
+    """
+    Retorna o store singleton de um namespace.
+
+    Args:
+        namespace: "audio" ou "video".
+
+    Returns:
+        Instância AnalysisStore.
+    """
+    store = _store_instances.get(namespace)
+    if store is None:
+        store = AnalysisStore(
+            namespace,
+            _RESULT_MODELS[namespace],
+            result_cache_size=_RESULT_CACHE_SIZES.get(namespace)
+        )
+        _store_instances[namespace] = store
+    return store
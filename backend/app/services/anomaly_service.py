@@ -7,13 +7,16 @@ Implementa lógicas avançadas de análise de anomalias, incluindo:
 - Geração de alertas em tempo real
 """
 
-from typing import Optional
+import threading
+from functools import lru_cache
+from operator import attrgetter
+from typing import ClassVar, Optional
 
 import cv2
 import numpy as np
+from cachetools import LRUCache
 
 from app.core.logging_config import get_logger
-from app.core.security import generate_secure_token
 from app.models.enums import AnomalyType, SeverityLevel
 from app.models.schemas import (
     BoundingBox,
@@ -23,6 +26,143 @@ from app.models.schemas import (
 
 logger = get_logger(__name__)
 
+# Máximo de keypoints contados por ROI
+MAX_KEYPOINTS = 50
+
+# Limiar de intensidade do detector FAST (o mesmo do estágio FAST do ORB)
+FAST_THRESHOLD = 20
+
+# Pixel "vermelho intenso": canal R acima do limiar (qualquer B e G)
+RED_INTENSITY_THRESHOLD = 150
+_RED_LOWER_BOUND = np.array([0, 0, RED_INTENSITY_THRESHOLD + 1], dtype=np.uint8)
+_RED_UPPER_BOUND = np.array([255, 255, 255], dtype=np.uint8)
+
+# Fração mínima de pixels vermelhos intensos para sinalizar a ROI
+RED_PIXEL_RATIO = 0.5
+
+# Formatos de ROI (altura, largura) com máscara pré-alocada
+ROI_SHAPE_CACHE_SIZE = 32
+
+# Chave de ordenação por confiança (sem lambda por chamada)
+_by_confidence = attrgetter("confidence")
+
+# Lado mínimo da ROI para a densidade de features (patch do ORB, mantido
+# para que a métrica continue comparável)
+MIN_FEATURE_ROI_SIZE = 31
+
+
+def _cuda_available() -> bool:
+    """Verifica se o OpenCV foi compilado com CUDA e há GPU disponível."""
+    try:
+        return cv2.cuda.getCudaEnabledDeviceCount() > 0
+    except (AttributeError, cv2.error):
+        return False
+
+
+# Código inteiro de cada severidade, em ordem crescente de gravidade
+_SEVERITY_CODES: dict[SeverityLevel, int] = {
+    level: code
+    for code, level in enumerate((
+        SeverityLevel.LOW, SeverityLevel.MEDIUM, SeverityLevel.HIGH, SeverityLevel.CRITICAL
+    ))
+}
+
+
+class _ThreadScratch(threading.local):
+    """
+    Estado mutável do OpenCV de uma thread, reaproveitado entre chamadas.
+    
+    O AnomalyService é um singleton por processo; análises simultâneas em
+    threads diferentes não podem compartilhar buffers, detectores, stream
+    CUDA nem o LRUCache (que não é thread-safe).
+    """
+    
+    def __init__(self):
+        # Só a contagem de keypoints é usada: FAST dispensa orientação e
+        # descritores BRIEF que o ORB calcularia
+        self.detector = cv2.FastFeatureDetector_create(
+            threshold=FAST_THRESHOLD, nonmaxSuppression=True
+        )
+        self.detector_gpu = None
+        self.stream = None
+        self.gpu_roi = None
+        self.gpu_frame = None
+        self.gpu_gray = None
+        # (altura, largura) -> máscara uint8 reaproveitada; detectores com
+        # anchors fixos repetem poucos formatos de ROI
+        self.red_masks: LRUCache = LRUCache(maxsize=ROI_SHAPE_CACHE_SIZE)
+        # Buffer de saída do cvtColor (frame inteiro ou ROI), cresce sob demanda
+        self.gray = np.empty((0, 0), dtype=np.uint8)
+
+
+def _validate_frame(frame: np.ndarray) -> np.ndarray:
+    """
+    Valida o frame uma vez, antes de processar as ROIs.
+    
+    Linhas podem ter qualquer passo (recortes de outro array), mas os
+    pixels de cada linha precisam estar contíguos para o OpenCV.
+    
+    Args:
+        frame: Frame completo em BGR.
+    
+    Returns:
+        O próprio frame, ou uma cópia contígua se o layout exigir.
+    
+    Raises:
+        ValueError: Se o frame não for uma imagem BGR uint8.
+    """
+    if frame.dtype != np.uint8 or frame.ndim != 3 or frame.shape[2] != 3:
+        raise ValueError(
+            f"Frame inválido: esperado BGR uint8, recebido {frame.dtype} {frame.shape}"
+        )
+    if frame.strides[1:] != (3, 1):
+        frame = np.ascontiguousarray(frame)
+    return frame
+
+
+def _spread_bits(value: int) -> int:
+    """Intercala zeros entre os 16 bits menos significativos de ``value``."""
+    value &= 0xFFFF
+    value = (value | (value << 8)) & 0x00FF00FF
+    value = (value | (value << 4)) & 0x0F0F0F0F
+    value = (value | (value << 2)) & 0x33333333
+    value = (value | (value << 1)) & 0x55555555
+    return value
+
+
+def _morton_key(box: BoundingBox) -> int:
+    """
+    Chave Z-order (Morton) do canto superior esquerdo da caixa.
+    
+    Coordenadas em blocos de 16 px; caixas próximas no frame ficam
+    próximas na ordenação.
+    """
+    x = _spread_bits(max(0, int(box.x1)) >> 4)
+    y = _spread_bits(max(0, int(box.y1)) >> 4)
+    return x | (y << 1)
+
+
+def _trend_slopes(counts: np.ndarray, window: int) -> np.ndarray:
+    """
+    Inclinação da regressão linear de cada janela deslizante de ``counts``.
+    
+    Forma fechada do np.polyfit grau 1: slope = Σ(x - x̄)(y - ȳ) / Σ(x - x̄)².
+    Como Σ(x - x̄) = 0, o termo ȳ se anula e cada inclinação é um produto
+    escalar; todas as janelas saem de um único produto matriz-vetor.
+    
+    Args:
+        counts: Contagem por frame (1-D).
+        window: Tamanho da janela (``len(counts) >= window``).
+    
+    Returns:
+        Array com ``len(counts) - window + 1`` inclinações.
+    """
+    x_centered = np.arange(window) - (window - 1) / 2
+    x_var = float(np.dot(x_centered, x_centered))
+    # Cada linha é uma janela (view sem cópia sobre ``counts``)
+    windows = np.lib.stride_tricks.sliding_window_view(counts, window)
+    return windows @ x_centered / x_var
+
 
 class AnomalyService:
     """
@@ -30,10 +170,43 @@ class AnomalyService:
     
     Métodos:
     - enrich_anomaly: Adiciona métricas ROI à detecção
+    - enrich_anomalies: Idem, para todas as detecções de um frame
     - compute_temporal_anomaly: Detecta padrões temporais suspeitos
     - generate_alert: Cria alertas para anomalias críticas
     """
     
+    # Nomes em português usados nas descrições de alertas
+    _ANOMALY_NAMES: ClassVar[dict[AnomalyType, str]] = {
+        AnomalyType.SURGICAL_BLEEDING: "Sangramento cirúrgico",
+        AnomalyType.INSTRUMENT_DETECTED: "Instrumento cirúrgico",
+        AnomalyType.ABNORMAL_MOVEMENT: "Movimento anormal",
+    }
+    
+    # Severidades de origem de uma mudança abrupta para crítico (códigos)
+    _NON_CRITICAL_CODES: ClassVar[np.ndarray] = np.array(
+        [_SEVERITY_CODES[SeverityLevel.LOW], _SEVERITY_CODES[SeverityLevel.MEDIUM]],
+        dtype=np.int8
+    )
+    
+    # Severidades que geram alerta em tempo real
+    _ALERT_SEVERITIES: ClassVar[frozenset[SeverityLevel]] = frozenset({
+        SeverityLevel.HIGH, SeverityLevel.CRITICAL
+    })
+    
+    def __init__(self):
+        """
+        Inicializa o serviço com um detector FAST reutilizado entre chamadas.
+        
+        Com GPU CUDA disponível, o FAST roda na GPU (detector, stream e
+        buffers no device criados no primeiro uso); caso contrário, na CPU.
+        Detectores e buffers são por thread (``_ThreadScratch``).
+        """
+        self._use_cuda = _cuda_available()
+        self._scratch = _ThreadScratch()
+        
+        if self._use_cuda:
+            logger.info("CUDA disponível: FAST do AnomalyService rodará na GPU")
+    
     def enrich_anomaly(self, box: BoundingBox, frame: np.ndarray) -> BoundingBox:
         """
         Enriquece uma detecção com métricas adicionais da ROI.
@@ -50,6 +223,67 @@ class AnomalyService:
         Returns:
             BoundingBox com métricas adicionais (não alterada por enquanto,
             mas pode ser expandida com campos extras).
+        
+        Raises:
+            ValueError: Se o frame não for uma imagem BGR uint8.
+        """
+        return self._enrich_roi(box, _validate_frame(frame), gray_frame=None)
+    
+    def enrich_anomalies(
+        self,
+        boxes: list[BoundingBox],
+        frame: np.ndarray
+    ) -> list[BoundingBox]:
+        """
+        Enriquece todas as detecções de um frame.
+        
+        O frame é convertido para tons de cinza uma única vez e cada ROI é
+        apenas um recorte dessa imagem. Com CUDA, o frame é enviado à GPU
+        uma vez e conversão, recortes e FAST ficam no device.
+        
+        As ROIs são processadas em ordem Z (Morton), e não na ordem de
+        detecção, para que regiões vizinhas do frame sejam lidas em
+        sequência e reaproveitem o cache.
+        
+        Args:
+            boxes: Bounding boxes das detecções do frame.
+            frame: Frame completo em BGR.
+        
+        Returns:
+            Bounding boxes enriquecidas, na mesma ordem.
+        
+        Raises:
+            ValueError: Se o frame não for uma imagem BGR uint8.
+        """
+        if not boxes:
+            return []
+        
+        frame = _validate_frame(frame)
+        gray_frame = self._gray_frame(frame)
+        order = sorted(range(len(boxes)), key=lambda i: _morton_key(boxes[i]))
+        
+        enriched: list[Optional[BoundingBox]] = [None] * len(boxes)
+        for i in order:
+            enriched[i] = self._enrich_roi(boxes[i], frame, gray_frame)
+        return enriched
+    
+    def _enrich_roi(
+        self,
+        box: BoundingBox,
+        frame: np.ndarray,
+        gray_frame: Optional["np.ndarray | cv2.cuda.GpuMat"]
+    ) -> BoundingBox:
+        """
+        Calcula as métricas de uma ROI.
+        
+        Args:
+            box: Bounding box da detecção.
+            frame: Frame completo em BGR.
+            gray_frame: Frame já convertido para cinza (no host ou na GPU),
+                ou None para converter apenas a ROI.
+        
+        Returns:
+            A própria bounding box.
         """
         # Extrai ROI
         x1, y1, x2, y2 = int(box.x1), int(box.y1), int(box.x2), int(box.y2)
@@ -67,31 +301,153 @@ class AnomalyService:
         
         # Métrica 1: Intensidade de vermelho (BGR, então canal 2)
         if box.anomaly_type == AnomalyType.SURGICAL_BLEEDING:
-            red_channel = roi[:, :, 2]
-            red_intensity = np.mean(red_channel)
+            # Máscara uint8 dos pixels com vermelho acima do limiar, em uma
+            # passada SIMD sobre o buffer BGR (sem média em float64). Derivar
+            # cinza e vermelho de um cv2.split da ROI seria mais lento: o
+            # split grava três planos e a soma ponderada relê todos eles,
+            # enquanto inRange + cvtColor leem a ROI uma vez cada.
+            red_mask = self._red_mask(roi.shape[:2])
+            cv2.inRange(roi, _RED_LOWER_BOUND, _RED_UPPER_BOUND, dst=red_mask)
+            red_ratio = cv2.countNonZero(red_mask) / red_mask.size
             
             # Ajusta confiança baseado na intensidade de vermelho
             # Valores altos de vermelho aumentam confiança de sangramento
-            if red_intensity > 150:
+            if red_ratio > RED_PIXEL_RATIO:
                 logger.debug(
-                    f"Alta intensidade vermelha detectada: {red_intensity:.1f} "
+                    f"Alta intensidade vermelha detectada: {red_ratio:.0%} dos pixels "
                     f"(confiança original: {box.confidence:.2f})"
                 )
         
+        # ROI pequena demais para a densidade de features: evita a detecção
+        # (e a conversão para cinza)
+        if min(y2 - y1, x2 - x1) < MIN_FEATURE_ROI_SIZE:
+            return box
+        
         # Métrica 2: Densidade de features (usando SIFT simplificado)
-        try:
-            gray_roi = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
-            # Usa ORB como alternativa ao SIFT (não requer licença)
-            orb = cv2.ORB_create(nfeatures=50)
-            keypoints, _ = orb.detectAndCompute(gray_roi, None)
-            feature_density = len(keypoints) / (roi.shape[0] * roi.shape[1])
-            
-            logger.debug(f"Densidade de features na ROI: {feature_density:.6f}")
-        except Exception as e:
-            logger.warning(f"Erro ao calcular features na ROI: {e}")
+        # Sem try/except: o frame já foi validado e erros do OpenCV propagam
+        if gray_frame is None:
+            gray_roi = cv2.cvtColor(
+                roi, cv2.COLOR_BGR2GRAY, dst=self._gray_view(*roi.shape[:2])
+            )
+        elif isinstance(gray_frame, np.ndarray):
+            gray_roi = gray_frame[y1:y2, x1:x2]
+        else:
+            # Recorte no device: cabeçalho novo sobre a mesma memória
+            gray_roi = cv2.cuda_GpuMat(gray_frame, (x1, y1, x2 - x1, y2 - y1))
+        # Usa FAST como alternativa ao SIFT (não requer licença)
+        n_keypoints = self._count_keypoints(gray_roi)
+        feature_density = n_keypoints / (roi.shape[0] * roi.shape[1])
+        
+        logger.debug(f"Densidade de features na ROI: {feature_density:.6f}")
         
         return box
     
+    def _red_mask(self, shape: tuple[int, int]) -> np.ndarray:
+        """
+        Retorna a máscara uint8 pré-alocada para ROIs de um formato.
+        
+        Args:
+            shape: (altura, largura) da ROI.
+        
+        Returns:
+            Array uint8 reaproveitado entre ROIs do mesmo formato.
+        """
+        red_masks = self._scratch.red_masks
+        mask = red_masks.get(shape)
+        if mask is None:
+            mask = np.empty(shape, dtype=np.uint8)
+            red_masks[shape] = mask
+        return mask
+    
+    def _gray_view(self, height: int, width: int) -> np.ndarray:
+        """
+        Retorna uma view ``height x width`` do buffer de tons de cinza.
+        
+        O buffer só é realocado quando uma imagem maior que todas as
+        anteriores aparece; o OpenCV grava na view respeitando o passo.
+        
+        Args:
+            height: Altura da imagem.
+            width: Largura da imagem.
+        
+        Returns:
+            View uint8 sobre o buffer reaproveitado.
+        """
+        scratch = self._scratch
+        scratch_h, scratch_w = scratch.gray.shape
+        if height > scratch_h or width > scratch_w:
+            scratch.gray = np.empty(
+                (max(height, scratch_h), max(width, scratch_w)), dtype=np.uint8
+            )
+        return scratch.gray[:height, :width]
+    
+    def _init_gpu(self) -> None:
+        """Cria detector, stream e buffers da GPU da thread no primeiro uso."""
+        scratch = self._scratch
+        if scratch.detector_gpu is None:
+            scratch.detector_gpu = cv2.cuda.FastFeatureDetector_create(
+                threshold=FAST_THRESHOLD,
+                nonmaxSuppression=True,
+                max_npoints=MAX_KEYPOINTS
+            )
+            scratch.stream = cv2.cuda.Stream()
+            scratch.gpu_roi = cv2.cuda_GpuMat()
+            scratch.gpu_frame = cv2.cuda_GpuMat()
+            scratch.gpu_gray = cv2.cuda_GpuMat()
+    
+    def _gray_frame(self, frame: np.ndarray) -> "np.ndarray | cv2.cuda.GpuMat":
+        """
+        Converte o frame inteiro para tons de cinza.
+        
+        Args:
+            frame: Frame completo em BGR.
+        
+        Returns:
+            Frame em cinza (view sobre o buffer da thread); com CUDA, um
+            GpuMat persistente da thread que permanece no device (um único
+            upload por frame).
+        """
+        if not self._use_cuda:
+            return cv2.cvtColor(
+                frame, cv2.COLOR_BGR2GRAY, dst=self._gray_view(*frame.shape[:2])
+            )
+        
+        self._init_gpu()
+        scratch = self._scratch
+        scratch.gpu_frame.upload(frame, stream=scratch.stream)
+        cv2.cuda.cvtColor(
+            scratch.gpu_frame, cv2.COLOR_BGR2GRAY,
+            dst=scratch.gpu_gray, stream=scratch.stream
+        )
+        return scratch.gpu_gray
+    
+    def _count_keypoints(self, gray_roi: "np.ndarray | cv2.cuda.GpuMat") -> int:
+        """
+        Conta keypoints FAST na ROI (até MAX_KEYPOINTS), na GPU quando disponível.
+        
+        Args:
+            gray_roi: ROI em tons de cinza, no host ou já na GPU.
+        
+        Returns:
+            Número de keypoints detectados.
+        """
+        scratch = self._scratch
+        if not self._use_cuda:
+            return min(len(scratch.detector.detect(gray_roi, None)), MAX_KEYPOINTS)
+        
+        self._init_gpu()
+        if isinstance(gray_roi, np.ndarray):
+            # O GpuMat só é realocado quando o tamanho da ROI muda
+            scratch.gpu_roi.upload(gray_roi, stream=scratch.stream)
+            gray_roi = scratch.gpu_roi
+        
+        gpu_keypoints = scratch.detector_gpu.detectAsync(
+            gray_roi, None, stream=scratch.stream
+        )
+        scratch.stream.waitForCompletion()
+        # Um keypoint por coluna: só o tamanho é lido, sem download
+        return gpu_keypoints.size()[0]
+    
     def compute_temporal_anomaly(
         self,
         frames: list[FrameAnalysis],
@@ -118,62 +474,78 @@ class AnomalyService:
             return temporal_anomalies
         
         # Análise 1: Sangramento progressivo
-        for i in range(len(frames) - window + 1):
-            window_frames = frames[i:i+window]
-            
-            bleeding_counts = [
-                sum(1 for box in f.bounding_boxes 
-                    if box.anomaly_type == AnomalyType.SURGICAL_BLEEDING)
-                for f in window_frames
-            ]
+        if window > 3:
+            # Contado uma vez por frame; janelas sobrepostas reutilizam o array
+            counts = np.fromiter(
+                (
+                    sum(
+                        1 for box in f.bounding_boxes
+                        if box.anomaly_type == AnomalyType.SURGICAL_BLEEDING
+                    )
+                    for f in frames
+                ),
+                dtype=np.int32,
+                count=len(frames)
+            )
+            slopes = _trend_slopes(counts, window)
             
             # Detecta tendência crescente
-            if len(bleeding_counts) > 3:
-                # Regressão linear simples para detectar tendência
-                x = np.arange(len(bleeding_counts))
-                slope = np.polyfit(x, bleeding_counts, 1)[0]
-                
-                if slope > 0.3:  # Aumento significativo
-                    temporal_anomalies.append({
-                        "type": "progressive_bleeding",
-                        "start_frame": window_frames[0].frame_index,
-                        "end_frame": window_frames[-1].frame_index,
-                        "start_time": window_frames[0].timestamp_seconds,
-                        "end_time": window_frames[-1].timestamp_seconds,
-                        "severity": "high",
-                        "description": (
-                            f"Aumento progressivo de sangramento detectado entre "
-                            f"{window_frames[0].timestamp_seconds:.1f}s e "
-                            f"{window_frames[-1].timestamp_seconds:.1f}s"
-                        )
-                    })
+            for i in np.flatnonzero(slopes > 0.3):  # Aumento significativo
+                start_frame = frames[i]
+                end_frame = frames[i + window - 1]
+                temporal_anomalies.append({
+                    "type": "progressive_bleeding",
+                    "start_frame": start_frame.frame_index,
+                    "end_frame": end_frame.frame_index,
+                    "start_time": start_frame.timestamp_seconds,
+                    "end_time": end_frame.timestamp_seconds,
+                    "severity": "high",
+                    "description": (
+                        f"Aumento progressivo de sangramento detectado entre "
+                        f"{start_frame.timestamp_seconds:.1f}s e "
+                        f"{end_frame.timestamp_seconds:.1f}s"
+                    )
+                })
         
         # Análise 2: Mudanças abruptas de severidade
-        for i in range(1, len(frames)):
+        severity = np.fromiter(
+            (_SEVERITY_CODES[f.severity] for f in frames),
+            dtype=np.int8,
+            count=len(frames)
+        )
+        # Mudança de low/medium para critical
+        abrupt = (
+            (severity[1:] == _SEVERITY_CODES[SeverityLevel.CRITICAL]) &
+            np.isin(severity[:-1], self._NON_CRITICAL_CODES)
+        )
+        
+        for i in np.flatnonzero(abrupt) + 1:
             prev_frame = frames[i-1]
             curr_frame = frames[i]
             
-            # Mudança de low/medium para critical
-            if (prev_frame.severity in [SeverityLevel.LOW, SeverityLevel.MEDIUM] and
-                curr_frame.severity == SeverityLevel.CRITICAL):
-                
-                temporal_anomalies.append({
-                    "type": "abrupt_severity_change",
-                    "frame_index": curr_frame.frame_index,
-                    "timestamp": curr_frame.timestamp_seconds,
-                    "severity": "critical",
-                    "description": (
-                        f"Mudança abrupta de severidade em {curr_frame.timestamp_seconds:.1f}s: "
-                        f"{prev_frame.severity} → {curr_frame.severity}"
-                    )
-                })
+            temporal_anomalies.append({
+                "type": "abrupt_severity_change",
+                "frame_index": curr_frame.frame_index,
+                "timestamp": curr_frame.timestamp_seconds,
+                "severity": "critical",
+                "description": (
+                    f"Mudança abrupta de severidade em {curr_frame.timestamp_seconds:.1f}s: "
+                    f"{prev_frame.severity} → {curr_frame.severity}"
+                )
+            })
         
         return temporal_anomalies
     
+    @staticmethod
+    def alert_id_prefix(analysis_id: str) -> str:
+        """Prefixo dos IDs de alerta de uma análise (``alert-{id}-``)."""
+        return f"alert-{analysis_id}-"
+    
     def generate_alert(
         self,
         frame_analysis: FrameAnalysis,
-        analysis_id: str
+        analysis_id: str,
+        alert_prefix: Optional[str] = None
     ) -> Optional[RealtimeAlert]:
         """
         Gera um alerta em tempo real se a anomalia for crítica.
@@ -181,29 +553,26 @@ class AnomalyService:
         Args:
             frame_analysis: Análise do frame.
             analysis_id: ID da análise pai.
+            alert_prefix: Prefixo de ``alert_id_prefix`` já montado pelo
+                chamador (uma vez por análise). Montado aqui se None.
         
         Returns:
             RealtimeAlert se for crítico, None caso contrário.
         """
-        if frame_analysis.severity not in [SeverityLevel.HIGH, SeverityLevel.CRITICAL]:
+        if frame_analysis.severity not in self._ALERT_SEVERITIES:
             return None
         
-        # Encontra a detecção mais crítica
-        critical_box = None
-        max_confidence = 0.0
-        
-        for box in frame_analysis.bounding_boxes:
-            if (box.anomaly_type == AnomalyType.SURGICAL_BLEEDING and
-                box.confidence > max_confidence):
-                critical_box = box
-                max_confidence = box.confidence
-        
-        # Se não houver sangramento, pega qualquer outra anomalia
-        if not critical_box and frame_analysis.bounding_boxes:
-            critical_box = max(
-                frame_analysis.bounding_boxes,
-                key=lambda b: b.confidence
-            )
+        # Detecção mais crítica: sangramento de maior confiança; sem
+        # sangramento, a anomalia de maior confiança
+        bleeding_boxes = [
+            box for box in frame_analysis.bounding_boxes
+            if box.anomaly_type == AnomalyType.SURGICAL_BLEEDING
+        ]
+        critical_box = max(
+            bleeding_boxes or frame_analysis.bounding_boxes,
+            key=_by_confidence,
+            default=None
+        )
         
         # Gera descrição
         if critical_box:
@@ -215,7 +584,7 @@ class AnomalyService:
             description = f"Alerta de severidade {frame_analysis.severity} no frame {frame_analysis.frame_index}"
         
         alert = RealtimeAlert(
-            alert_id=f"alert-{analysis_id}-{frame_analysis.frame_index}",
+            alert_id=(alert_prefix or self.alert_id_prefix(analysis_id)) + str(frame_analysis.frame_index),
             anomaly_type=critical_box.anomaly_type if critical_box else AnomalyType.ABNORMAL_MOVEMENT,
             severity=frame_analysis.severity,
             frame_index=frame_analysis.frame_index,
@@ -241,13 +610,7 @@ class AnomalyService:
         Returns:
             String descritiva do alerta.
         """
-        anomaly_names = {
-            AnomalyType.SURGICAL_BLEEDING: "Sangramento cirúrgico",
-            AnomalyType.INSTRUMENT_DETECTED: "Instrumento cirúrgico",
-            AnomalyType.ABNORMAL_MOVEMENT: "Movimento anormal",
-        }
-        
-        anomaly_name = anomaly_names.get(
+        anomaly_name = self._ANOMALY_NAMES.get(
             box.anomaly_type,
             box.anomaly_type.value if box.anomaly_type else "Anomalia"
         )
@@ -263,9 +626,10 @@ class AnomalyService:
         return description
 
 
+@lru_cache(maxsize=1)
 def get_anomaly_service() -> AnomalyService:
     """
-    Factory function para AnomalyService.
+    Factory function para AnomalyService (memoizada: uma instância por processo).
     
     Returns:
         Instância do AnomalyService.
@@ -6,8 +6,13 @@ segmentação temporal, classificação de indicadores de depressão, ansiedade
 e trauma, e geração de relatório com Gemini.
 """
 
+import asyncio
+import multiprocessing
+import os
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -20,9 +25,45 @@ from app.core.security import generate_analysis_id
 from app.models.enums import AnomalyType, RiskLevel, ConsultationType
 from app.models.schemas import AudioAnalysisResult, AudioSegment
 from app.services.gemini_service import GeminiService
+from app.utils.audio_utils import load_audio
 
 logger = get_logger(__name__)
 
+# Parâmetros do STFT compartilhado pelas features espectrais
+FEATURE_N_FFT = 2048
+FEATURE_HOP_LENGTH = 512
+
+# Faixa de busca do pitch: C2-C7 (librosa.note_to_hz('C2') / ('C7'))
+_FMIN_HZ = 65.40639132514966
+_FMAX_HZ = 2093.004522404789
+
+# Indicadores avaliados por _classify_segments, na ordem das colunas da máscara
+INDICATOR_TYPES = (
+    AnomalyType.DEPRESSION_INDICATOR,
+    AnomalyType.ANXIETY_INDICATOR,
+    AnomalyType.DOMESTIC_VIOLENCE_INDICATOR,
+    AnomalyType.VOCAL_DISTRESS,
+)
+
+# Features usadas pelas regras de classificação
+_CLASSIFIER_FEATURES = (
+    "pitch_mean", "pitch_std", "rms_mean", "rms_std", "silence_rate", "zcr_std"
+)
+
+# Energia RMS abaixo da qual o frame é considerado silêncio (sem voz)
+SILENCE_THRESHOLD = 0.01
+
+# Thread do pitch (AUDIO_FEATURE_THREADS), uma por processo e reutilizada
+_pitch_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_pitch_executor() -> ThreadPoolExecutor:
+    """Retorna a thread do pitch deste processo (criada sob demanda)."""
+    global _pitch_executor
+    if _pitch_executor is None:
+        _pitch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="audio-pitch")
+    return _pitch_executor
+
 
 class AudioService:
     """
@@ -40,7 +81,10 @@ class AudioService:
     - Energia RMS (Root Mean Square)
     - Zero Crossing Rate
     - Spectral Centroid
-    - Pitch (F0) usando librosa.pyin
+    - Pitch (F0) usando librosa.yin
+    
+    Todas as features são calculadas uma vez sobre o áudio inteiro (STFT
+    único, mesmo hop) e fatiadas por segmento.
     
     Attributes:
         gemini_service: Serviço de geração de relatórios e transcrição.
@@ -95,51 +139,28 @@ class AudioService:
                 patient_data=patient_data
             )
         
-        # Carrega áudio com librosa (para outros formatos)
-        y, sr = librosa.load(file_path, sr=None)
-        duration = librosa.get_duration(y=y, sr=sr)
-        
-        logger.info(f"Áudio carregado: {duration:.1f}s, sample rate: {sr} Hz")
-        
-        # Segmenta o áudio
-        segments = self._segment_audio(y, sr, duration)
-        logger.info(f"Áudio segmentado em {len(segments)} segmentos")
+        # Transcrição (I/O de rede) corre em paralelo com a etapa acústica
+        logger.info("Gerando transcrição do áudio...")
+        transcription_task = asyncio.create_task(self._transcribe(file_path))
         
-        # Analisa cada segmento
-        analyzed_segments = []
-        for seg_audio, start_time_seg, end_time_seg in segments:
-            # Extrai features
-            features = self._extract_features(seg_audio, sr)
-            
-            # Classifica indicadores psicológicos
-            indicators, confidence = self._classify_segment(features, transcript=None)
-            
-            # Determina tom emocional
-            emotional_tone = self._determine_emotional_tone(features, indicators)
-            
-            segment = AudioSegment(
-                start_time=start_time_seg,
-                end_time=end_time_seg,
-                transcript=None,  # Será preenchido pelo Gemini se disponível
-                indicators=indicators,
-                confidence=confidence,
-                emotional_tone=emotional_tone
+        # Etapa acústica (CPU-bound) roda no pool de processos, fora do event loop
+        loop = asyncio.get_running_loop()
+        try:
+            duration, analyzed_segments = await loop.run_in_executor(
+                get_acoustic_pool(),
+                _run_acoustic_analysis,
+                file_path
             )
-            
-            analyzed_segments.append(segment)
+        except BaseException:
+            transcription_task.cancel()
+            raise
         
         # Calcula risco geral
         overall_risk = self._compute_overall_risk(analyzed_segments)
         
         logger.info(f"Análise de áudio concluída. Risco geral: {overall_risk}")
         
-        # Gera transcrição do áudio com Gemini
-        logger.info("Gerando transcrição do áudio...")
-        try:
-            transcription = await self.gemini_service.transcribe_audio(file_path)
-        except Exception as e:
-            logger.error(f"Erro ao transcrever áudio: {e}")
-            transcription = None
+        transcription = await transcription_task
         
         # Cria resultado temporário para gerar relatório
         temp_result = AudioAnalysisResult(
@@ -187,6 +208,86 @@ class AudioService:
         
         return result
     
+    def analyze_acoustics(self, file_path: str) -> tuple[float, list[AudioSegment]]:
+        """
+        Executa a etapa acústica: carrega, segmenta e classifica o áudio.
+        
+        Função síncrona e CPU-bound, executada em processo separado
+        (ver ``get_acoustic_pool``).
+        
+        Args:
+            file_path: Caminho do arquivo de áudio.
+        
+        Returns:
+            Tupla (duração em segundos, segmentos analisados).
+        """
+        # Carrega áudio (soundfile quando o formato permite, senão librosa)
+        y, sr = load_audio(file_path)
+        duration = len(y) / sr
+        
+        logger.info(f"Áudio carregado: {duration:.1f}s, sample rate: {sr} Hz")
+        
+        # Segmenta o áudio
+        start_samples, end_samples = self._segment_audio(len(y), sr)
+        logger.info(f"Áudio segmentado em {len(start_samples)} segmentos")
+        
+        # Features por frame do áudio inteiro (um único STFT), fatiadas por segmento
+        feature_frames = self._compute_feature_frames(y, sr)
+        
+        # Extrai features de cada segmento
+        segment_features = [
+            self._segment_features(feature_frames, start_sample, end_sample)
+            for start_sample, end_sample in zip(start_samples.tolist(), end_samples.tolist())
+        ]
+        
+        # Classifica indicadores psicológicos de todos os segmentos de uma vez
+        indicator_masks, confidences = self._classify_segments(segment_features)
+        
+        # Analisa cada segmento
+        analyzed_segments = []
+        for start_sample, end_sample, features, indicator_mask, confidence in zip(
+            start_samples.tolist(),
+            end_samples.tolist(),
+            segment_features,
+            indicator_masks,
+            confidences.tolist()
+        ):
+            indicators = [
+                indicator for indicator, hit in zip(INDICATOR_TYPES, indicator_mask) if hit
+            ]
+            
+            # Determina tom emocional
+            emotional_tone = self._determine_emotional_tone(features, indicators)
+            
+            segment = AudioSegment(
+                start_time=start_sample / sr,
+                end_time=end_sample / sr,
+                transcript=None,  # Será preenchido pelo Gemini se disponível
+                indicators=indicators,
+                confidence=confidence,
+                emotional_tone=emotional_tone
+            )
+            
+            analyzed_segments.append(segment)
+        
+        return duration, analyzed_segments
+    
+    async def _transcribe(self, file_path: str) -> Optional[str]:
+        """
+        Transcreve o áudio com Gemini.
+        
+        Args:
+            file_path: Caminho do arquivo de áudio.
+        
+        Returns:
+            Transcrição, ou None em caso de erro.
+        """
+        try:
+            return await self.gemini_service.transcribe_audio(file_path)
+        except Exception as e:
+            logger.error(f"Erro ao transcrever áudio: {e}")
+            return None
+    
     async def _process_webm_audio(
         self,
         file_path: str,
@@ -318,20 +419,23 @@ class AudioService:
     
     def _segment_audio(
         self,
-        y: np.ndarray,
-        sr: int,
-        duration: float
-    ) -> list[tuple[np.ndarray, float, float]]:
+        n_samples: int,
+        sr: int
+    ) -> tuple[np.ndarray, np.ndarray]:
         """
         Segmenta o áudio em janelas com overlap.
         
+        Só os limites são calculados: as features vêm das matrizes por frame
+        do áudio inteiro, sem recortar (nem preencher) o sinal.
+        
         Args:
-            y: Array de áudio.
+            n_samples: Número de amostras do áudio.
             sr: Sample rate.
-            duration: Duração total em segundos.
         
         Returns:
-            Lista de tuplas (segmento_audio, start_time, end_time).
+            Tupla (amostras_iniciais, amostras_finais); a última janela é
+            truncada no fim do áudio. Áudio mais curto que uma janela gera
+            um único segmento.
         """
         segment_duration = settings.AUDIO_SEGMENT_DURATION
         overlap = settings.AUDIO_SEGMENT_OVERLAP
@@ -339,25 +443,19 @@ class AudioService:
         segment_samples = int(segment_duration * sr)
         hop_samples = int((segment_duration - overlap) * sr)
         
-        segments = []
-        start_sample = 0
+        # Áudio curto: uma única janela cobre tudo, sem janelas sobrepostas
+        # que repetiriam o fim do sinal
+        if n_samples <= segment_samples:
+            return np.array([0]), np.array([n_samples])
         
-        while start_sample < len(y):
-            end_sample = min(start_sample + segment_samples, len(y))
-            
-            segment_audio = y[start_sample:end_sample]
-            start_time = start_sample / sr
-            end_time = end_sample / sr
-            
-            segments.append((segment_audio, start_time, end_time))
-            
-            start_sample += hop_samples
+        start_samples = np.arange(0, n_samples, hop_samples)
+        end_samples = np.minimum(start_samples + segment_samples, n_samples)
         
-        return segments
+        return start_samples, end_samples
     
     def _extract_features(self, y: np.ndarray, sr: int) -> dict:
         """
-        Extrai features acústicas de um segmento de áudio.
+        Extrai features acústicas de um segmento de áudio isolado.
         
         Args:
             y: Array de áudio do segmento.
@@ -366,53 +464,151 @@ class AudioService:
         Returns:
             Dicionário com features extraídas.
         """
+        return self._segment_features(self._compute_feature_frames(y, sr), 0, len(y))
+    
+    def _compute_feature_frames(self, y: np.ndarray, sr: int) -> dict[str, np.ndarray]:
+        """
+        Calcula as features por frame do sinal inteiro.
+        
+        Um único STFT alimenta MFCC (via mel-espectrograma) e centroide
+        espectral; RMS, ZCR e pitch (YIN) usam o mesmo hop, de modo que o
+        frame ``i`` de todas as matrizes corresponde à amostra
+        ``i * FEATURE_HOP_LENGTH``.
+        
+        Todo o cálculo é feito em float32 (STFT em complex64), com metade
+        da memória e do tráfego de cache do float64.
+        
+        Args:
+            y: Array de áudio completo.
+            sr: Sample rate.
+        
+        Returns:
+            Dicionário feature -> matriz float32 (n_features, n_frames).
+        """
+        y = y.astype(np.float32, copy=False)
+        
+        if settings.AUDIO_FEATURE_THREADS:
+            # YIN e STFT liberam o GIL nas FFTs: o pitch roda em paralelo
+            f0_future = _get_pitch_executor().submit(self._compute_pitch, y, sr)
+            magnitude = np.abs(
+                librosa.stft(y, n_fft=FEATURE_N_FFT, hop_length=FEATURE_HOP_LENGTH)
+            )
+            f0 = f0_future.result()
+        else:
+            f0 = self._compute_pitch(y, sr)
+            magnitude = np.abs(
+                librosa.stft(y, n_fft=FEATURE_N_FFT, hop_length=FEATURE_HOP_LENGTH)
+            )
+        mel = librosa.feature.melspectrogram(S=magnitude ** 2, sr=sr)
+        
+        feature_frames = {
+            "f0": f0,
+            # MFCC (13 coeficientes)
+            "mfcc": librosa.feature.mfcc(S=librosa.power_to_db(mel), n_mfcc=13),
+            # Energia RMS
+            "rms": librosa.feature.rms(
+                y=y, frame_length=FEATURE_N_FFT, hop_length=FEATURE_HOP_LENGTH
+            ),
+            # Zero Crossing Rate
+            "zcr": librosa.feature.zero_crossing_rate(
+                y, frame_length=FEATURE_N_FFT, hop_length=FEATURE_HOP_LENGTH
+            ),
+            # Spectral Centroid
+            "spectral_centroid": librosa.feature.spectral_centroid(
+                S=magnitude, sr=sr, n_fft=FEATURE_N_FFT, hop_length=FEATURE_HOP_LENGTH
+            ),
+        }
+        
+        # YIN, ZCR e centroide retornam float64 mesmo com sinal float32
+        return {
+            name: frames.astype(np.float32, copy=False) if frames is not None else None
+            for name, frames in feature_frames.items()
+        }
+    
+    def _compute_pitch(self, y: np.ndarray, sr: int) -> Optional[np.ndarray]:
+        """
+        Estima o pitch (F0) por frame do sinal inteiro.
+        
+        Usa YIN: sem o HMM do pyin, que dominava o tempo da etapa acústica;
+        a sonoridade vem da energia RMS do mesmo frame.
+        
+        Args:
+            y: Array de áudio completo.
+            sr: Sample rate.
+        
+        Returns:
+            Matriz (1, n_frames) com o F0 em Hz, ou None em caso de erro.
+        """
+        try:
+            return librosa.yin(
+                y,
+                fmin=_FMIN_HZ,
+                fmax=_FMAX_HZ,
+                sr=sr,
+                frame_length=FEATURE_N_FFT,
+                hop_length=FEATURE_HOP_LENGTH
+            )[np.newaxis, :]
+        except Exception as e:
+            logger.warning(f"Erro ao extrair pitch: {e}")
+            return None
+    
+    def _segment_features(
+        self,
+        feature_frames: dict[str, np.ndarray],
+        start_sample: int,
+        end_sample: int
+    ) -> dict:
+        """
+        Resume as features de um segmento a partir das matrizes por frame.
+        
+        Args:
+            feature_frames: Saída de ``_compute_feature_frames``.
+            start_sample: Primeira amostra do segmento.
+            end_sample: Amostra final do segmento (exclusiva).
+        
+        Returns:
+            Dicionário com features extraídas.
+        """
+        # Mesmo número de frames que um STFT centrado sobre o segmento teria
+        start_frame = start_sample // FEATURE_HOP_LENGTH
+        frames = slice(
+            start_frame, start_frame + 1 + (end_sample - start_sample) // FEATURE_HOP_LENGTH
+        )
+        mfcc = feature_frames["mfcc"][:, frames]
+        rms = feature_frames["rms"][0, frames]
+        zcr = feature_frames["zcr"][:, frames]
+        spectral_centroid = feature_frames["spectral_centroid"][:, frames]
+        f0 = feature_frames["f0"]
+        
         features = {}
         
-        # MFCC (13 coeficientes)
-        mfcc = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=13)
         features["mfcc_mean"] = np.mean(mfcc, axis=1)
         features["mfcc_std"] = np.std(mfcc, axis=1)
         
-        # Energia RMS
-        rms = librosa.feature.rms(y=y)
-        features["rms_mean"] = np.mean(rms)
-        features["rms_std"] = np.std(rms)
+        # Energia RMS e frames de silêncio (energia muito baixa)
+        features["rms_mean"] = rms.mean()
+        features["rms_std"] = rms.std()
+        silent = rms < SILENCE_THRESHOLD
         
-        # Zero Crossing Rate
-        zcr = librosa.feature.zero_crossing_rate(y)
         features["zcr_mean"] = np.mean(zcr)
         features["zcr_std"] = np.std(zcr)
         
-        # Spectral Centroid
-        spectral_centroid = librosa.feature.spectral_centroid(y=y, sr=sr)
         features["spectral_centroid_mean"] = np.mean(spectral_centroid)
         features["spectral_centroid_std"] = np.std(spectral_centroid)
         
-        # Pitch (F0) usando librosa.pyin
-        try:
-            f0, voiced_flag, voiced_probs = librosa.pyin(
-                y, fmin=librosa.note_to_hz('C2'), fmax=librosa.note_to_hz('C7'), sr=sr
-            )
-            # Remove valores NaN
-            f0_valid = f0[~np.isnan(f0)]
-            if len(f0_valid) > 0:
-                features["pitch_mean"] = np.mean(f0_valid)
-                features["pitch_std"] = np.std(f0_valid)
-                features["pitch_range"] = np.max(f0_valid) - np.min(f0_valid)
-            else:
-                features["pitch_mean"] = 0.0
-                features["pitch_std"] = 0.0
-                features["pitch_range"] = 0.0
-        except Exception as e:
-            logger.warning(f"Erro ao extrair pitch: {e}")
+        # Pitch (F0) apenas nos frames com voz (energia acima do silêncio)
+        f0_valid = f0[0, frames][~silent] if f0 is not None else f0
+        if f0_valid is not None and len(f0_valid) > 0:
+            features["pitch_mean"] = np.mean(f0_valid)
+            features["pitch_std"] = np.std(f0_valid)
+            features["pitch_range"] = np.max(f0_valid) - np.min(f0_valid)
+        else:
             features["pitch_mean"] = 0.0
             features["pitch_std"] = 0.0
             features["pitch_range"] = 0.0
         
-        # Taxa de silêncio (frames com energia muito baixa)
-        silence_threshold = 0.01
-        silence_rate = np.sum(rms < silence_threshold) / len(rms[0])
-        features["silence_rate"] = silence_rate
+        # Taxa de silêncio
+        features["silence_rate"] = float(silent.mean())
         
         return features
     
@@ -452,44 +648,67 @@ class AudioService:
         Returns:
             Tupla (lista_indicadores, confiança_média).
         """
-        indicators = []
-        confidence_scores = []
-        
-        pitch_mean = features.get("pitch_mean", 0)
-        pitch_std = features.get("pitch_std", 0)
-        rms_mean = features.get("rms_mean", 0)
-        rms_std = features.get("rms_std", 0)
-        silence_rate = features.get("silence_rate", 0)
-        zcr_std = features.get("zcr_std", 0)
-        
-        # Regra 1: Depressão - pitch baixo, baixa energia, alta taxa de silêncio
-        if pitch_mean < 150 and rms_mean < 0.02 and silence_rate > 0.3:
-            indicators.append(AnomalyType.DEPRESSION_INDICATOR)
-            confidence = min(0.9, 0.4 + (silence_rate - 0.3) * 2)
-            confidence_scores.append(confidence)
-        
-        # Regra 2: Ansiedade - alta variação de pitch e energia
-        if pitch_std > 30 and rms_std > 0.015:
-            indicators.append(AnomalyType.ANXIETY_INDICATOR)
-            confidence = min(0.85, 0.5 + (pitch_std - 30) / 100)
-            confidence_scores.append(confidence)
-        
-        # Regra 3: Indicador de trauma - hesitações longas + queda de pitch
-        if silence_rate > 0.4 and pitch_mean < 160:
-            indicators.append(AnomalyType.DOMESTIC_VIOLENCE_INDICATOR)
-            confidence = min(0.75, 0.45 + (silence_rate - 0.4) * 1.5)
-            confidence_scores.append(confidence)
-        
-        # Regra 4: Distress vocal - alta variação de ZCR (tremor)
-        if zcr_std > 0.05:
-            indicators.append(AnomalyType.VOCAL_DISTRESS)
-            confidence = min(0.8, 0.5 + (zcr_std - 0.05) * 5)
-            confidence_scores.append(confidence)
-        
-        # Calcula confiança média
-        avg_confidence = np.mean(confidence_scores) if confidence_scores else 0.0
-        
-        return indicators, float(avg_confidence)
+        indicator_masks, confidences = self._classify_segments([features])
+        indicators = [
+            indicator for indicator, hit in zip(INDICATOR_TYPES, indicator_masks[0]) if hit
+        ]
+        return indicators, float(confidences[0])
+    
+    def _classify_segments(
+        self,
+        segment_features: list[dict]
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Aplica as regras de ``_classify_segment`` a vários segmentos de uma vez.
+        
+        Cada feature vira um array sobre os segmentos e as regras são
+        avaliadas como máscaras booleanas, sem laço por segmento.
+        
+        Args:
+            segment_features: Features acústicas de cada segmento.
+        
+        Returns:
+            Tupla (máscara (N, 4) de indicadores na ordem de
+            ``INDICATOR_TYPES``, confiança média (N,) dos indicadores
+            detectados, 0.0 sem indicadores).
+        """
+        columns = {
+            name: np.array([features.get(name, 0) for features in segment_features], dtype=np.float64)
+            for name in _CLASSIFIER_FEATURES
+        }
+        pitch_mean = columns["pitch_mean"]
+        pitch_std = columns["pitch_std"]
+        rms_mean = columns["rms_mean"]
+        rms_std = columns["rms_std"]
+        silence_rate = columns["silence_rate"]
+        zcr_std = columns["zcr_std"]
+        
+        indicator_masks = np.column_stack([
+            # Regra 1: Depressão - pitch baixo, baixa energia, alta taxa de silêncio
+            (pitch_mean < 150) & (rms_mean < 0.02) & (silence_rate > 0.3),
+            # Regra 2: Ansiedade - alta variação de pitch e energia
+            (pitch_std > 30) & (rms_std > 0.015),
+            # Regra 3: Indicador de trauma - hesitações longas + queda de pitch
+            (silence_rate > 0.4) & (pitch_mean < 160),
+            # Regra 4: Distress vocal - alta variação de ZCR (tremor)
+            zcr_std > 0.05,
+        ])
+        scores = np.column_stack([
+            np.minimum(0.9, 0.4 + (silence_rate - 0.3) * 2),
+            np.minimum(0.85, 0.5 + (pitch_std - 30) / 100),
+            np.minimum(0.75, 0.45 + (silence_rate - 0.4) * 1.5),
+            np.minimum(0.8, 0.5 + (zcr_std - 0.05) * 5),
+        ])
+        
+        # Confiança média apenas dos indicadores detectados
+        hits = indicator_masks.sum(axis=1)
+        confidences = np.where(
+            hits > 0,
+            np.where(indicator_masks, scores, 0.0).sum(axis=1) / np.maximum(hits, 1),
+            0.0
+        )
+        
+        return indicator_masks, confidences
     
     def _determine_emotional_tone(
         self,
@@ -537,38 +756,19 @@ class AudioService:
         if not segments:
             return RiskLevel.NONE
         
-        total_segments = len(segments)
-        
-        # Conta segmentos com indicadores de cada tipo
-        depression_count = sum(
-            1 for s in segments 
-            if AnomalyType.DEPRESSION_INDICATOR in s.indicators
-        )
-        anxiety_count = sum(
-            1 for s in segments 
-            if AnomalyType.ANXIETY_INDICATOR in s.indicators
-        )
-        trauma_count = sum(
-            1 for s in segments 
-            if AnomalyType.DOMESTIC_VIOLENCE_INDICATOR in s.indicators
+        # Matriz (N, 4) de indicadores na ordem de INDICATOR_TYPES; a média
+        # por coluna é a proporção de segmentos com cada indicador
+        indicator_masks = np.array(
+            [[indicator in s.indicators for indicator in INDICATOR_TYPES] for s in segments],
+            dtype=bool
         )
-        distress_count = sum(
-            1 for s in segments 
-            if AnomalyType.VOCAL_DISTRESS in s.indicators
+        depression_rate, anxiety_rate, trauma_rate, distress_rate = (
+            indicator_masks.mean(axis=0).tolist()
         )
         
-        # Calcula proporções
-        depression_rate = depression_count / total_segments
-        anxiety_rate = anxiety_count / total_segments
-        trauma_rate = trauma_count / total_segments
-        distress_rate = distress_count / total_segments
-        
         # Calcula confiança média dos segmentos com indicadores
-        segments_with_indicators = [s for s in segments if s.indicators]
-        avg_confidence = (
-            np.mean([s.confidence for s in segments_with_indicators])
-            if segments_with_indicators else 0.0
-        )
+        confidences = np.array([s.confidence for s in segments if s.indicators])
+        avg_confidence = confidences.mean() if confidences.size else 0.0
         
         # Lógica de classificação de risco
         # HIGH: Indicadores graves (trauma) ou múltiplos indicadores com alta confiança
@@ -587,13 +787,65 @@ class AudioService:
         return RiskLevel.NONE
 
 
+@lru_cache(maxsize=1)
 def get_audio_service() -> AudioService:
     """
     Factory function para criar AudioService com dependências injetadas.
     
+    Memoizada: o serviço é criado na primeira chamada e reutilizado.
+    
     Returns:
         Instância configurada do AudioService.
     """
     from app.services.gemini_service import get_gemini_service
     
     return AudioService(gemini_service=get_gemini_service())
+
+
+# Pool de processos para a etapa acústica (librosa é CPU-bound e
+# seguram o GIL; em processos separados não bloqueiam o event loop)
+_acoustic_pool: Optional[ProcessPoolExecutor] = None
+_worker_audio_service: Optional[AudioService] = None
+
+
+def _init_acoustic_worker() -> None:
+    """Inicializa o processo do pool e pré-compila os kernels do librosa."""
+    global _worker_audio_service
+    _worker_audio_service = AudioService(gemini_service=None)
+    
+    try:
+        # Aquece o JIT (numba) do librosa para não pagar a compilação na 1ª análise
+        warmup_sr = 22050
+        _worker_audio_service._extract_features(np.zeros(warmup_sr, dtype=np.float32), warmup_sr)
+    except Exception as e:
+        logger.warning(f"Falha ao aquecer worker acústico: {e}")
+
+
+def _run_acoustic_analysis(file_path: str) -> tuple[float, list[AudioSegment]]:
+    """Ponto de entrada executado dentro do pool de processos."""
+    return _worker_audio_service.analyze_acoustics(file_path)
+
+
+def get_acoustic_pool() -> ProcessPoolExecutor:
+    """
+    Retorna o pool de processos da etapa acústica (singleton, criado sob demanda).
+    
+    Returns:
+        ProcessPoolExecutor com ``AUDIO_PROCESS_WORKERS`` processos.
+    """
+    global _acoustic_pool
+    if _acoustic_pool is None:
+        _acoustic_pool = ProcessPoolExecutor(
+            max_workers=settings.AUDIO_PROCESS_WORKERS or os.cpu_count(),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_acoustic_worker
+        )
+    return _acoustic_pool
+
+
+def shutdown_acoustic_pool() -> None:
+    """Encerra o pool de processos da etapa acústica, se criado."""
+    global _acoustic_pool
+    if _acoustic_pool is not None:
+        _acoustic_pool.shutdown(wait=False, cancel_futures=True)
+        _acoustic_pool = None
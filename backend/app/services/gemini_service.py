@@ -101,7 +101,8 @@ class GeminiService:
                 logger.info("⚠️ Arquivo WebM detectado - formato gravado pelo navegador")
             
             logger.info(f"Fazendo upload do arquivo para Gemini API...")
-            audio_file = genai.upload_file(path=str(audio_path))
+            # Upload síncrono do SDK: em thread, para não bloquear o event loop
+            audio_file = await asyncio.to_thread(genai.upload_file, path=str(audio_path))
             logger.info(f"✅ Arquivo uploaded para Gemini: {audio_file.uri} (mime_type: {audio_file.mime_type})")
             
             # Prompt para transcrição
@@ -132,7 +133,7 @@ class GeminiService:
             
             # Deleta arquivo temporário do Gemini
             try:
-                genai.delete_file(audio_file.name)
+                await asyncio.to_thread(genai.delete_file, audio_file.name)
                 logger.info("Arquivo temporário removido do Gemini")
             except Exception as e:
                 logger.warning(f"Não foi possível deletar arquivo temporário: {e}")
@@ -6,9 +6,22 @@ de análises de vídeo e áudio.
 """
 
 import json
+import mmap
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Literal, Union
+from typing import Iterator, Literal, Optional, Tuple, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows: só o lock entre threads
+    fcntl = None
+
+import orjson
 
 from app.core.config import settings
 from app.core.logging_config import get_logger
@@ -16,6 +29,13 @@ from app.models.schemas import VideoAnalysisResult, AudioAnalysisResult
 
 logger = get_logger(__name__)
 
+# Índice append-only dos relatórios (uma linha JSON por relatório salvo/removido;
+# compactado quando a listagem encontra histórico ou arquivos ausentes)
+MANIFEST_FILENAME = "manifest.jsonl"
+
+# Lock entre processos (API e workers arq) de escritas e compactação do manifesto
+MANIFEST_LOCK_FILENAME = "manifest.lock"
+
 
 class ReportService:
     """
@@ -37,6 +57,10 @@ class ReportService:
         """
         self.storage_dir = Path(storage_dir)
         self.storage_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest_path = self.storage_dir / MANIFEST_FILENAME
+        self.manifest_lock_path = self.storage_dir / MANIFEST_LOCK_FILENAME
+        self._manifest_lock = threading.Lock()
+        self._manifest_cache: Optional[Tuple[Tuple[int, int, int], list[dict]]] = None
         logger.info(f"ReportService inicializado. Diretório: {self.storage_dir}")
     
     def save_report(
@@ -70,9 +94,66 @@ class ReportService:
         with open(file_path, 'w', encoding='utf-8') as f:
             json.dump(result.model_dump(mode='json'), f, indent=2, ensure_ascii=False, default=str)
         
+        if save_dir == self.storage_dir:
+            stat = file_path.stat()
+            self._append_manifest({
+                "analysis_id": result.analysis_id,
+                "report_type": report_type,
+                "filename": filename,
+                "created_at": datetime.fromtimestamp(stat.st_ctime).isoformat(),
+                "file_size_bytes": stat.st_size
+            })
+        
         logger.info(f"Relatório salvo: {file_path}")
         return str(file_path)
     
+    def delete_report(
+        self,
+        analysis_id: str,
+        report_type: Literal["video", "audio"]
+    ) -> bool:
+        """
+        Remove um relatório do disco e do manifesto.
+        
+        Args:
+            analysis_id: ID da análise.
+            report_type: Tipo do relatório ("video" ou "audio").
+        
+        Returns:
+            True se o arquivo existia e foi removido.
+        """
+        file_path = self.report_path(analysis_id, report_type)
+        try:
+            file_path.unlink()
+        except FileNotFoundError:
+            return False
+        
+        self._append_manifest({"filename": file_path.name, "deleted": True})
+        logger.info(f"Relatório removido: {file_path}")
+        return True
+    
+    def _append_manifest(self, record: dict) -> None:
+        """Acrescenta um registro ao manifesto (O_APPEND: seguro entre processos)."""
+        with self._locked_manifest(), open(self.manifest_path, "ab") as f:
+            f.write(orjson.dumps(record) + b"\n")
+    
+    def report_path(
+        self,
+        analysis_id: str,
+        report_type: Literal["video", "audio"]
+    ) -> Path:
+        """
+        Retorna o caminho do JSON de um relatório no diretório padrão.
+        
+        Args:
+            analysis_id: ID da análise.
+            report_type: Tipo do relatório ("video" ou "audio").
+        
+        Returns:
+            Caminho do arquivo (pode não existir).
+        """
+        return self.storage_dir / f"{analysis_id}_{report_type}.json"
+    
     def load_report(
         self,
         analysis_id: str,
@@ -91,8 +172,7 @@ class ReportService:
         Raises:
             FileNotFoundError: Se o relatório não existir.
         """
-        filename = f"{analysis_id}_{report_type}.json"
-        file_path = self.storage_dir / filename
+        file_path = self.report_path(analysis_id, report_type)
         
         if not file_path.exists():
             raise FileNotFoundError(f"Relatório não encontrado: {analysis_id}")
@@ -103,10 +183,40 @@ class ReportService:
         logger.info(f"Relatório carregado: {analysis_id}")
         return data
     
+    def load_report_raw(
+        self,
+        analysis_id: str,
+        report_type: Literal["video", "audio"]
+    ) -> bytes:
+        """
+        Carrega o JSON de um relatório como bytes, sem desserializar.
+        
+        Args:
+            analysis_id: ID da análise.
+            report_type: Tipo do relatório ("video" ou "audio").
+        
+        Returns:
+            Conteúdo bruto do arquivo JSON.
+        
+        Raises:
+            FileNotFoundError: Se o relatório não existir.
+        """
+        try:
+            return self.report_path(analysis_id, report_type).read_bytes()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Relatório não encontrado: {analysis_id}")
+    
     def list_reports(self) -> list[dict]:
         """
         Lista todos os relatórios salvos com metadados resumidos.
         
+        Lê o manifesto (``manifest.jsonl``) em vez de ler cada relatório. A
+        lista fica em cache até o manifesto ou o diretório mudarem (mtime),
+        o que também capta escritas e remoções de outros processos. Registros
+        cujo arquivo não existe mais são descartados e o manifesto é
+        compactado (um registro por relatório), sob o mesmo lock entre
+        processos das escritas.
+        
         Returns:
             Lista de dicionários com:
             - analysis_id
@@ -115,7 +225,86 @@ class ReportService:
             - created_at
             - file_size_bytes
         """
-        reports = []
+        with self._locked_manifest():
+            if not self.manifest_path.exists():
+                self._rebuild_manifest()
+            
+            version = self._manifest_version()
+            if self._manifest_cache is None or self._manifest_cache[0] != version:
+                records, line_count = self._read_manifest(version[1])
+                existing = set(os.listdir(self.storage_dir))
+                live = [r for r in records if r["filename"] in existing]
+                if len(live) < line_count:
+                    self._write_manifest(live)
+                    version = self._manifest_version()
+                self._manifest_cache = (version, live)
+            
+            return list(self._manifest_cache[1])
+    
+    def _manifest_version(self) -> Tuple[int, int, int]:
+        """Versão do cache: mtime/tamanho do manifesto e mtime do diretório."""
+        stat = self.manifest_path.stat()
+        return (stat.st_mtime_ns, stat.st_size, self.storage_dir.stat().st_mtime_ns)
+    
+    def _read_manifest(self, size: int) -> Tuple[list[dict], int]:
+        """
+        Lê o manifesto via mmap; o último registro de cada arquivo prevalece.
+        
+        Returns:
+            Registros vigentes (mais recente primeiro) e número de linhas lidas.
+        """
+        if size == 0:
+            return [], 0
+        
+        records: dict[str, dict] = {}
+        line_count = 0
+        with open(self.manifest_path, "rb") as f, \
+                mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as mm:
+            for line in iter(mm.readline, b""):
+                line_count += 1
+                try:
+                    record = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    logger.warning("Linha inválida no manifesto de relatórios ignorada")
+                    continue
+                
+                if record.get("deleted"):
+                    records.pop(record["filename"], None)
+                else:
+                    records[record["filename"]] = record
+        
+        # Ordena por data de criação (mais recente primeiro)
+        records_sorted = sorted(records.values(), key=lambda r: r["created_at"], reverse=True)
+        return records_sorted, line_count
+    
+    @contextmanager
+    def _locked_manifest(self) -> Iterator[None]:
+        """
+        Lock exclusivo do manifesto entre threads e processos.
+        
+        O ``flock`` fica em um arquivo à parte: a compactação troca o inode
+        do manifesto, e um lock no arquivo antigo não protegeria o novo.
+        """
+        with self._manifest_lock, open(self.manifest_lock_path, "ab") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            yield
+    
+    def _write_manifest(self, records: list[dict]) -> None:
+        """Substitui o manifesto (escrita atômica via arquivo temporário único)."""
+        with tempfile.NamedTemporaryFile(
+            dir=self.storage_dir, prefix=f"{MANIFEST_FILENAME}.", suffix=".tmp", delete=False
+        ) as tmp_file:
+            tmp_file.write(b"".join(orjson.dumps(r) + b"\n" for r in records))
+        try:
+            os.replace(tmp_file.name, self.manifest_path)
+        except OSError:
+            os.unlink(tmp_file.name)
+            raise
+    
+    def _rebuild_manifest(self) -> None:
+        """Cria o manifesto a partir dos relatórios já existentes no diretório."""
+        records = []
         
         for file_path in self.storage_dir.glob("*.json"):
             try:
@@ -130,7 +319,7 @@ class ReportService:
                 # Obtém estatísticas do arquivo
                 stat = file_path.stat()
                 
-                reports.append({
+                records.append({
                     "analysis_id": analysis_id,
                     "report_type": report_type,
                     "filename": file_path.name,
@@ -140,10 +329,8 @@ class ReportService:
             except Exception as e:
                 logger.warning(f"Erro ao processar arquivo {file_path.name}: {e}")
         
-        # Ordena por data de criação (mais recente primeiro)
-        reports.sort(key=lambda r: r["created_at"], reverse=True)
-        
-        return reports
+        self._write_manifest(records)
+        logger.info(f"Manifesto de relatórios criado: {len(records)} relatório(s)")
     
     def export_as_markdown(
         self,
@@ -261,9 +448,10 @@ Total de segmentos com indicadores: **{len(segments_with_indicators)}**
         return md
 
 
+@lru_cache(maxsize=1)
 def get_report_service() -> ReportService:
     """
-    Factory function para ReportService.
+    Factory function para ReportService (memoizada: uma instância por processo).
     
     Returns:
         Instância do ReportService.
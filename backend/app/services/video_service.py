@@ -132,19 +132,21 @@ class VideoService:
             
             frames_analyzed.append(frame_analysis)
             
-            # Callback de progresso a cada 10% ou quando crítico
+            # Callback de progresso a cada 10% ou quando crítico/alto
             if progress_callback:
                 should_report_progress = (frame_count % max(1, total_to_process // 10) == 0)
                 is_critical = severity == SeverityLevel.CRITICAL
+                needs_alert = is_critical or severity == SeverityLevel.HIGH
                 
-                if should_report_progress or is_critical:
+                if should_report_progress or needs_alert:
                     progress_percent = (frame_count / total_to_process) * 80  # 80% para análise
                     stage = f"Analisando frames ({frame_count}/{total_to_process})"
                     if is_critical:
                         stage += f" - ALERTA CRÍTICO em {timestamp:.1f}s"
                     
-                    # Passa frame_analysis se for crítico para gerar alerta
-                    if is_critical:
+                    # Passa frame_analysis se for crítico/alto para gerar alerta
+                    # (críticos saem na hora, altos em lote)
+                    if needs_alert:
                         progress_callback(progress_percent, stage, frame_analysis)
                     else:
                         progress_callback(progress_percent, stage)
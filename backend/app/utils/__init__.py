@@ -10,9 +10,14 @@ from .video_utils import (
 from .audio_utils import (
     get_audio_info,
     validate_audio_file,
+    validate_audio_header,
+    probe_audio_duration,
+    load_audio,
     normalize_audio,
     extract_audio_segment,
 )
+from .upload_utils import save_upload_file, UploadDirectoryIndex
+from .http_utils import etag_matches
 
 __all__ = [
     "FrameAnnotator",
@@ -22,6 +27,12 @@ __all__ = [
     "resize_frame_keep_aspect",
     "get_audio_info",
     "validate_audio_file",
+    "validate_audio_header",
+    "probe_audio_duration",
+    "load_audio",
     "normalize_audio",
     "extract_audio_segment",
+    "save_upload_file",
+    "UploadDirectoryIndex",
+    "etag_matches",
 ]
@@ -4,6 +4,8 @@ Utilitários para manipulação de arquivos de áudio.
 Funções auxiliares para carregamento, conversão e extração de metadados de áudio.
 """
 
+import shutil
+import subprocess
 from pathlib import Path
 from typing import Optional, Tuple
 
@@ -11,10 +13,21 @@ import librosa
 import numpy as np
 import soundfile as sf
 
+from app.core.config import settings
 from app.core.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Faixa de sample rate aceita na validação (telefonia a estúdio)
+MIN_SAMPLE_RATE = 8000
+MAX_SAMPLE_RATE = 192000
+
+# Formatos do libsndfile por extensão (os demais vão para o ffprobe)
+SOUNDFILE_FORMATS = {".wav": "WAV", ".ogg": "OGG", ".mp3": "MP3", ".flac": "FLAC"}
+
+# Tempo máximo do ffprobe na validação de formatos sem suporte no libsndfile
+FFPROBE_TIMEOUT_SECONDS = 10
+
 
 def get_audio_info(audio_path: str) -> dict:
     """
@@ -69,6 +82,23 @@ def get_audio_info(audio_path: str) -> dict:
         raise
 
 
+def probe_audio_duration(audio_path: str) -> Optional[float]:
+    """
+    Obtém a duração de um áudio lendo apenas o cabeçalho (sem decodificar).
+    
+    Args:
+        audio_path: Caminho do arquivo de áudio.
+    
+    Returns:
+        Duração em segundos, ou None se o formato não permitir leitura do
+        cabeçalho (ex: WebM).
+    """
+    try:
+        return sf.info(audio_path).duration
+    except Exception:
+        return None
+
+
 def validate_audio_file(audio_path: str) -> Tuple[bool, str]:
     """
     Valida se um arquivo de áudio é válido e pode ser processado.
@@ -122,6 +152,127 @@ def validate_audio_file(audio_path: str) -> Tuple[bool, str]:
         return False, f"Erro ao carregar áudio: {error_msg}"
 
 
+def _ffprobe_header(audio_path: str) -> Optional[Tuple[int, float]]:
+    """
+    Lê sample rate e duração via ffprobe, analisando só o primeiro segundo.
+    
+    Returns:
+        Tupla (sample_rate, duration) ou None se o ffprobe não estiver
+        disponível. Duração 0.0 quando o container não a informa.
+    
+    Raises:
+        ValueError: Se o ffprobe não encontrar stream de áudio.
+    """
+    ffprobe = shutil.which("ffprobe")
+    if ffprobe is None:
+        return None
+    
+    completed = subprocess.run(
+        [
+            ffprobe, "-v", "error",
+            "-read_intervals", "%+1",
+            "-select_streams", "a:0",
+            "-show_entries", "stream=sample_rate:format=duration",
+            "-of", "default=noprint_wrappers=1",
+            audio_path
+        ],
+        capture_output=True,
+        text=True,
+        timeout=FFPROBE_TIMEOUT_SECONDS
+    )
+    fields = dict(
+        line.split("=", 1) for line in completed.stdout.splitlines() if "=" in line
+    )
+    if completed.returncode != 0 or "sample_rate" not in fields:
+        raise ValueError(completed.stderr.strip() or "nenhum stream de áudio")
+    
+    try:
+        duration = float(fields.get("duration", "0"))
+    except ValueError:
+        duration = 0.0  # "N/A" (ex: WebM gravado pelo navegador)
+    return int(fields["sample_rate"]), duration
+
+
+def validate_audio_header(audio_path: str) -> Tuple[bool, str, Optional[float]]:
+    """
+    Valida um arquivo de áudio lendo apenas o cabeçalho (sem decodificar).
+    
+    Usa ``soundfile.info`` para formatos suportados pelo libsndfile (WAV,
+    OGG, MP3). Para os demais (M4A, WebM) recorre ao ffprobe limitado ao
+    primeiro segundo; sem ffprobe, faz apenas a validação básica de arquivo.
+    
+    Args:
+        audio_path: Caminho do arquivo de áudio.
+    
+    Returns:
+        Tupla (is_valid, error_message, duration). ``duration`` é None
+        quando o cabeçalho não informa a duração.
+    """
+    path = Path(audio_path)
+    
+    if not path.is_file():
+        return False, "Arquivo não encontrado", None
+    
+    if path.suffix.lower() not in settings.allowed_audio_extensions_set:
+        return False, f"Extensão não suportada: {path.suffix}. Use: {', '.join(settings.ALLOWED_AUDIO_EXTENSIONS)}", None
+    
+    if path.stat().st_size < 1024:
+        return False, "Arquivo de áudio muito pequeno (< 1KB)", None
+    
+    if SOUNDFILE_FORMATS.get(path.suffix.lower()) in sf.available_formats():
+        try:
+            info = sf.info(audio_path)
+        except Exception as e:
+            return False, f"Erro ao ler cabeçalho do áudio: {e}", None
+        sample_rate, duration = info.samplerate, info.duration
+    else:
+        try:
+            header = _ffprobe_header(audio_path)
+        except Exception as e:
+            return False, f"Erro ao ler cabeçalho do áudio: {e}", None
+        
+        if header is None:
+            logger.info(f"Cabeçalho não lido ({path.suffix}), sem ffprobe - validação básica aprovada")
+            return True, "Áudio válido (validação básica)", None
+        sample_rate, duration = header
+    
+    if not MIN_SAMPLE_RATE <= sample_rate <= MAX_SAMPLE_RATE:
+        return False, f"Sample rate não suportado: {sample_rate} Hz", None
+    
+    if duration > settings.AUDIO_MAX_DURATION_SECONDS:
+        return False, f"Áudio muito longo: {duration / 60:.0f} min", None
+    
+    return True, "Áudio válido", duration or None
+
+
+def load_audio(audio_path: str) -> Tuple[np.ndarray, int]:
+    """
+    Carrega o áudio completo em mono float32, no sample rate original.
+    
+    Formatos suportados pelo libsndfile são lidos direto com ``soundfile``,
+    sem a descoberta de backend do ``librosa.load``/audioread; os demais
+    (ex: M4A) ou falhas de leitura caem no ``librosa.load``.
+    
+    Args:
+        audio_path: Caminho do arquivo de áudio.
+    
+    Returns:
+        Tupla (y, sample_rate).
+    """
+    if SOUNDFILE_FORMATS.get(Path(audio_path).suffix.lower()) in sf.available_formats():
+        try:
+            y, sr = sf.read(audio_path, dtype="float32", always_2d=False)
+        except Exception as e:
+            logger.warning(f"soundfile não leu {audio_path}, usando librosa: {e}")
+        else:
+            # soundfile devolve (amostras, canais)
+            if y.ndim == 2:
+                y = y.mean(axis=1)
+            return y, sr
+    
+    return librosa.load(audio_path, sr=None)
+
+
 def convert_to_mono(y: np.ndarray) -> np.ndarray:
     """
     Converte áudio para mono se for estéreo.
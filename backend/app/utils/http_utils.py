@@ -0,0 +1,34 @@
+"""
+Utilitários HTTP compartilhados pelas rotas.
+
+``etag_matches`` implementa a comparação fraca do ``If-None-Match``
+(RFC 9110): lista separada por vírgulas, prefixo ``W/`` e ``*``.
+"""
+
+from typing import Optional
+
+
+def _opaque_tag(tag: str) -> str:
+    """Remove espaços e o prefixo de ETag fraca (``W/``)."""
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Verifica se o ``If-None-Match`` do cliente corresponde à ETag atual.
+    
+    Args:
+        if_none_match: Valor do header (None se ausente).
+        etag: ETag atual do recurso (entre aspas).
+    
+    Returns:
+        True se o header é ``*`` ou lista a ETag (forte ou fraca).
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    
+    current = _opaque_tag(etag)
+    return any(_opaque_tag(tag) == current for tag in if_none_match.split(","))
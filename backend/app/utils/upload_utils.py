@@ -0,0 +1,194 @@
+"""
+Utilitários para gravação de uploads em disco.
+
+Copia o corpo do upload em blocos de tamanho fixo, sem carregar o arquivo
+inteiro em memória e sem bloquear o event loop com escrita síncrona. Em Linux,
+quando o tamanho é conhecido, o espaço é pré-alocado com ``posix_fallocate``.
+Opcionalmente calcula o hash do conteúdo na mesma passada.
+
+Os blocos são lidos com ``readinto`` em buffers reaproveitados de um pool
+limitado, sem alocar um ``bytes`` novo por bloco.
+
+``UploadDirectoryIndex`` localiza uploads gravados como
+``{analysis_id}_{nome}`` sem varrer o diretório a cada consulta.
+"""
+
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+
+import aiofiles
+from fastapi import HTTPException, UploadFile, status
+
+from app.core.config import settings
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Tamanho do bloco de cópia (1 MiB)
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# Máximo de buffers de cópia (uploads simultâneos além disso aguardam um buffer)
+UPLOAD_BUFFER_POOL_SIZE = 16
+
+
+class BufferPool:
+    """
+    Pool de ``bytearray`` de tamanho fixo reaproveitados entre uploads.
+    
+    Os buffers são criados sob demanda até ``max_buffers``; depois disso,
+    quem pede um buffer espera outro ser devolvido.
+    """
+    
+    def __init__(self, buffer_size: int, max_buffers: int):
+        """
+        Inicializa o pool.
+        
+        Args:
+            buffer_size: Tamanho de cada buffer em bytes.
+            max_buffers: Número máximo de buffers em uso simultâneo.
+        """
+        self.buffer_size = buffer_size
+        self._free: List[bytearray] = []
+        self._semaphore = asyncio.Semaphore(max_buffers)
+    
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[bytearray]:
+        """Empresta um buffer pela duração do bloco ``async with``."""
+        async with self._semaphore:
+            buffer = self._free.pop() if self._free else bytearray(self.buffer_size)
+            try:
+                yield buffer
+            finally:
+                self._free.append(buffer)
+
+
+_buffer_pool = BufferPool(UPLOAD_CHUNK_SIZE, UPLOAD_BUFFER_POOL_SIZE)
+
+
+class UploadDirectoryIndex:
+    """
+    Índice em memória ``analysis_id -> arquivo`` de um diretório de uploads.
+    
+    O diretório só é relido quando seu ``mtime`` muda (criação, remoção ou
+    renomeação de arquivos); nas demais consultas o custo é um ``stat``.
+    """
+    
+    def __init__(self, directory: Path, extensions: Iterable[str]):
+        """
+        Inicializa o índice.
+        
+        Args:
+            directory: Diretório dos uploads.
+            extensions: Extensões indexadas, sem ponto (ex: "mp4").
+        """
+        self.directory = Path(directory)
+        self.extensions = frozenset(ext.lower() for ext in extensions)
+        self._paths: Dict[str, Path] = {}
+        self._mtime_ns: Optional[int] = None
+    
+    def lookup(self, analysis_id: str) -> Optional[Path]:
+        """
+        Retorna o arquivo enviado para uma análise.
+        
+        Args:
+            analysis_id: ID da análise.
+        
+        Returns:
+            Caminho do arquivo ou None se não existir.
+        """
+        try:
+            mtime_ns = os.stat(self.directory).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        
+        if mtime_ns != self._mtime_ns:
+            # mtime lido antes da varredura: mudanças durante ela forçam nova leitura
+            self._paths = self._scan()
+            self._mtime_ns = mtime_ns
+        
+        return self._paths.get(analysis_id)
+    
+    def _scan(self) -> Dict[str, Path]:
+        """Lê o diretório e monta o índice por prefixo ``{analysis_id}_``."""
+        paths: Dict[str, Path] = {}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                analysis_id, sep, name = entry.name.partition("_")
+                if sep and Path(name).suffix.lower().lstrip(".") in self.extensions:
+                    paths.setdefault(analysis_id, Path(entry.path))
+        return paths
+
+
+def _preallocate(fd: int, size: Optional[int]) -> bool:
+    """
+    Reserva ``size`` bytes contíguos para o arquivo, se suportado.
+
+    Returns:
+        True se a pré-alocação foi feita.
+    """
+    if not size or not hasattr(os, "posix_fallocate"):
+        return False
+    try:
+        os.posix_fallocate(fd, 0, size)
+        return True
+    except OSError:
+        # Sistema de arquivos sem suporte (ex: alguns overlays/tmpfs antigos)
+        return False
+
+
+async def save_upload_file(
+    file: UploadFile,
+    destination: Path,
+    max_size_bytes: Optional[int] = None,
+    hasher: Optional[Any] = None
+) -> int:
+    """
+    Grava um upload em disco em blocos de ``UPLOAD_CHUNK_SIZE``.
+
+    Args:
+        file: Arquivo de upload do FastAPI.
+        destination: Caminho de destino.
+        max_size_bytes: Tamanho máximo permitido. Usa config se None.
+        hasher: Objeto ``hashlib`` atualizado com cada bloco gravado.
+
+    Returns:
+        Número de bytes gravados.
+
+    Raises:
+        HTTPException: 413 se o arquivo exceder o limite durante a cópia
+            (o arquivo parcial é removido).
+    """
+    max_size = max_size_bytes or settings.max_upload_size_bytes
+    written = 0
+
+    try:
+        async with aiofiles.open(destination, "wb") as out:
+            expected_size = file.size if file.size and file.size <= max_size else None
+            preallocated = _preallocate(out.fileno(), expected_size)
+
+            async with _buffer_pool.lease() as buffer:
+                view = memoryview(buffer)
+                while n := await asyncio.to_thread(file.file.readinto, view):
+                    written += n
+                    if written > max_size:
+                        raise HTTPException(
+                            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                            detail=f"Arquivo muito grande. Máximo: {settings.MAX_UPLOAD_SIZE_MB}MB"
+                        )
+                    chunk = view[:n]
+                    if hasher is not None:
+                        hasher.update(chunk)
+                    await out.write(chunk)
+
+            # Descarta espaço reservado não usado (tamanho declarado maior que o real)
+            if preallocated and written != expected_size:
+                await out.truncate(written)
+    except BaseException:
+        destination.unlink(missing_ok=True)
+        raise
+
+    logger.debug(f"Upload gravado: {destination} ({written} bytes)")
+    return written
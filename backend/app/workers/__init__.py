@@ -1,9 +1,47 @@
 """
 Workers para processamento assíncrono de tarefas.
 
-Este módulo pode ser expandido para incluir workers Celery ou RQ
-para processamento distribuído de análises em background.
+Com ``REDIS_ENABLED=true`` a API apenas enfileira os jobs e o processamento
+roda em workers arq separados, permitindo ``uvicorn --workers N``:
+
+    arq app.workers.WorkerSettings
+
+Sem Redis, as análises rodam no próprio processo via ``HRRNScheduler``.
 """
 
-# Placeholder para workers assíncronos
-# TODO: Implementar workers com Celery/RQ se necessário para escalabilidade
+from arq.worker import func
+
+from app.core.config import settings
+from app.core.redis_client import get_redis_settings
+from .audio_worker import process_audio_task, process_audio_job
+from .video_worker import (
+    process_video_task,
+    process_video_job,
+    drain_report_writes,
+    on_worker_shutdown,
+)
+from .scheduler import HRRNScheduler, get_audio_scheduler
+
+
+class WorkerSettings:
+    """Configuração do worker arq."""
+
+    functions = [
+        func(process_audio_job, name="process_audio_task"),
+        func(process_video_job, name="process_video_task"),
+    ]
+    redis_settings = get_redis_settings()
+    keep_result = 0
+    job_timeout = 3600
+    max_jobs = settings.WORKER_MAX_JOBS
+    on_shutdown = on_worker_shutdown
+
+
+__all__ = [
+    "WorkerSettings",
+    "process_audio_task",
+    "process_video_task",
+    "drain_report_writes",
+    "HRRNScheduler",
+    "get_audio_scheduler",
+]
@@ -0,0 +1,99 @@
+"""
+Worker de processamento de áudio.
+
+``process_audio_task`` roda no próprio processo da API (HRRNScheduler) ou
+em um worker arq separado quando ``REDIS_ENABLED`` está ativo.
+"""
+
+import asyncio
+from pathlib import Path
+
+from app.core.logging_config import get_logger
+from app.models.patient_schemas import PatientData
+from app.models.enums import AnalysisStatusEnum, ConsultationType
+from app.services import get_audio_service, get_report_service, get_analysis_store
+
+logger = get_logger(__name__)
+
+
+async def process_audio_task(
+    analysis_id: str,
+    file_path: str,
+    filename: str,
+    consultation_type: str = ConsultationType.GENERAL.value,
+    patient_data_json: str | None = None
+):
+    """
+    Task assíncrona para processar áudio em background.
+
+    Args:
+        analysis_id: ID da análise.
+        file_path: Caminho do arquivo temporário.
+        filename: Nome original do arquivo.
+        consultation_type: Tipo de consulta médica (valor do enum).
+        patient_data_json: Dados do paciente em formato JSON string.
+    """
+    store = get_analysis_store("audio")
+
+    try:
+        logger.info(f"Iniciando processamento de áudio: {analysis_id}")
+
+        # Parse patient data se fornecido
+        patient_data = None
+        if patient_data_json:
+            try:
+                patient_data = PatientData.model_validate_json(patient_data_json)
+                logger.info(f"Dados da paciente carregados: {patient_data.nome}")
+            except Exception as e:
+                logger.warning(f"Erro ao parsear dados da paciente: {e}")
+
+        # Atualiza status
+        await store.set_status(
+            analysis_id,
+            AnalysisStatusEnum.PROCESSING,
+            10.0,
+            "Carregando áudio e extraindo features"
+        )
+
+        # Processa áudio
+        audio_service = get_audio_service()
+        result = await audio_service.process_audio(
+            file_path=file_path,
+            analysis_id=analysis_id,
+            consultation_type=ConsultationType(consultation_type),
+            patient_data=patient_data
+        )
+
+        # Salva resultado
+        report_service = get_report_service()
+        await asyncio.to_thread(report_service.save_report, result)
+
+        await store.set_result(analysis_id, result)
+
+        # Atualiza status final
+        await store.set_status(analysis_id, AnalysisStatusEnum.COMPLETED, 100.0, "Concluído")
+
+        logger.info(f"Análise de áudio concluída: {analysis_id}")
+
+    except Exception as e:
+        logger.error(f"Erro ao processar áudio {analysis_id}: {e}", exc_info=True)
+
+        await store.set_status(
+            analysis_id,
+            AnalysisStatusEnum.FAILED,
+            0.0,
+            "Falha no processamento",
+            error_message=str(e)
+        )
+
+    finally:
+        # Cleanup
+        try:
+            Path(file_path).unlink(missing_ok=True)
+        except Exception as e:
+            logger.warning(f"Erro ao remover arquivo temporário {file_path}: {e}")
+
+
+async def process_audio_job(ctx: dict, *args) -> None:
+    """Entrada do job arq; repassa os argumentos para ``process_audio_task``."""
+    await process_audio_task(*args)
@@ -0,0 +1,172 @@
+"""
+Escalonador em processo para análises enfileiradas.
+
+Usado quando o Redis está desabilitado: em vez de executar as tasks em ordem
+FIFO, escolhe o próximo job pela razão de resposta (HRRN - Highest Response
+Ratio Next), usando a duração do áudio como estimativa de custo. Jobs curtos
+passam na frente, e o tempo de espera impede starvation dos longos.
+"""
+
+import asyncio
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, List, Optional, Set
+
+from app.core.config import settings
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Estimativa usada quando a duração não pode ser lida do cabeçalho (ex: WebM)
+DEFAULT_ESTIMATED_SECONDS = 60.0
+
+_job_sequence = itertools.count()
+
+
+@dataclass
+class ScheduledJob:
+    """Job pendente no escalonador."""
+
+    job_id: str
+    func: Callable[..., Awaitable[None]]
+    args: tuple
+    estimated_seconds: float
+    submitted_at: float = field(default_factory=time.monotonic)
+    sequence: int = field(default_factory=lambda: next(_job_sequence))
+
+    def response_ratio(self, now: float) -> float:
+        """Razão de resposta: (espera + custo estimado) / custo estimado."""
+        return (now - self.submitted_at + self.estimated_seconds) / self.estimated_seconds
+
+
+class HRRNScheduler:
+    """
+    Escalonador HRRN com limite de execuções simultâneas.
+
+    O loop de despacho é iniciado na primeira submissão, no event loop
+    corrente, e só escolhe o próximo job quando há vaga livre — a razão de
+    resposta é recalculada no momento do despacho.
+    """
+
+    def __init__(self, max_concurrent: int):
+        """
+        Inicializa o escalonador.
+
+        Args:
+            max_concurrent: Número máximo de jobs executando ao mesmo tempo.
+        """
+        self.max_concurrent = max_concurrent
+        self._pending: List[ScheduledJob] = []
+        self._running: Set[asyncio.Task] = set()
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._has_jobs: Optional[asyncio.Event] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    @property
+    def pending_count(self) -> int:
+        """Número de jobs aguardando execução."""
+        return len(self._pending)
+
+    async def submit(
+        self,
+        job_id: str,
+        func: Callable[..., Awaitable[None]],
+        *args,
+        estimated_seconds: Optional[float] = None
+    ) -> None:
+        """
+        Enfileira um job.
+
+        Args:
+            job_id: Identificador do job (ID da análise).
+            func: Corrotina a executar.
+            *args: Argumentos posicionais da corrotina.
+            estimated_seconds: Custo estimado (duração do áudio).
+        """
+        self._ensure_started()
+
+        estimate = estimated_seconds if estimated_seconds and estimated_seconds > 0 \
+            else DEFAULT_ESTIMATED_SECONDS
+        self._pending.append(ScheduledJob(job_id, func, args, estimate))
+        self._has_jobs.set()
+
+        logger.debug(f"Job {job_id} enfileirado (estimativa: {estimate:.1f}s, "
+                     f"pendentes: {len(self._pending)})")
+
+    def _ensure_started(self) -> None:
+        """Inicia (ou reinicia) o loop de despacho no event loop corrente."""
+        loop = asyncio.get_running_loop()
+        if (
+            self._dispatcher is not None
+            and not self._dispatcher.done()
+            and self._dispatcher.get_loop() is loop
+        ):
+            return
+
+        self._has_jobs = asyncio.Event()
+        self._slots = asyncio.Semaphore(self.max_concurrent)
+        if self._pending:
+            self._has_jobs.set()
+        self._dispatcher = loop.create_task(self._dispatch_loop())
+
+    def _pop_next(self) -> ScheduledJob:
+        """Remove e retorna o job de maior razão de resposta."""
+        now = time.monotonic()
+        best = max(
+            self._pending,
+            key=lambda job: (job.response_ratio(now), -job.sequence)
+        )
+        self._pending.remove(best)
+        return best
+
+    async def _dispatch_loop(self) -> None:
+        """Loop que despacha jobs conforme vagas são liberadas."""
+        while True:
+            await self._has_jobs.wait()
+            await self._slots.acquire()
+
+            job = self._pop_next()
+            if not self._pending:
+                self._has_jobs.clear()
+
+            task = asyncio.create_task(self._execute(job))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _execute(self, job: ScheduledJob) -> None:
+        """Executa um job e libera a vaga ao final."""
+        try:
+            await job.func(*job.args)
+        except Exception as e:
+            logger.error(f"Erro no job {job.job_id}: {e}", exc_info=True)
+        finally:
+            self._slots.release()
+
+    async def stop(self) -> None:
+        """Cancela o loop de despacho e os jobs em execução."""
+        loop = asyncio.get_running_loop()
+        tasks = [task for task in self._running if task.get_loop() is loop]
+        if self._dispatcher is not None and self._dispatcher.get_loop() is loop:
+            tasks.append(self._dispatcher)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._dispatcher = None
+
+
+# Instância singleton
+_audio_scheduler: Optional[HRRNScheduler] = None
+
+
+def get_audio_scheduler() -> HRRNScheduler:
+    """
+    Retorna o escalonador de análises de áudio (singleton).
+
+    Returns:
+        Instância HRRNScheduler.
+    """
+    global _audio_scheduler
+    if _audio_scheduler is None:
+        _audio_scheduler = HRRNScheduler(max_concurrent=settings.WORKER_MAX_JOBS)
+    return _audio_scheduler
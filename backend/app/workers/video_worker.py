@@ -0,0 +1,260 @@
+"""
+Worker de processamento de vídeo.
+
+``process_video_task`` roda no próprio processo da API (BackgroundTasks) ou
+em um worker arq separado quando ``REDIS_ENABLED`` está ativo. Progresso e
+alertas saem pelo ``connection_manager``, que com Redis publica no canal
+``progress:{analysis_id}`` repassado aos WebSockets pela API.
+"""
+
+import asyncio
+import time
+
+from app.api.routes.websocket import connection_manager
+from app.core.logging_config import get_logger
+from app.core.redis_client import close_redis
+from app.models.enums import AnalysisStatusEnum
+from app.services import (
+    get_video_service,
+    get_report_service,
+    get_anomaly_service,
+    get_analysis_store,
+)
+
+logger = get_logger(__name__)
+
+# Intervalo mínimo entre updates de progresso da mesma etapa (mudanças de
+# etapa, conclusão e frames críticos não são limitados; alertas altos saem
+# mesmo quando o progresso do frame é descartado)
+PROGRESS_THROTTLE_SECONDS = 0.2
+
+# Alertas de severidade alta acumulados antes de um envio (críticos saem na hora)
+ALERT_BATCH_SIZE = 10
+
+# Gravações de relatório em andamento (referência forte até concluírem)
+_pending_report_writes: set[asyncio.Task] = set()
+
+
+async def _save_report_in_background(result) -> None:
+    """Grava o relatório em disco (cópia durável) sem atrasar a conclusão."""
+    try:
+        await asyncio.to_thread(get_report_service().save_report, result)
+    except Exception as e:
+        logger.error(f"Erro ao salvar relatório {result.analysis_id}: {e}", exc_info=True)
+
+
+def _stage_kind(stage: str) -> str:
+    """Etapa sem o contador de frames ("Analisando frames (3/10)" -> "Analisando frames")."""
+    return stage.split(" (", 1)[0]
+
+
+async def drain_report_writes() -> None:
+    """Aguarda as gravações de relatório pendentes (usar no shutdown)."""
+    if _pending_report_writes:
+        await asyncio.gather(*_pending_report_writes, return_exceptions=True)
+
+
+async def process_video_task(
+    analysis_id: str,
+    file_path: str,
+    filename: str
+):
+    """
+    Task assíncrona para processar vídeo em background.
+    
+    Args:
+        analysis_id: ID da análise.
+        file_path: Caminho do arquivo temporário.
+        filename: Nome original do arquivo.
+    """
+    video_store = get_analysis_store("video")
+    
+    # O callback pode ser chamado fora do event loop (thread de inferência)
+    loop = asyncio.get_running_loop()
+    last_progress_time = 0.0
+    last_stage_kind: str | None = None
+    pending_updates: list[asyncio.Future] = []
+    pending_alerts: list[dict] = []
+    
+    async def flush_alerts():
+        if pending_alerts:
+            batch = pending_alerts.copy()
+            pending_alerts.clear()
+            await connection_manager.broadcast_alerts(analysis_id, batch)
+    
+    def log_update_error(error):
+        if isinstance(error, Exception):
+            logger.error(
+                f"Erro ao enviar progresso da análise {analysis_id}: {error}",
+                exc_info=error
+            )
+    
+    def prune_pending_updates():
+        # Descarta updates já concluídos (registrando erros) para a lista não crescer
+        still_pending = []
+        for future in pending_updates:
+            if not future.done():
+                still_pending.append(future)
+            elif not future.cancelled():
+                log_update_error(future.exception())
+        pending_updates[:] = still_pending
+    
+    async def wait_pending_updates():
+        # Updates agendados pelo callback terminam antes do status final
+        while pending_updates:
+            batch = pending_updates.copy()
+            pending_updates.clear()
+            results = await asyncio.gather(
+                *(asyncio.wrap_future(f) for f in batch),
+                return_exceptions=True
+            )
+            for error in results:
+                log_update_error(error)
+    
+    try:
+        logger.info(f"Iniciando processamento de vídeo: {analysis_id}")
+        
+        # Atualiza status
+        await video_store.set_status(
+            analysis_id,
+            AnalysisStatusEnum.PROCESSING,
+            0.0,
+            "Inicializando análise..."
+        )
+        
+        # Serviço de anomalias para gerar alertas
+        anomaly_service = get_anomaly_service()
+        alert_prefix = anomaly_service.alert_id_prefix(analysis_id)
+        
+        # Callback de progresso e alertas
+        async def progress_callback_async(
+            percent: float,
+            stage: str,
+            frame_analysis=None,
+            report_progress: bool = True
+        ):
+            if report_progress:
+                # Atualiza progresso no store
+                await video_store.update_progress(analysis_id, percent, stage)
+                
+                # Envia progresso via WebSocket
+                await connection_manager.broadcast_progress(
+                    analysis_id,
+                    percent,
+                    stage
+                )
+            
+            # Se houver frame crítico/alto, gera alerta (altos são enviados em lote)
+            if frame_analysis and frame_analysis.severity in ["high", "critical"]:
+                alert = anomaly_service.generate_alert(
+                    frame_analysis, analysis_id, alert_prefix
+                )
+                if alert:
+                    # Converte para dicionário
+                    alert_dict = {
+                        "alert_id": alert.alert_id,
+                        "anomaly_type": alert.anomaly_type.value,
+                        "severity": alert.severity.value,
+                        "frame_number": alert.frame_index,
+                        "frame_timestamp": frame_analysis.timestamp_seconds,
+                        "timestamp": alert.timestamp.isoformat(),
+                        "message": alert.description,
+                        "confidence": alert.bounding_box.confidence if alert.bounding_box else None
+                    }
+                    
+                    pending_alerts.append(alert_dict)
+                    
+                    # Envia alertas via WebSocket
+                    if frame_analysis.severity == "critical" or len(pending_alerts) >= ALERT_BATCH_SIZE:
+                        await flush_alerts()
+                        logger.info(f"🚨 Alertas enviados (último: {alert.alert_id})")
+        
+        # Wrapper síncrono (thread-safe) para o callback assíncrono
+        def progress_callback(percent: float, stage: str, frame_analysis=None):
+            nonlocal last_progress_time, last_stage_kind
+            now = time.monotonic()
+            stage_kind = _stage_kind(stage)
+            is_critical = frame_analysis is not None and frame_analysis.severity == "critical"
+            # Só limita updates repetidos da mesma etapa (contador de frames);
+            # frames altos limitados ainda geram o alerta, sem progresso
+            report_progress = (
+                is_critical
+                or percent >= 100
+                or stage_kind != last_stage_kind
+                or now - last_progress_time >= PROGRESS_THROTTLE_SECONDS
+            )
+            if not report_progress and frame_analysis is None:
+                return
+            if report_progress:
+                last_progress_time = now
+                last_stage_kind = stage_kind
+            prune_pending_updates()
+            pending_updates.append(asyncio.run_coroutine_threadsafe(
+                progress_callback_async(percent, stage, frame_analysis, report_progress),
+                loop
+            ))
+        
+        # Processa vídeo
+        video_service = get_video_service()
+        result = await video_service.process_video(
+            file_path=file_path,
+            analysis_id=analysis_id,
+            progress_callback=progress_callback
+        )
+        
+        # Resultado servido pelo store; o relatório em disco é gravado em background
+        await video_store.set_result(analysis_id, result)
+        
+        write_task = asyncio.create_task(_save_report_in_background(result))
+        _pending_report_writes.add(write_task)
+        write_task.add_done_callback(_pending_report_writes.discard)
+        
+        # Progresso e alertas ainda em voo, depois os altos ainda não enviados
+        await wait_pending_updates()
+        await flush_alerts()
+        
+        # Atualiza status final
+        await video_store.set_status(analysis_id, AnalysisStatusEnum.COMPLETED, 100.0, "Concluído")
+        
+        # Envia notificação de conclusão via WebSocket
+        await connection_manager.broadcast_completed(analysis_id, {
+            "total_frames": result.total_frames_analyzed,
+            "anomaly_count": sum(result.anomaly_summary.values()),
+            "processing_time": result.processing_time_seconds
+        })
+        
+        logger.info(f"Análise de vídeo concluída: {analysis_id}")
+    
+    except Exception as e:
+        logger.error(f"Erro ao processar vídeo {analysis_id}: {e}", exc_info=True)
+        
+        # Não deixa um update de progresso atrasado sobrescrever a falha
+        await wait_pending_updates()
+        await video_store.set_status(
+            analysis_id,
+            AnalysisStatusEnum.FAILED,
+            0.0,
+            "Falha no processamento",
+            error_message=str(e)
+        )
+    
+    finally:
+        # Cleanup: remove arquivo temporário
+        # NOTA: Mantém arquivo para streaming/download do vídeo pela interface
+        # TODO: Implementar limpeza periódica de arquivos antigos
+        # try:
+        #     Path(file_path).unlink(missing_ok=True)
+        # except Exception as e:
+        #     logger.warning(f"Erro ao remover arquivo temporário {file_path}: {e}")
+        pass
+
+
+async def process_video_job(ctx: dict, *args) -> None:
+    """Entrada do job arq; repassa os argumentos para ``process_video_task``."""
+    await process_video_task(*args)
+
+
+async def on_worker_shutdown(ctx: dict) -> None:
+    """Hook de shutdown do worker arq: não perde relatórios ainda em gravação."""
+    await drain_report_writes()
+    await close_redis()
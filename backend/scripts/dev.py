@@ -0,0 +1,35 @@
+"""
+Servidor de desenvolvimento local.
+
+Uso (a partir de ``backend/``)::
+
+    python -m scripts.dev
+
+Mantém o ``uvicorn.run`` fora de ``app.main``, que fica só como módulo ASGI.
+O autoreload observa apenas ``app/``, sem varrer ``models_weights/`` e
+``storage/`` a cada alteração.
+"""
+
+import uvicorn
+
+from app.core.config import get_settings
+
+
+def main() -> None:
+    """Sobe o uvicorn com reload em desenvolvimento."""
+    settings = get_settings()
+    
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=8000,
+        reload=settings.is_development,
+        reload_dirs=["app"],
+        reload_excludes=["*.pyc", "models_weights/*", "storage/*"],
+        log_level=settings.LOG_LEVEL.lower(),
+        ws_per_message_deflate=True
+    )
+
+
+if __name__ == "__main__":
+    main()
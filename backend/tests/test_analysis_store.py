@@ -0,0 +1,158 @@
+"""
+Testes do AnalysisStore.
+
+Valida o backend local (memória) usado quando o Redis está desabilitado.
+"""
+
+import pytest
+
+from app.core.config import settings
+from app.models.enums import AnalysisStatusEnum
+from app.models.schemas import AudioAnalysisResult, VideoAnalysisResult
+from app.services.analysis_store import AnalysisStore
+
+
+@pytest.mark.unit
+class TestAnalysisStore:
+    """Testes do store de status/resultados."""
+
+    def test_invalid_backend(self):
+        """Testa que backend inválido gera erro."""
+        with pytest.raises(ValueError):
+            AnalysisStore("audio", AudioAnalysisResult, backend="memcached")
+
+    async def test_status_roundtrip(self):
+        """Testa gravar e ler status."""
+        store = AnalysisStore("audio", AudioAnalysisResult, backend="local")
+
+        await store.set_status("abc", AnalysisStatusEnum.QUEUED, 0.0, "Na fila")
+        status_dict = await store.get_status("abc")
+
+        assert status_dict["status"] == AnalysisStatusEnum.QUEUED
+        assert status_dict["progress_percent"] == 0.0
+        assert status_dict["current_stage"] == "Na fila"
+        assert status_dict["error_message"] is None
+
+    async def test_missing_analysis(self):
+        """Testa leitura de análise inexistente."""
+        store = AnalysisStore("audio", AudioAnalysisResult, backend="local")
+
+        assert await store.get_status("missing") is None
+        assert await store.get_result("missing") is None
+        assert await store.delete("missing") is False
+
+    async def test_result_and_delete(self, sample_audio_analysis_result):
+        """Testa gravar resultado e remover análise."""
+        store = AnalysisStore("audio", AudioAnalysisResult, backend="local")
+        analysis_id = sample_audio_analysis_result.analysis_id
+
+        await store.set_status(analysis_id, AnalysisStatusEnum.COMPLETED, 100.0, "Concluído")
+        await store.set_result(analysis_id, sample_audio_analysis_result)
+
+        assert await store.get_result(analysis_id) is sample_audio_analysis_result
+        assert await store.delete(analysis_id) is True
+        assert await store.get_status(analysis_id) is None
+
+    async def test_status_snapshot_is_immutable(self):
+        """Testa que leitores recebem snapshot imutável, substituído a cada escrita."""
+        store = AnalysisStore("audio", AudioAnalysisResult, backend="local")
+
+        await store.set_status("abc", AnalysisStatusEnum.PROCESSING, 10.0, "Etapa 1")
+        first = await store.get_status("abc")
+        await store.set_status("abc", AnalysisStatusEnum.PROCESSING, 50.0, "Etapa 2")
+
+        with pytest.raises(TypeError):
+            first["progress_percent"] = 99.0
+        assert first["progress_percent"] == 10.0
+        assert (await store.get_status("abc"))["progress_percent"] == 50.0
+
+    async def test_local_backend_is_bounded(self):
+        """Testa que o backend local não cresce além do limite configurado."""
+        store = AnalysisStore("audio", AudioAnalysisResult, backend="local")
+
+        for i in range(settings.ANALYSIS_STATUS_CACHE_SIZE * 2):
+            await store.set_status(f"id-{i}", AnalysisStatusEnum.QUEUED, 0.0, "Na fila")
+
+        assert len(store._status_cache) == settings.ANALYSIS_STATUS_CACHE_SIZE
+
+    async def test_local_backend_keeps_results_up_to_limit(self, sample_audio_analysis_result):
+        """Testa que nenhum resultado é descartado antes do limite configurado."""
+        store = AnalysisStore(
+            "audio", AudioAnalysisResult, backend="local", result_cache_size=50
+        )
+
+        for i in range(50):
+            await store.set_result(f"id-{i}", sample_audio_analysis_result)
+
+        for i in range(50):
+            assert await store.get_result(f"id-{i}") is not None
+
+    async def test_watch_status_until_completed(self):
+        """Testa que watch_status emite cada mudança e encerra ao concluir."""
+        store = AnalysisStore("audio", AudioAnalysisResult, backend="local")
+        await store.set_status("abc", AnalysisStatusEnum.PROCESSING, 10.0, "Etapa 1")
+
+        watcher = store.watch_status("abc", keepalive_seconds=5)
+        first = await anext(watcher)
+        await store.set_status("abc", AnalysisStatusEnum.COMPLETED, 100.0, "Concluído")
+        remaining = [item async for item in watcher]
+
+        assert first["progress_percent"] == 10.0
+        assert [item["status"] for item in remaining] == [AnalysisStatusEnum.COMPLETED]
+
+    async def test_watch_status_releases_event_on_close(self):
+        """Testa que o evento do watcher é removido quando o cliente desconecta."""
+        store = AnalysisStore("audio", AudioAnalysisResult, backend="local")
+        await store.set_status("abc", AnalysisStatusEnum.PROCESSING, 10.0, "Etapa 1")
+
+        watcher = store.watch_status("abc", keepalive_seconds=0.01)
+        await anext(watcher)
+        assert await anext(watcher) is None
+        await watcher.aclose()
+
+        assert "abc" not in store._status_events
+        assert "abc" not in store._status_watchers
+
+    async def test_content_index(self):
+        """Testa associação hash de conteúdo -> análise."""
+        store = AnalysisStore("audio", AudioAnalysisResult, backend="local")
+
+        assert await store.find_by_content("deadbeef") is None
+        await store.remember_content("deadbeef", "abc")
+        assert await store.find_by_content("deadbeef") == "abc"
+
+    async def test_update_progress_keeps_status(self):
+        """Testa que update_progress altera só progresso e etapa."""
+        store = AnalysisStore("video", VideoAnalysisResult, backend="local")
+
+        await store.update_progress("missing", 50.0, "Ignorado")
+        await store.set_status("abc", AnalysisStatusEnum.PROCESSING, 0.0, "Início")
+        await store.update_progress("abc", 42.0, "Frame 10/20")
+        status_dict = await store.get_status("abc")
+
+        assert await store.get_status("missing") is None
+        assert status_dict["status"] == AnalysisStatusEnum.PROCESSING
+        assert status_dict["progress_percent"] == 42.0
+        assert status_dict["current_stage"] == "Frame 10/20"
+
+    async def test_source_path_removed_with_analysis(self):
+        """Testa registro do arquivo original e remoção junto com a análise."""
+        store = AnalysisStore("video", VideoAnalysisResult, backend="local")
+
+        await store.set_status("abc", AnalysisStatusEnum.QUEUED, 0.0, "Na fila")
+        await store.set_source_path("abc", "storage/temp/abc_video.mp4")
+        assert await store.get_source_path("abc") == "storage/temp/abc_video.mp4"
+
+        await store.delete("abc")
+        assert await store.get_source_path("abc") is None
+
+    async def test_result_json(self, sample_video_analysis_result):
+        """Testa leitura do resultado já serializado."""
+        store = AnalysisStore("video", VideoAnalysisResult, backend="local")
+        analysis_id = sample_video_analysis_result.analysis_id
+
+        assert await store.get_result_json(analysis_id) is None
+        await store.set_result(analysis_id, sample_video_analysis_result)
+        raw = await store.get_result_json(analysis_id)
+
+        assert VideoAnalysisResult.model_validate_json(raw) == sample_video_analysis_result
@@ -0,0 +1,244 @@
+"""
+Testes do AnomalyService.
+
+Valida enriquecimento de ROIs, padrões temporais e geração de alertas.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from app.models.enums import AnomalyType, SeverityLevel
+from app.models.schemas import BoundingBox, FrameAnalysis
+from app.services.anomaly_service import (
+    MAX_KEYPOINTS,
+    AnomalyService,
+    _morton_key,
+    _trend_slopes,
+)
+
+
+def make_box(x1, y1, x2, y2, anomaly_type=AnomalyType.SURGICAL_BLEEDING, confidence=0.9):
+    """Cria uma bounding box de teste."""
+    return BoundingBox(
+        x1=x1, y1=y1, x2=x2, y2=y2,
+        confidence=confidence,
+        label=anomaly_type.value,
+        anomaly_type=anomaly_type
+    )
+
+
+def make_frame(index, n_bleeding, severity=SeverityLevel.LOW):
+    """Cria um FrameAnalysis com ``n_bleeding`` detecções de sangramento."""
+    boxes = [make_box(0, 0, 10, 10) for _ in range(n_bleeding)]
+    return FrameAnalysis(
+        frame_index=index,
+        timestamp_seconds=index * 0.5,
+        bounding_boxes=boxes,
+        anomalies_detected=[AnomalyType.SURGICAL_BLEEDING] if boxes else [],
+        severity=severity
+    )
+
+
+@pytest.fixture
+def noisy_frame():
+    """Frame BGR 480x640 com ruído (gera keypoints)."""
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 256, size=(480, 640, 3), dtype=np.uint8)
+
+
+@pytest.mark.unit
+class TestEnrichAnomaly:
+    """Testes de enriquecimento de detecções."""
+
+    def test_enrich_anomalies_keeps_order(self, noisy_frame):
+        """Testa que o lote devolve as caixas na ordem recebida."""
+        service = AnomalyService()
+        boxes = [
+            make_box(0, 0, 100, 100),
+            make_box(300, 200, 450, 380, AnomalyType.INSTRUMENT_DETECTED),
+            make_box(600, 400, 700, 500),  # Parcialmente fora do frame
+        ]
+
+        assert service.enrich_anomalies(boxes, noisy_frame) == boxes
+        assert service.enrich_anomalies([], noisy_frame) == []
+
+    def test_invalid_roi_is_returned_unchanged(self, noisy_frame):
+        """Testa ROI totalmente fora do frame."""
+        service = AnomalyService()
+        box = make_box(700, 500, 800, 600)
+
+        assert service.enrich_anomaly(box, noisy_frame) is box
+
+    def test_falls_back_to_cpu_detector_without_cuda(self, noisy_frame, monkeypatch):
+        """Testa que, sem GPU, os keypoints vêm do detector da CPU (limitados ao teto)."""
+        monkeypatch.setattr("app.services.anomaly_service._cuda_available", lambda: False)
+        service = AnomalyService()
+        gray = noisy_frame[:200, :200, 0].copy()
+
+        assert service._scratch.detector_gpu is None
+        assert 0 < service._count_keypoints(gray) <= MAX_KEYPOINTS
+
+    def test_small_roi_skips_feature_detection(self, noisy_frame, monkeypatch):
+        """Testa que ROIs menores que o mínimo não chegam ao detector."""
+        service = AnomalyService()
+        monkeypatch.setattr(service, "_count_keypoints", pytest.fail)
+
+        box = make_box(10, 10, 30, 200)
+        assert service.enrich_anomaly(box, noisy_frame) is box
+
+    def test_red_mask_reused_per_roi_shape(self):
+        """Testa reaproveitamento da máscara entre ROIs do mesmo formato."""
+        service = AnomalyService()
+        mask = service._red_mask((128, 128))
+
+        assert service._red_mask((128, 128)) is mask
+        assert service._red_mask((64, 128)) is not mask
+
+    def test_frame_is_validated_once(self, noisy_frame):
+        """Testa rejeição de frame não BGR uint8 e aceitação de views com passo."""
+        service = AnomalyService()
+        box = make_box(0, 0, 100, 100)
+
+        with pytest.raises(ValueError):
+            service.enrich_anomaly(box, noisy_frame.astype(np.float32))
+        with pytest.raises(ValueError):
+            service.enrich_anomalies([box], noisy_frame[:, :, 0])
+
+        # Canais invertidos (stride negativo): copiado para layout contíguo
+        assert service.enrich_anomalies([box], noisy_frame[:, :, ::-1]) == [box]
+
+    def test_gray_scratch_grows_only_when_needed(self):
+        """Testa que o buffer de cinza é reaproveitado entre tamanhos menores."""
+        service = AnomalyService()
+        view = service._gray_view(200, 300)
+        scratch = service._scratch.gray
+
+        assert view.shape == (200, 300)
+        assert np.shares_memory(service._gray_view(50, 80), scratch)
+
+        service._gray_view(100, 400)
+        assert service._scratch.gray.shape == (200, 400)
+
+    def test_scratch_buffers_are_per_thread(self):
+        """Testa que threads diferentes não compartilham o buffer de cinza."""
+        service = AnomalyService()
+        view = service._gray_view(100, 100)
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            other = executor.submit(service._gray_view, 100, 100).result()
+
+        assert not np.shares_memory(view, other)
+
+    def test_morton_key_is_z_order(self):
+        """Testa que a chave segue a curva Z em blocos de 16 px."""
+        keys = [
+            _morton_key(make_box(x, y, x + 40, y + 40))
+            for x, y in [(0, 0), (16, 0), (0, 16), (16, 16), (32, 0)]
+        ]
+
+        assert keys == sorted(keys)
+        assert _morton_key(make_box(5, 7, 40, 40)) == _morton_key(make_box(0, 0, 40, 40))
+
+
+@pytest.mark.unit
+class TestTemporalAnomaly:
+    """Testes de padrões temporais."""
+
+    def test_progressive_bleeding(self):
+        """Testa detecção de sangramento crescente (slope = 1 por frame)."""
+        service = AnomalyService()
+        frames = [make_frame(i, i) for i in range(10)]
+
+        patterns = service.compute_temporal_anomaly(frames, window=10)
+
+        assert [p["type"] for p in patterns] == ["progressive_bleeding"]
+        assert patterns[0]["start_frame"] == 0
+        assert patterns[0]["end_frame"] == 9
+
+    def test_stable_bleeding_is_ignored(self):
+        """Testa que contagem constante não gera padrão."""
+        service = AnomalyService()
+        frames = [make_frame(i, 2) for i in range(15)]
+
+        assert service.compute_temporal_anomaly(frames, window=10) == []
+
+    def test_each_rising_window_is_reported(self):
+        """Testa janelas deslizantes: só as que cobrem a subida são reportadas."""
+        service = AnomalyService()
+        counts = [0] * 6 + [0, 1, 2, 3, 4, 5] + [5] * 6
+        frames = [make_frame(i, n) for i, n in enumerate(counts)]
+
+        patterns = service.compute_temporal_anomaly(frames, window=6)
+        starts = [p["start_frame"] for p in patterns]
+
+        assert starts == sorted(starts)
+        assert 6 in starts
+        assert 0 not in starts and 12 not in starts
+
+    def test_trend_slopes_match_polyfit(self):
+        """Testa a forma fechada contra np.polyfit em cada janela."""
+        counts = np.random.default_rng(1).integers(0, 6, size=40).astype(np.int32)
+
+        slopes = _trend_slopes(counts, 10)
+        expected = [np.polyfit(np.arange(10), counts[i:i + 10], 1)[0] for i in range(31)]
+
+        np.testing.assert_allclose(slopes, expected, atol=1e-9)
+
+    def test_abrupt_severity_change(self):
+        """Testa detecção de salto de baixa/média para crítica."""
+        service = AnomalyService()
+        severities = [SeverityLevel.LOW, SeverityLevel.CRITICAL, SeverityLevel.HIGH,
+                      SeverityLevel.CRITICAL, SeverityLevel.MEDIUM, SeverityLevel.CRITICAL]
+        frames = [make_frame(i, 0, sev) for i, sev in enumerate(severities)]
+
+        patterns = service.compute_temporal_anomaly(frames, window=4)
+
+        assert [p["frame_index"] for p in patterns] == [1, 5]
+        assert all(p["type"] == "abrupt_severity_change" for p in patterns)
+
+
+@pytest.mark.unit
+class TestGenerateAlert:
+    """Testes de geração de alertas."""
+
+    def test_alert_id_uses_prefix(self):
+        """Testa ID do alerta com e sem prefixo pré-montado."""
+        service = AnomalyService()
+        frame = make_frame(42, 1, SeverityLevel.CRITICAL)
+        prefix = service.alert_id_prefix("abc")
+
+        assert service.generate_alert(frame, "abc").alert_id == "alert-abc-42"
+        assert service.generate_alert(frame, "abc", prefix).alert_id == "alert-abc-42"
+
+    def test_low_severity_has_no_alert(self):
+        """Testa que frames de baixa severidade não geram alerta."""
+        service = AnomalyService()
+
+        assert service.generate_alert(make_frame(1, 1, SeverityLevel.LOW), "abc") is None
+
+    def test_description_uses_portuguese_name(self):
+        """Testa nome da anomalia em português na descrição."""
+        service = AnomalyService()
+        alert = service.generate_alert(make_frame(3, 1, SeverityLevel.HIGH), "abc")
+
+        assert alert.description.startswith("Sangramento cirúrgico detectado com 90%")
+
+    def test_bleeding_box_is_preferred(self):
+        """Testa escolha do sangramento mais confiável, mesmo com outras anomalias mais confiáveis."""
+        service = AnomalyService()
+        frame = make_frame(1, 0, SeverityLevel.HIGH)
+        frame.bounding_boxes = [
+            make_box(0, 0, 10, 10, AnomalyType.INSTRUMENT_DETECTED, confidence=0.99),
+            make_box(0, 0, 10, 10, confidence=0.6),
+            make_box(0, 0, 10, 10, confidence=0.8),
+        ]
+
+        alert = service.generate_alert(frame, "abc")
+
+        assert alert.anomaly_type == AnomalyType.SURGICAL_BLEEDING
+        assert alert.bounding_box.confidence == 0.8
+
+        frame.bounding_boxes = frame.bounding_boxes[:1]
+        assert service.generate_alert(frame, "abc").anomaly_type == AnomalyType.INSTRUMENT_DETECTED
@@ -83,6 +83,30 @@ def test_export_report_markdown_valid(client, sample_video_analysis_result):
         assert "attachment" in response.headers.get("content-disposition", "")
 
 
+@pytest.mark.api
+@pytest.mark.integration
+def test_export_report_markdown_etag(client, sample_video_analysis_result, tmp_path, monkeypatch):
+    """Testa que relatório inalterado retorna 304 com If-None-Match."""
+    from app.services.report_service import ReportService
+    
+    report_service = ReportService(storage_dir=str(tmp_path))
+    monkeypatch.setattr("app.api.routes.reports.get_report_service", lambda: report_service)
+    
+    analysis_id = sample_video_analysis_result.analysis_id
+    report_service.save_report(sample_video_analysis_result)
+    
+    url = f"/api/v1/reports/{analysis_id}/markdown?report_type=video"
+    first = client.get(url)
+    
+    assert first.status_code == status.HTTP_200_OK
+    etag = first.headers["etag"]
+    
+    second = client.get(url, headers={"If-None-Match": etag})
+    
+    assert second.status_code == status.HTTP_304_NOT_MODIFIED
+    assert second.headers["etag"] == etag
+
+
 @pytest.mark.api
 @pytest.mark.integration
 def test_export_audio_report_json(client, sample_audio_analysis_result):
@@ -125,6 +125,35 @@ def test_get_result_nonexistent(client):
     assert response.status_code == status.HTTP_404_NOT_FOUND
 
 
+@pytest.mark.api
+@pytest.mark.integration
+def test_frames_fall_back_to_report_after_eviction(
+    client, sample_video_analysis_result, tmp_path, monkeypatch
+):
+    """Testa que /frames lê o relatório em disco quando o resultado saiu do store."""
+    import asyncio
+    from app.api.routes.video import video_store
+    from app.models.enums import SeverityLevel
+    from app.services.report_service import ReportService
+    
+    report_service = ReportService(storage_dir=str(tmp_path))
+    monkeypatch.setattr("app.api.routes.video.get_report_service", lambda: report_service)
+    
+    result = sample_video_analysis_result
+    result.frames[0].severity = SeverityLevel.CRITICAL
+    report_service.save_report(result)
+    asyncio.run(video_store.set_result(result.analysis_id, result))
+    
+    # Descarta o resultado do cache (limite/TTL)
+    video_store._result_cache.pop(result.analysis_id)
+    
+    response = client.get(f"/api/v1/video/frames/{result.analysis_id}")
+    
+    assert response.status_code == status.HTTP_200_OK
+    frames = response.json()["frames"]
+    assert [f["frame_index"] for f in frames] == [result.frames[0].frame_index]
+
+
 @pytest.mark.api
 def test_delete_analysis_nonexistent(client):
     """Testa deletar análise inexistente."""
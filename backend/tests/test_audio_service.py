@@ -7,14 +7,26 @@ Valida extração de features, classificação de indicadores e geração de rel
 import pytest
 import numpy as np
 
-from app.services.audio_service import AudioService
+from app.core.config import settings
+from app.services.audio_service import AudioService, shutdown_acoustic_pool
 from app.models.enums import AnomalyType, RiskLevel
 
 
-@pytest.mark.asyncio
+@pytest.fixture
+def single_worker_acoustic_pool(monkeypatch):
+    """Pool acústico com um único processo, encerrado ao fim do teste."""
+    shutdown_acoustic_pool()
+    monkeypatch.setattr(settings, "AUDIO_PROCESS_WORKERS", 1)
+    yield
+    shutdown_acoustic_pool()
+
+
+@pytest.mark.integration
+@pytest.mark.slow
 async def test_process_audio_returns_result(
     sample_audio_path,
-    mock_gemini_service
+    mock_gemini_service,
+    single_worker_acoustic_pool
 ):
     """Testa que process_audio retorna AudioAnalysisResult válido."""
     from app.services import get_gemini_service
@@ -33,6 +45,7 @@ async def test_process_audio_returns_result(
     assert result.gemini_report != ""
 
 
+@pytest.mark.unit
 def test_classify_segment_depression():
     """Testa classificação de indicador de depressão."""
     from app.services import get_audio_service, get_gemini_service
@@ -55,6 +68,7 @@ def test_classify_segment_depression():
     assert confidence > 0.0
 
 
+@pytest.mark.unit
 def test_compute_overall_risk():
     """Testa cálculo de risco geral."""
     from app.services import get_audio_service, get_gemini_service
@@ -86,3 +100,150 @@ def test_compute_overall_risk():
     
     # Com 100% dos segmentos com depressão, deve ser HIGH ou MEDIUM
     assert risk in [RiskLevel.MEDIUM, RiskLevel.HIGH]
+
+
+@pytest.mark.unit
+def test_segment_features_match_whole_signal():
+    """Testa que fatiar as features do áudio inteiro aproxima a extração do segmento."""
+    audio_service = AudioService(gemini_service=None)
+    sr = 22050
+    t = np.arange(sr * 4) / sr
+    y = (0.1 * np.sin(2 * np.pi * 220 * t) * (1 + t)).astype(np.float32)
+    segment = y[sr:3 * sr]
+    
+    isolated = audio_service._extract_features(segment, sr)
+    sliced = audio_service._segment_features(
+        audio_service._compute_feature_frames(y, sr), sr, 3 * sr
+    )
+    
+    assert sliced["rms_mean"] == pytest.approx(isolated["rms_mean"], rel=0.05)
+    assert sliced["spectral_centroid_mean"] == pytest.approx(
+        isolated["spectral_centroid_mean"], rel=0.05
+    )
+
+
+@pytest.mark.unit
+def test_segment_audio_bounds():
+    """Testa limites das janelas com overlap e truncamento no fim do áudio."""
+    audio_service = AudioService(gemini_service=None)
+    sr = 1000
+    n_samples = int(sr * settings.AUDIO_SEGMENT_DURATION * 2.5)
+    
+    starts, ends = audio_service._segment_audio(n_samples, sr)
+    hop = int((settings.AUDIO_SEGMENT_DURATION - settings.AUDIO_SEGMENT_OVERLAP) * sr)
+    
+    assert starts[0] == 0 and np.all(np.diff(starts) == hop)
+    assert starts[-1] < n_samples and ends[-1] == n_samples
+    assert np.all(ends - starts <= settings.AUDIO_SEGMENT_DURATION * sr)
+    
+    # Áudio mais curto que uma janela: um único segmento, sem overlap
+    short = int(sr * (settings.AUDIO_SEGMENT_DURATION - settings.AUDIO_SEGMENT_OVERLAP / 2))
+    starts, ends = audio_service._segment_audio(short, sr)
+    assert starts.tolist() == [0] and ends.tolist() == [short]
+
+
+@pytest.mark.unit
+def test_classify_segments_matches_single_segment():
+    """Testa que a classificação em lote equivale à classificação por segmento."""
+    audio_service = AudioService(gemini_service=None)
+    segment_features = [
+        {'pitch_mean': 120.0, 'pitch_std': 10.0, 'rms_mean': 0.01, 'rms_std': 0.005,
+         'silence_rate': 0.5, 'zcr_std': 0.02},
+        {'pitch_mean': 220.0, 'pitch_std': 45.0, 'rms_mean': 0.05, 'rms_std': 0.02,
+         'silence_rate': 0.1, 'zcr_std': 0.08},
+        {'pitch_mean': 200.0, 'pitch_std': 5.0, 'rms_mean': 0.05, 'rms_std': 0.001,
+         'silence_rate': 0.0, 'zcr_std': 0.01},
+    ]
+    
+    masks, confidences = audio_service._classify_segments(segment_features)
+    
+    assert masks.shape == (3, 4)
+    assert not masks[2].any() and confidences[2] == 0.0
+    for features, confidence in zip(segment_features, confidences):
+        indicators, expected = audio_service._classify_segment(features, transcript=None)
+        assert confidence == pytest.approx(expected)
+    assert AnomalyType.ANXIETY_INDICATOR in audio_service._classify_segment(
+        segment_features[1], transcript=None
+    )[0]
+
+
+@pytest.mark.unit
+def test_feature_threads_match_sequential(monkeypatch):
+    """Testa que o pitch em thread paralela produz as mesmas features."""
+    audio_service = AudioService(gemini_service=None)
+    sr = 16000
+    t = np.arange(2 * sr) / sr
+    y = (0.1 * np.sin(2 * np.pi * 180 * t)).astype(np.float32)
+    
+    monkeypatch.setattr(settings, "AUDIO_FEATURE_THREADS", False)
+    sequential = audio_service._compute_feature_frames(y, sr)
+    monkeypatch.setattr(settings, "AUDIO_FEATURE_THREADS", True)
+    threaded = audio_service._compute_feature_frames(y, sr)
+    
+    assert sequential.keys() == threaded.keys()
+    for name in sequential:
+        np.testing.assert_allclose(threaded[name], sequential[name])
+
+
+@pytest.mark.unit
+def test_compute_overall_risk_rates():
+    """Testa risco pelas proporções de indicadores entre os segmentos."""
+    from app.models.schemas import AudioSegment
+    
+    audio_service = AudioService(gemini_service=None)
+    
+    def make_segment(indicators, confidence):
+        return AudioSegment(
+            start_time=0.0,
+            end_time=10.0,
+            transcript=None,
+            indicators=indicators,
+            confidence=confidence,
+            emotional_tone="neutro"
+        )
+    
+    # 1 de 4 segmentos com trauma (25% > 20%)
+    segments = [make_segment([], 0.0) for _ in range(3)]
+    segments.append(make_segment([AnomalyType.DOMESTIC_VIOLENCE_INDICATOR], 0.5))
+    assert audio_service._compute_overall_risk(segments) == RiskLevel.HIGH
+    
+    # 1 de 4 com ansiedade (25%): apenas LOW
+    segments[-1] = make_segment([AnomalyType.ANXIETY_INDICATOR], 0.6)
+    assert audio_service._compute_overall_risk(segments) == RiskLevel.LOW
+    
+    assert audio_service._compute_overall_risk([]) == RiskLevel.NONE
+
+
+@pytest.mark.unit
+async def test_transcription_overlaps_acoustic_stage(monkeypatch, sample_audio_path):
+    """Testa que a transcrição começa antes do fim da etapa acústica."""
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    from app.services import audio_service as audio_module
+    
+    transcription_started = threading.Event()
+    overlapped = []
+    
+    class FakeGeminiService:
+        async def transcribe_audio(self, file_path):
+            transcription_started.set()
+            return "transcrição"
+        
+        async def generate_audio_report(self, analysis_result):
+            return "relatório"
+    
+    def fake_acoustic_analysis(file_path):
+        overlapped.append(transcription_started.wait(timeout=5))
+        return 1.0, []
+    
+    executor = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(audio_module, "get_acoustic_pool", lambda: executor)
+    monkeypatch.setattr(audio_module, "_run_acoustic_analysis", fake_acoustic_analysis)
+    
+    try:
+        result = await AudioService(FakeGeminiService()).process_audio(sample_audio_path)
+    finally:
+        executor.shutdown()
+    
+    assert overlapped == [True]
+    assert result.transcription == "transcrição"
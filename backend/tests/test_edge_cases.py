@@ -164,6 +164,47 @@ class TestAudioEdgeCases:
         
         sf.write(audio_path, audio, sr)
         assert audio_path.exists()
+    
+    def test_header_validation_reports_duration(self, tmp_path):
+        """Testa validação por cabeçalho de WAV válido."""
+        import soundfile as sf
+        from app.utils.audio_utils import validate_audio_header
+        
+        audio_path = tmp_path / "header.wav"
+        sf.write(audio_path, np.zeros(16000 * 3), 16000)
+        
+        is_valid, _, duration = validate_audio_header(str(audio_path))
+        
+        assert is_valid
+        assert duration == pytest.approx(3.0)
+    
+    def test_header_validation_rejects_garbage(self, tmp_path):
+        """Testa que arquivo com extensão de áudio mas conteúdo inválido é rejeitado."""
+        from app.utils.audio_utils import validate_audio_header
+        
+        audio_path = tmp_path / "garbage.wav"
+        audio_path.write_bytes(b"not audio" * 512)
+        
+        is_valid, _, duration = validate_audio_header(str(audio_path))
+        
+        assert not is_valid
+        assert duration is None
+    
+    def test_load_audio_downmixes_stereo(self, tmp_path):
+        """Testa carregamento via soundfile de WAV estéreo em mono float32."""
+        import soundfile as sf
+        from app.utils.audio_utils import load_audio
+        
+        audio_path = tmp_path / "stereo.wav"
+        stereo = np.stack([np.full(8000, 0.5), np.full(8000, -0.25)], axis=1)
+        sf.write(audio_path, stereo, 16000, subtype="FLOAT")
+        
+        y, sr = load_audio(str(audio_path))
+        
+        assert sr == 16000
+        assert y.shape == (8000,)
+        assert y.dtype == np.float32
+        assert y[0] == pytest.approx(0.125)
 
 
 @pytest.mark.api
@@ -0,0 +1,31 @@
+"""
+Testes dos utilitários HTTP.
+
+Valida a comparação de ETags do If-None-Match.
+"""
+
+import pytest
+
+from app.utils.http_utils import etag_matches
+
+
+@pytest.mark.unit
+class TestEtagMatches:
+    """Testes de etag_matches."""
+
+    def test_exact_match(self):
+        """Testa ETag idêntica."""
+        assert etag_matches('"abc"', '"abc"') is True
+
+    def test_missing_header(self):
+        """Testa ausência do header."""
+        assert etag_matches(None, '"abc"') is False
+
+    def test_list_and_weak_tags(self):
+        """Testa lista separada por vírgulas com ETag fraca."""
+        assert etag_matches('"old", W/"abc"', '"abc"') is True
+        assert etag_matches('"old", W/"other"', '"abc"') is False
+
+    def test_wildcard(self):
+        """Testa que ``*`` corresponde a qualquer ETag."""
+        assert etag_matches("*", '"abc"') is True
@@ -9,7 +9,7 @@ from pathlib import Path
 
 import pytest
 
-from app.services.report_service import ReportService
+from app.services.report_service import ReportService, get_report_service
 from app.models.schemas import VideoAnalysisResult, AudioAnalysisResult, AudioSegment
 from app.models.enums import RiskLevel, SeverityLevel, AnomalyType
 
@@ -69,6 +69,21 @@ class TestReportService:
         with pytest.raises(FileNotFoundError, match="Relatório não encontrado"):
             service.load_report("nonexistent-id", "video")
     
+    def test_load_report_raw(self, tmp_path, sample_audio_analysis_result):
+        """Testa carregar relatório como bytes sem desserializar."""
+        import json
+        
+        service = ReportService(storage_dir=str(tmp_path))
+        service.save_report(sample_audio_analysis_result)
+        
+        raw = service.load_report_raw(sample_audio_analysis_result.analysis_id, "audio")
+        
+        assert isinstance(raw, bytes)
+        assert json.loads(raw) == service.load_report(sample_audio_analysis_result.analysis_id, "audio")
+        
+        with pytest.raises(FileNotFoundError, match="Relatório não encontrado"):
+            service.load_report_raw("nonexistent-id", "audio")
+    
     def test_list_reports_empty(self, tmp_path):
         """Testa listar relatórios em diretório vazio."""
         service = ReportService(storage_dir=str(tmp_path))
@@ -155,6 +170,45 @@ class TestReportService:
         if len(reports) > 1:
             assert reports[0]["created_at"] >= reports[-1]["created_at"]
     
+    def test_list_reports_reflects_delete(self, tmp_path, sample_video_analysis_result):
+        """Testa que relatórios removidos saem da listagem."""
+        service = ReportService(storage_dir=str(tmp_path))
+        service.save_report(sample_video_analysis_result)
+        analysis_id = sample_video_analysis_result.analysis_id
+        
+        assert len(service.list_reports()) == 1
+        assert service.delete_report(analysis_id, "video") is True
+        assert service.list_reports() == []
+        assert service.delete_report(analysis_id, "video") is False
+    
+    def test_manifest_rebuilt_from_existing_reports(self, tmp_path, sample_audio_analysis_result):
+        """Testa que relatórios anteriores ao manifesto são indexados."""
+        service = ReportService(storage_dir=str(tmp_path))
+        service.save_report(sample_audio_analysis_result)
+        service.manifest_path.unlink()
+        
+        reports = ReportService(storage_dir=str(tmp_path)).list_reports()
+        
+        assert [r["analysis_id"] for r in reports] == [sample_audio_analysis_result.analysis_id]
+        assert reports[0]["report_type"] == "audio"
+    
+    def test_list_reports_drops_missing_files(self, tmp_path, sample_video_analysis_result, sample_audio_analysis_result):
+        """Testa que arquivos removidos fora do serviço saem da listagem e do manifesto."""
+        service = ReportService(storage_dir=str(tmp_path))
+        service.save_report(sample_video_analysis_result)
+        service.save_report(sample_audio_analysis_result)
+        assert len(service.list_reports()) == 2
+        
+        service.report_path(sample_video_analysis_result.analysis_id, "video").unlink()
+        reports = service.list_reports()
+        
+        assert [r["analysis_id"] for r in reports] == [sample_audio_analysis_result.analysis_id]
+        assert len(service.manifest_path.read_bytes().splitlines()) == 1
+    
+    def test_factory_returns_singleton(self):
+        """Testa que a factory reutiliza a mesma instância."""
+        assert get_report_service() is get_report_service()
+    
     def test_custom_output_dir(self, tmp_path):
         """Testa salvar relatório em diretório customizado."""
         service = ReportService(storage_dir=str(tmp_path / "default"))
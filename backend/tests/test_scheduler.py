@@ -0,0 +1,76 @@
+"""
+Testes do HRRNScheduler.
+
+Valida a ordem de despacho por razão de resposta e o limite de concorrência.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.workers.scheduler import HRRNScheduler, ScheduledJob
+
+
+@pytest.mark.unit
+class TestHRRNScheduler:
+    """Testes do escalonador HRRN."""
+
+    def test_response_ratio(self):
+        """Testa cálculo da razão de resposta."""
+        job = ScheduledJob("a", None, (), estimated_seconds=10.0, submitted_at=100.0)
+
+        assert job.response_ratio(100.0) == pytest.approx(1.0)
+        assert job.response_ratio(120.0) == pytest.approx(3.0)
+
+    def test_short_job_dispatched_first(self):
+        """Testa que, com a mesma espera, o job mais curto é escolhido."""
+        scheduler = HRRNScheduler(max_concurrent=1)
+        scheduler._pending = [
+            ScheduledJob("long", None, (), estimated_seconds=600.0, submitted_at=0.0),
+            ScheduledJob("short", None, (), estimated_seconds=30.0, submitted_at=0.0),
+        ]
+
+        assert scheduler._pop_next().job_id == "short"
+        assert scheduler.pending_count == 1
+
+    def test_waiting_prevents_starvation(self):
+        """Testa que um job longo que espera muito passa na frente."""
+        scheduler = HRRNScheduler(max_concurrent=1)
+        now = time.monotonic()
+        scheduler._pending = [
+            ScheduledJob("old_long", None, (), estimated_seconds=60.0, submitted_at=now - 6000),
+            ScheduledJob("new_short", None, (), estimated_seconds=30.0),
+        ]
+
+        assert scheduler._pop_next().job_id == "old_long"
+
+    async def test_runs_jobs_with_concurrency_limit(self):
+        """Testa execução dos jobs respeitando o limite de concorrência."""
+        scheduler = HRRNScheduler(max_concurrent=1)
+        executed = []
+        running = 0
+        max_running = 0
+
+        async def job(name):
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            executed.append(name)
+            running -= 1
+
+        for name, duration in [("a", 100.0), ("b", 300.0), ("c", 10.0)]:
+            await scheduler.submit(name, job, name, estimated_seconds=duration)
+
+        for _ in range(50):
+            if len(executed) == 3:
+                break
+            await asyncio.sleep(0.01)
+
+        await scheduler.stop()
+
+        assert sorted(executed) == ["a", "b", "c"]
+        assert max_running == 1
+        # Após o primeiro, o mais curto pendente roda antes do mais longo
+        assert executed.index("c") < executed.index("b")
@@ -0,0 +1,100 @@
+"""
+Testes dos utilitários de upload.
+
+Valida a gravação em blocos e o aborto por tamanho.
+"""
+
+import hashlib
+import io
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from app.utils.upload_utils import (
+    BufferPool,
+    UploadDirectoryIndex,
+    save_upload_file,
+    UPLOAD_CHUNK_SIZE,
+)
+
+
+@pytest.mark.unit
+class TestSaveUploadFile:
+    """Testes de save_upload_file."""
+
+    async def test_saves_multi_chunk_file(self, tmp_path):
+        """Testa gravação de arquivo maior que um bloco."""
+        content = b"x" * (UPLOAD_CHUNK_SIZE * 2 + 123)
+        upload = UploadFile(file=io.BytesIO(content), filename="audio.wav")
+        destination = tmp_path / "audio.wav"
+
+        written = await save_upload_file(upload, destination)
+
+        assert written == len(content)
+        assert destination.read_bytes() == content
+
+    async def test_aborts_when_too_large(self, tmp_path):
+        """Testa aborto com 413 e remoção do arquivo parcial."""
+        upload = UploadFile(file=io.BytesIO(b"x" * 5000), filename="audio.wav")
+        destination = tmp_path / "audio.wav"
+
+        with pytest.raises(HTTPException) as exc_info:
+            await save_upload_file(upload, destination, max_size_bytes=1000)
+
+        assert exc_info.value.status_code == 413
+        assert not destination.exists()
+
+    async def test_declared_size_larger_than_body(self, tmp_path):
+        """Testa que espaço pré-alocado além do conteúdo real é descartado."""
+        content = b"abc" * 100
+        upload = UploadFile(file=io.BytesIO(content), filename="audio.wav", size=10_000)
+        destination = tmp_path / "audio.wav"
+
+        written = await save_upload_file(upload, destination)
+
+        assert written == len(content)
+        assert destination.read_bytes() == content
+
+    async def test_hashes_while_writing(self, tmp_path):
+        """Testa cálculo do hash do conteúdo durante a gravação."""
+        content = b"audio" * UPLOAD_CHUNK_SIZE
+        upload = UploadFile(file=io.BytesIO(content), filename="audio.wav")
+        hasher = hashlib.sha256()
+
+        await save_upload_file(upload, tmp_path / "audio.wav", hasher=hasher)
+
+        assert hasher.hexdigest() == hashlib.sha256(content).hexdigest()
+
+
+@pytest.mark.unit
+class TestBufferPool:
+    """Testes do pool de buffers de upload."""
+
+    async def test_reuses_returned_buffer(self):
+        """Testa que um buffer devolvido é reaproveitado no próximo empréstimo."""
+        pool = BufferPool(buffer_size=1024, max_buffers=2)
+
+        async with pool.lease() as first:
+            assert len(first) == 1024
+        async with pool.lease() as second:
+            assert second is first
+
+
+@pytest.mark.unit
+class TestUploadDirectoryIndex:
+    """Testes do índice de uploads por analysis_id."""
+
+    def test_lookup_follows_directory_changes(self, tmp_path):
+        """Testa que arquivos criados e removidos refletem no índice."""
+        index = UploadDirectoryIndex(tmp_path, ["mp4"])
+        assert index.lookup("abc") is None
+
+        video = tmp_path / "abc_cirurgia.mp4"
+        video.write_bytes(b"x")
+        (tmp_path / "def_notas.txt").write_bytes(b"x")
+
+        assert index.lookup("abc") == video
+        assert index.lookup("def") is None
+
+        video.unlink()
+        assert index.lookup("abc") is None
@@ -0,0 +1,87 @@
+"""
+Testes do gerenciador de conexões WebSocket.
+
+Valida a fila de saída por conexão (sem Redis).
+"""
+
+import asyncio
+
+import pytest
+from fastapi.websockets import WebSocketState
+
+from app.api.routes.websocket import ConnectionManager
+from app.core.config import settings
+
+
+class FakeWebSocket:
+    """WebSocket mínimo que registra as mensagens enviadas."""
+
+    client_state = WebSocketState.CONNECTED
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.sent = []
+        self.close_code = None
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, payload: str):
+        await asyncio.sleep(self.delay)
+        self.sent.append(payload)
+
+    async def close(self, code: int = 1000):
+        self.close_code = code
+
+
+@pytest.mark.unit
+class TestConnectionManager:
+    """Testes de broadcast do ConnectionManager."""
+
+    async def test_slow_client_does_not_block_others(self):
+        """Testa que um cliente lento não atrasa os demais."""
+        manager = ConnectionManager()
+        fast, slow = FakeWebSocket(), FakeWebSocket(delay=0.2)
+        await manager.connect(slow, "abc")
+        await manager.connect(fast, "abc")
+
+        await manager.broadcast_progress("abc", 10.0, "Etapa 1")
+        await manager.broadcast_progress("abc", 20.0, "Etapa 2")
+        await asyncio.sleep(0.05)
+
+        assert len(fast.sent) == 2
+        assert len(slow.sent) == 0
+
+        manager.disconnect(fast, "abc")
+        manager.disconnect(slow, "abc")
+
+    async def test_full_queue_drops_progress_not_alerts(self):
+        """Testa que a fila cheia descarta progresso antigo e mantém alertas."""
+        manager = ConnectionManager()
+        websocket = FakeWebSocket()
+        await manager.connect(websocket, "abc")
+
+        # Enfileira tudo antes da task de envio rodar
+        await manager.broadcast_alert("abc", {"severity": "critical"})
+        for i in range(200):
+            await manager.broadcast_progress("abc", float(i), "Processando")
+        await asyncio.sleep(0.05)
+
+        assert '"type":"alert"' in websocket.sent[0]
+        assert len(websocket.sent) <= settings.WEBSOCKET_SEND_QUEUE_SIZE
+        assert websocket.sent[-1] == '{"t":"p","d":[199.0,"Processando"]}'
+
+        manager.disconnect(websocket, "abc")
+
+    async def test_full_queue_of_alerts_closes_socket(self):
+        """Testa que o cliente descartado por fila cheia tem o socket fechado."""
+        manager = ConnectionManager()
+        websocket = FakeWebSocket()
+        await manager.connect(websocket, "abc")
+
+        for _ in range(settings.WEBSOCKET_SEND_QUEUE_SIZE + 1):
+            await manager.broadcast_alert("abc", {"severity": "critical"})
+        await asyncio.sleep(0.05)
+
+        assert "abc" not in manager.active_connections
+        assert websocket.close_code == 1013
@@ -115,6 +115,13 @@ class WebSocketService {
    * @private
    */
   _handleMessage(message) {
+    // Progresso em formato compacto: {"t": "p", "d": [percent, stage]}
+    if (message.t === 'p') {
+      const [percent, stage] = message.d;
+      this._notifyListeners('progress', { percent, stage });
+      return;
+    }
+
     const { type, data, timestamp } = message;
 
     switch (type) {
@@ -133,6 +140,10 @@ class WebSocketService {
         this._notifyListeners('alert', data);
         break;
 
+      case 'alerts_batch':
+        data.forEach((alert) => this._notifyListeners('alert', alert));
+        break;
+
       case 'completed':
         this._notifyListeners('completed', data);
         break;